@@ -0,0 +1,82 @@
+""" Arithmetic heavy loops in every evaluation engine.
+
+    Run from the repository root:
+        python3 -m benchmarks.bench_arithmetic [--iterations 100000] [--engines tree closure vm]
+"""
+
+import os
+import tempfile
+import time
+from argparse import ArgumentParser
+
+from interpreter.lexer import iter_tokens
+from interpreter.parser import Parser
+from interpreter.semantics import SemanticAnalyzer
+from interpreter.optimizer import Optimizer
+from interpreter.cli.cli_startup import EVALUATION_ENGINES, load_engine
+
+
+PROGRAMS = {
+    "int": """
+s int = 0;
+k int = 3;
+loop i int, 0..{iterations} {{
+    t int = i * k - s / 1000 * 2;
+    if t > i and i >= 0 {{
+        s = s + t - i;
+    }} else {{
+        s = s - 1;
+    }}
+}}
+""",
+    "float": """
+x float = 0.0;
+v float = 1.5;
+loop i int, 0..{iterations} {{
+    v = v * 0.999 + 0.01;
+    x = x + v / 2.0 - 0.25;
+    if x > 1000.0 or x < -1000.0 {{ x = 0.0; }}
+}}
+""",
+}
+
+
+def run_program(source: str, engine_name: str):
+    """ Returns wall time of evaluation of source without front end time """
+
+    fd, filename = tempfile.mkstemp(suffix=".txt")
+    with os.fdopen(fd, "w") as file:
+        file.write(source)
+    try:
+        ast = Parser(iter_tokens(filename)).parse()
+        scope_controller = SemanticAnalyzer(ast).analyze()
+        ast = Optimizer(ast, scope_controller).optimize()
+        engine = load_engine(engine_name)(ast, scope_controller)
+
+        start = time.perf_counter()
+        engine.evaluate()
+        return time.perf_counter() - start
+    finally:
+        os.remove(filename)
+
+
+def main():
+    parser = ArgumentParser(description="Arithmetic loops benchmark.")
+    parser.add_argument("--iterations", type=int, default=100_000, help="Iterations count of every loop")
+    parser.add_argument(
+        "--engines", nargs="+", choices=list(EVALUATION_ENGINES.keys()),
+        default=list(EVALUATION_ENGINES.keys()), help="Evaluation engines to measure"
+    )
+    args = parser.parse_args()
+
+    print(f"{'engine':>8} " + " ".join(f"{name + ' ms':>10}" for name in PROGRAMS))
+    for engine_name in args.engines:
+        times = [
+            run_program(source.format(iterations=args.iterations), engine_name)
+            for source in PROGRAMS.values()
+        ]
+        print(f"{engine_name:>8} " + " ".join(f"{program_time * 1000:>10.1f}" for program_time in times))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+""" Overhead of interpreted function calls in every evaluation engine.
+
+    Run from the repository root:
+        python3 -m benchmarks.bench_calls [--calls 100000] [--engines tree closure vm]
+"""
+
+import os
+import tempfile
+import time
+from argparse import ArgumentParser
+
+from interpreter.lexer import iter_tokens
+from interpreter.parser import Parser
+from interpreter.semantics import SemanticAnalyzer
+from interpreter.cli.cli_startup import EVALUATION_ENGINES, load_engine
+
+
+# the same loop with and without call, difference is the cost of calls
+CALLS_PROGRAM = """
+def add |a int, b int| -> int {{
+    c int = a + b;
+    ! c;
+}}
+s int = 0;
+loop i int, 0..{calls} {{
+    s = [add s, i];
+}}
+"""
+
+BASELINE_PROGRAM = """
+s int = 0;
+loop i int, 0..{calls} {{
+    c int = s + i;
+    s = c;
+}}
+"""
+
+# recursive calls with locals
+RECURSION_PROGRAM = """
+def fib |n int| -> int {{
+    if n < 2 ! n;
+    left int = [fib n - 1];
+    right int = [fib n - 2];
+    ! left + right;
+}}
+loop i int, 0..{repeats} {{
+    r int = [fib 15];
+}}
+"""
+
+# calls count of one [fib 15]
+FIB_15_CALLS = 1973
+
+
+def run_program(source: str, engine_name: str):
+    """ Returns wall time of evaluation of source without front end time """
+
+    fd, filename = tempfile.mkstemp(suffix=".txt")
+    with os.fdopen(fd, "w") as file:
+        file.write(source)
+    try:
+        ast = Parser(iter_tokens(filename)).parse()
+        scope_controller = SemanticAnalyzer(ast).analyze()
+        # every call is measured, so results of pure functions are not cached
+        engine = load_engine(engine_name)(ast, scope_controller, memo_size=0)
+
+        start = time.perf_counter()
+        engine.evaluate()
+        return time.perf_counter() - start
+    finally:
+        os.remove(filename)
+
+
+def main():
+    parser = ArgumentParser(description="Function call overhead benchmark.")
+    parser.add_argument("--calls", type=int, default=100_000, help="Calls count of loop benchmark")
+    parser.add_argument(
+        "--engines", nargs="+", choices=list(EVALUATION_ENGINES.keys()),
+        default=list(EVALUATION_ENGINES.keys()), help="Evaluation engines to measure"
+    )
+    args = parser.parse_args()
+
+    repeats = max(1, args.calls // FIB_15_CALLS)
+
+    print(f"{'engine':>8} {'loop ms':>10} {'calls ms':>10} {'ns/call':>10} {'fib ms':>10} {'ns/call':>10}")
+    for engine_name in args.engines:
+        baseline_time = run_program(BASELINE_PROGRAM.format(calls=args.calls), engine_name)
+        calls_time = run_program(CALLS_PROGRAM.format(calls=args.calls), engine_name)
+        fib_time = run_program(RECURSION_PROGRAM.format(repeats=repeats), engine_name)
+
+        call_ns = (calls_time - baseline_time) / args.calls * 1e9
+        fib_call_ns = fib_time / (repeats * FIB_15_CALLS) * 1e9
+        print(
+            f"{engine_name:>8} {baseline_time * 1000:>10.1f} {calls_time * 1000:>10.1f} {call_ns:>10.0f} "
+            f"{fib_time * 1000:>10.1f} {fib_call_ns:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+""" Lexer throughput of the master regex lexer against the legacy scanner.
+
+    Run from the repository root:
+        python3 -m benchmarks.bench_lexer [--lines N] [--width N] [--repeat N]
+"""
+
+import os
+import tempfile
+import time
+from argparse import ArgumentParser
+
+from interpreter.lexer import tokenize_source
+from interpreter.lexer.legacy_lexer import tokenize_source_legacy
+
+
+STATEMENTS = [
+    'res int = [factorial 10] * 2 + (3 - 1) / 4;',
+    'if a >= 3 or not b { a = 4; } else if a < 3 { b = 2.8; }',
+    'loop i int, 0..100, 2 { even_sum = even_sum + i; }',
+    '[shown "some string literal here"]; # trailing comment',
+]
+
+
+def generate_source(lines_count: int, width: int):
+    """ Returns program text of lines_count lines about width chars long """
+
+    lines = []
+    for i in range(lines_count):
+        line = ""
+        while len(line) < width:
+            line += STATEMENTS[(i + len(line)) % len(STATEMENTS)] + " "
+        lines.append(line.rstrip())
+    return "\n".join(lines) + "\n"
+
+
+def measure(tokenize, filename: str, repeat: int):
+    """ Returns best wall time of tokenize over repeat runs and tokens count """
+
+    best = None
+    tokens_count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        tokens_count = len(tokenize(filename))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, tokens_count
+
+
+def main():
+    parser = ArgumentParser(description="Lexer throughput benchmark.")
+    parser.add_argument("--lines", type=int, default=2000, help="Source lines count")
+    parser.add_argument("--width", type=int, default=120, help="Approximate line length")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per lexer, best is reported")
+    args = parser.parse_args()
+
+    source = generate_source(args.lines, args.width)
+    size_mb = len(source) / (1024 * 1024)
+
+    fd, filename = tempfile.mkstemp(suffix=".txt")
+    try:
+        with os.fdopen(fd, "w") as file:
+            file.write(source)
+
+        results = {}
+        for name, tokenize in [("legacy", tokenize_source_legacy), ("master regex", tokenize_source)]:
+            elapsed, tokens_count = measure(tokenize, filename, args.repeat)
+            results[name] = elapsed
+            print(
+                f"{name:>12}: {elapsed * 1000:9.1f} ms  "
+                f"{tokens_count / elapsed:12.0f} tokens/s  {size_mb / elapsed:7.2f} MB/s"
+            )
+        print(f"     speedup: {results['legacy'] / results['master regex']:.1f}x")
+    finally:
+        os.remove(filename)
+
+
+if __name__ == "__main__":
+    main()
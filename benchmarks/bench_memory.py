@@ -0,0 +1,86 @@
+""" Memory retained by the front end (tokens, AST and symbols) per source line.
+
+    Run from the repository root:
+        python3 -m benchmarks.bench_memory [--sizes 1000 10000 ...]
+"""
+
+import gc
+import os
+import tempfile
+import tracemalloc
+from argparse import ArgumentParser
+
+from interpreter.lexer import tokenize_source, iter_tokens
+from interpreter.parser import Parser
+from interpreter.semantics import SemanticAnalyzer
+
+
+# one statement per line, every line is valid for the semantic analyzer
+LINES = [
+    "def func_{i} |a int, b float| -> int {{",
+    "    x_{i} int = a * 2 + (a - 1) - -a;",
+    "    if x_{i} >= 10 and not (a == 3) or b < 2.5 {{",
+    "        x_{i} = [func_{i} x_{i} - 1, b * 0.5];",
+    "    }} else if x_{i} != 0 {{ ! x_{i}; }}",
+    "    loop j int, 0..x_{i}, 2 {{ x_{i} = x_{i} + j * j; }}",
+    "    ! x_{i} + a * a + a * a * a + 1 - 2 + 3 - 4;",
+    "}}",
+    "[shown [int_to_str [func_{i} {i}, 1.5]]];",
+    "",
+]
+
+
+def write_program(filename: str, lines_count: int):
+    with open(filename, "w") as file:
+        for i in range(lines_count):
+            file.write(LINES[i % len(LINES)].format(i=i // len(LINES)) + "\n")
+
+
+def retained_size(build: callable):
+    """ Returns count of bytes still allocated by build when its result is alive """
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del result
+    return size
+
+
+def analyze(filename: str):
+    ast = Parser(iter_tokens(filename)).parse()
+    scope_controller = SemanticAnalyzer(ast).analyze()
+    return ast, scope_controller
+
+
+def main():
+    parser = ArgumentParser(description="Front end memory benchmark.")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 10_000, 50_000],
+        help="Program sizes in lines"
+    )
+    args = parser.parse_args()
+
+    print(f"{'lines':>9} {'tokens B/line':>14} {'AST B/line':>14} {'analyzed B/line':>16}")
+    fd, filename = tempfile.mkstemp(suffix=".txt")
+    os.close(fd)
+    try:
+        for lines_count in args.sizes:
+            write_program(filename, lines_count)
+            tokens_size = retained_size(lambda: tokenize_source(filename))
+            ast_size = retained_size(lambda: Parser(iter_tokens(filename)).parse())
+            analyzed_size = retained_size(lambda: analyze(filename))
+            print(
+                f"{lines_count:>9} {tokens_size / lines_count:>14.0f} "
+                f"{ast_size / lines_count:>14.0f} {analyzed_size / lines_count:>16.0f}"
+            )
+    finally:
+        os.remove(filename)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+""" Parsing of used modules in place against parsing by a pool of processes.
+    The program uses --modules generated modules of --lines lines each,
+    the best time of loading all of them is reported for every count of workers.
+
+    Run from the repository root:
+        python3 -m benchmarks.bench_modules [--modules 8] [--lines 2000] [--workers 1 2 4] [--repeat 3]
+"""
+
+import os
+import tempfile
+import time
+from argparse import ArgumentParser
+
+from interpreter.lexer import iter_tokens
+from interpreter.parser import Parser
+from interpreter.modules import ModuleLoader
+from .program_generator import ProgramGenerator
+
+
+def write_program(dir_path: str, modules_count: int, lines_count: int):
+    """ Returns path of the main file which uses all generated modules """
+
+    for index in range(modules_count):
+        with open(os.path.join(dir_path, f"module_{index}.txt"), "w") as file:
+            file.write(ProgramGenerator(lines_count, seed=index).generate())
+    filename = os.path.join(dir_path, "main.txt")
+    with open(filename, "w") as file:
+        file.write("".join(f'use "module_{index}.txt";\n' for index in range(modules_count)))
+    return filename
+
+
+def measure(filename: str, max_workers: int, repeat: int):
+    best = None
+    for _ in range(repeat):
+        ast = Parser(iter_tokens(filename)).parse()
+        start = time.perf_counter()
+        ModuleLoader(max_workers=max_workers).load(ast, filename)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = ArgumentParser(description="Benchmark of parallel parsing of modules.")
+    parser.add_argument("--modules", type=int, default=8, help="Count of used modules")
+    parser.add_argument("--lines", type=int, default=2000, help="Lines of statements of every module")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="Counts of workers to measure")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs of every count, the best time is reported")
+    args = parser.parse_args()
+
+    print(f"{args.modules} modules of {args.lines} lines, {os.cpu_count()} CPUs")
+    print(f"{'workers':>8} {'ms':>10} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as dir_path:
+        filename = write_program(dir_path, args.modules, args.lines)
+        serial = measure(filename, 1, args.repeat)
+        for max_workers in args.workers:
+            elapsed = serial if max_workers == 1 else measure(filename, max_workers, args.repeat)
+            print(f"{max_workers:>8} {elapsed * 1000:>10.1f} {serial / elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
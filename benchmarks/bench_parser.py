@@ -0,0 +1,76 @@
+""" Parse throughput on generated programs from 1k to 1M lines.
+
+    Run from the repository root:
+        python3 -m benchmarks.bench_parser [--sizes 1000 10000 ...]
+"""
+
+import os
+import tempfile
+import time
+from argparse import ArgumentParser
+
+from interpreter.lexer import iter_tokens
+from interpreter.parser import Parser
+
+
+# one statement per line, blocks span several lines
+LINES = [
+    "def func_{i} |a int, b float| -> int {{",
+    "    x_{i} int = a * 2 + (a - 1) / 3 - -a;",
+    "    if x_{i} >= 10 and not a == 3 or b < 2.5 {{",
+    "        x_{i} = [func_{i} x_{i} - 1, b * 0.5];",
+    "    }} else if x_{i} != 0 {{ ! x_{i}; }}",
+    "    loop j int, 0..x_{i}, 2 {{ x_{i} = x_{i} + j * j; }}",
+    "    ! x_{i} + a * a + a * a * a + 1 - 2 + 3 - 4;",
+    "}}",
+    "[shown [int_to_str [func_{i} {i}, 1.5]]];",
+    "",
+]
+
+
+def write_program(filename: str, lines_count: int):
+    with open(filename, "w") as file:
+        for i in range(lines_count):
+            file.write(LINES[i % len(LINES)].format(i=i // len(LINES)) + "\n")
+
+
+def measure(filename: str):
+    """ Returns wall time of lexing only, wall time of lexing with parsing and tokens count """
+
+    start = time.perf_counter()
+    tokens_count = sum(1 for _ in iter_tokens(filename))
+    lex_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    Parser(iter_tokens(filename)).parse()
+    total_time = time.perf_counter() - start
+
+    return lex_time, total_time, tokens_count
+
+
+def main():
+    parser = ArgumentParser(description="Parser throughput benchmark.")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000],
+        help="Program sizes in lines"
+    )
+    args = parser.parse_args()
+
+    print(f"{'lines':>9} {'tokens':>10} {'lex ms':>10} {'parse ms':>10} {'lines/s':>10} {'tokens/s':>10}")
+    fd, filename = tempfile.mkstemp(suffix=".txt")
+    os.close(fd)
+    try:
+        for lines_count in args.sizes:
+            write_program(filename, lines_count)
+            lex_time, total_time, tokens_count = measure(filename)
+            parse_time = total_time - lex_time
+            print(
+                f"{lines_count:>9} {tokens_count:>10} {lex_time * 1000:>10.1f} {parse_time * 1000:>10.1f} "
+                f"{lines_count / parse_time:>10.0f} {tokens_count / parse_time:>10.0f}"
+            )
+    finally:
+        os.remove(filename)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+""" Scaling of the front end (lexer, parser and semantic analyzer) with shape of programs.
+    Every parameter of the program generator is swept while others keep base values,
+    time and peak memory of every phase are reported for every point of the sweep.
+    Phase which time grows faster than count of chars (lexer) or tokens (parser and analyzer)
+    is flagged as super-linear.
+
+    Run from the repository root:
+        python3 -m benchmarks.bench_scaling [--params lines nesting] [--points 4] [--repeat 3] [--limit 1.3]
+"""
+
+import math
+import os
+import tempfile
+import time
+import tracemalloc
+from argparse import ArgumentParser
+
+from interpreter.lexer import tokenize_source, iter_tokens
+from interpreter.parser import Parser
+from interpreter.semantics import SemanticAnalyzer
+from .program_generator import ProgramGenerator
+
+
+# generator param : its value while other params are swept
+BASE_PARAMS = {
+    "lines_count"       : 1000,
+    "functions_count"   : 10,
+    "expr_depth"        : 3,
+    "nesting_depth"     : 2,
+    "string_length"     : 16,
+    "identifiers_count" : 20,
+}
+
+# swept param : its first value, next values are doubled
+SWEEPS = {
+    "lines"       : ("lines_count", 1000),
+    "functions"   : ("functions_count", 50),
+    "expr_depth"  : ("expr_depth", 16),
+    "nesting"     : ("nesting_depth", 16),
+    "string"      : ("string_length", 1000),
+    "identifiers" : ("identifiers_count", 200),
+}
+
+PHASES = ("lex", "parse", "analyze")
+
+
+def measure_times(filename: str, repeat: int):
+    """ Returns phase : best wall time, significant tokens are lexed outside of measured parse """
+
+    best = {phase: math.inf for phase in PHASES}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        tokenize_source(filename)
+        best["lex"] = min(best["lex"], time.perf_counter() - start)
+
+        tokens = list(iter_tokens(filename))
+        start = time.perf_counter()
+        ast = Parser(tokens).parse()
+        best["parse"] = min(best["parse"], time.perf_counter() - start)
+
+        start = time.perf_counter()
+        SemanticAnalyzer(ast).analyze()
+        best["analyze"] = min(best["analyze"], time.perf_counter() - start)
+    return best
+
+
+def measure_memory(filename: str):
+    """ Returns phase : peak of memory allocated by the phase, tracing slows phases down, so it is a separate run """
+
+    peaks = {}
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        tokenize_source(filename)
+        peaks["lex"] = tracemalloc.get_traced_memory()[1]
+
+        tokens = list(iter_tokens(filename))
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        ast = Parser(tokens).parse()
+        peaks["parse"] = tracemalloc.get_traced_memory()[1] - base
+
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        SemanticAnalyzer(ast).analyze()
+        peaks["analyze"] = tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+
+def growth_exponent(points: list):
+    """ Returns k of time ~ size ** k fitted by least squares to (size, time) points in log scale """
+
+    logs = [(math.log(size), math.log(elapsed)) for size, elapsed in points if size > 0 and elapsed > 0]
+    if len(logs) < 2:
+        return 0.0
+    mean_x = sum(x for x, _ in logs) / len(logs)
+    mean_y = sum(y for _, y in logs) / len(logs)
+    variance = sum((x - mean_x) ** 2 for x, _ in logs)
+    if variance == 0:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in logs) / variance
+
+
+def sweep(name: str, points: int, repeat: int, filename: str):
+    """ Returns list of (value, source size, tokens count, times, peaks) of the sweep """
+
+    param, first_value = SWEEPS[name]
+    results = []
+    for point in range(points):
+        value = first_value * 2 ** point
+        source = ProgramGenerator(**{**BASE_PARAMS, param: value}).generate()
+        with open(filename, "w") as file:
+            file.write(source)
+        # the first run warms up caches of the interpreter
+        tokens_count = len(tokenize_source(filename))
+        measure_times(filename, 1)
+        results.append((value, len(source), tokens_count, measure_times(filename, repeat), measure_memory(filename)))
+    return results
+
+
+def main():
+    parser = ArgumentParser(description="Front end scaling benchmark.")
+    parser.add_argument("--params", nargs="+", choices=list(SWEEPS.keys()), default=list(SWEEPS.keys()),
+                        help="Generator params to sweep")
+    parser.add_argument("--points", type=int, default=4, help="Values of every param, each is twice the previous")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs of every point, the best time is reported")
+    parser.add_argument("--limit", type=float, default=1.3,
+                        help="Max exponent of time growth with input size which is still linear")
+    args = parser.parse_args()
+    if args.points < 2:
+        parser.error("--points must be at least 2")
+
+    flagged = []
+    fd, filename = tempfile.mkstemp(suffix=".txt")
+    os.close(fd)
+    try:
+        for name in args.params:
+            print(f"\n{name}")
+            print(
+                f"{'value':>8} {'chars':>10} {'tokens':>9} "
+                + " ".join(f"{phase + ' ms':>11}" for phase in PHASES) + " "
+                + " ".join(f"{phase + ' KiB':>12}" for phase in PHASES)
+            )
+            results = sweep(name, args.points, args.repeat, filename)
+            for value, size, tokens_count, times, peaks in results:
+                print(
+                    f"{value:>8} {size:>10} {tokens_count:>9} "
+                    + " ".join(f"{times[phase] * 1000:>11.2f}" for phase in PHASES) + " "
+                    + " ".join(f"{peaks[phase] / 1024:>12.1f}" for phase in PHASES)
+                )
+
+            exponents = []
+            for phase in PHASES:
+                # lexer scans chars, parser and analyzer work on tokens
+                exponent = growth_exponent([
+                    (size if phase == "lex" else tokens_count, times[phase])
+                    for _, size, tokens_count, times, _ in results
+                ])
+                exponents.append(f"{phase} {exponent:.2f}")
+                if exponent > args.limit:
+                    flagged.append((name, phase, exponent))
+            print("growth exponent by chars (lex) and tokens: " + ", ".join(exponents))
+    finally:
+        os.remove(filename)
+
+    print("")
+    for name, phase, exponent in flagged:
+        print(f"SUPER-LINEAR {phase} by {name}: time ~ size ** {exponent:.2f}")
+    if not flagged:
+        print(f"Every phase grows linearly (exponent <= {args.limit})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+""" Generator of valid synthetic programs with controllable size and shape.
+
+    Run from the repository root:
+        python3 -m benchmarks.program_generator [--lines 1000] [--functions 10] [--expr-depth 3]
+            [--nesting 2] [--string-length 16] [--identifiers 20] [--seed 0] > program.txt
+"""
+
+import random
+from argparse import ArgumentParser
+
+
+INDENT = "    "
+
+OPERATORS = ("+", "-", "*")
+
+COMPARISONS = ("<", ">", "<=", ">=", "==", "!=")
+
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+
+
+class ProgramGenerator():
+    """ Emits program which passes semantic analysis: identifiers_count distinct global vars,
+        functions_count functions of two int params, expressions of expr_depth nested parentheses,
+        if blocks nested nesting_depth times and string literals of string_length chars,
+        followed by at least lines_count lines of statements """
+
+    def __init__(
+        self, lines_count: int = 1000, functions_count: int = 10, expr_depth: int = 3,
+        nesting_depth: int = 2, string_length: int = 16, identifiers_count: int = 20, seed: int = 0
+    ):
+        self.lines_count = lines_count
+        self.functions_count = functions_count
+        self.expr_depth = expr_depth
+        self.nesting_depth = nesting_depth
+        self.string_length = string_length
+        self.identifiers_count = max(1, identifiers_count)
+        self.random = random.Random(seed)
+
+        self.lines = []
+        self.globals = [f"{LETTERS[k % len(LETTERS)]}_var_{k}" for k in range(self.identifiers_count)]
+
+    def emit(self, line: str, level: int = 0):
+        self.lines.append(INDENT * level + line)
+
+    def leaf(self, names: list):
+        if self.random.random() < 0.3:
+            return str(self.random.randint(0, 99))
+        return self.random.choice(names)
+
+    def expr(self, names: list):
+        """ Returns expression with expr_depth nested parentheses """
+
+        text = self.leaf(names)
+        for _ in range(self.expr_depth):
+            text = f"{self.leaf(names)} {self.random.choice(OPERATORS)} ({text})"
+        return text
+
+    def condition(self, names: list):
+        return f"{self.leaf(names)} {self.random.choice(COMPARISONS)} {self.leaf(names)}"
+
+    def string_literal(self):
+        start = self.random.randrange(len(LETTERS))
+        return '"' + "".join(LETTERS[(start + k) % len(LETTERS)] for k in range(self.string_length)) + '"'
+
+    def nested_block(self, target: str, names: list, level: int):
+        """ Emits if blocks nested nesting_depth times around update of target var """
+
+        for depth in range(self.nesting_depth):
+            self.emit(f"if {self.condition(names)} {{", level + depth)
+        self.emit(f"{target} = {self.expr(names)};", level + self.nesting_depth)
+        for depth in reversed(range(self.nesting_depth)):
+            self.emit("}", level + depth)
+
+    def function(self, index: int):
+        names = ["a", "b"] + self.globals
+        self.emit(f"def func_{index} |a int, b int| -> int {{")
+        self.emit(f"result int = {self.expr(names)};", 1)
+        self.nested_block("result", ["result"] + names, 1)
+        self.emit("! result;", 1)
+        self.emit("}")
+
+    def statement(self, index: int):
+        kind = index % 4
+        target = self.random.choice(self.globals)
+        if kind == 0:
+            self.emit(f"{target} = {self.expr(self.globals)};")
+        elif kind == 1:
+            self.emit(f"text = {self.string_literal()};")
+        elif kind == 2 and self.functions_count:
+            func = self.random.randrange(self.functions_count)
+            self.emit(f"{target} = [func_{func} {self.expr(self.globals)}, {self.leaf(self.globals)}];")
+        else:
+            self.nested_block(target, self.globals, 0)
+
+    def generate(self):
+        """ Returns source text of the program """
+
+        self.lines = []
+        for index, name in enumerate(self.globals):
+            self.emit(f"{name} int = {index};")
+        self.emit('text str = "";')
+        for index in range(self.functions_count):
+            self.function(index)
+
+        index = 0
+        end = len(self.lines) + self.lines_count
+        while len(self.lines) < end:
+            self.statement(index)
+            index += 1
+        return "\n".join(self.lines) + "\n"
+
+
+def main():
+    parser = ArgumentParser(description="Synthetic program generator.")
+    parser.add_argument("--lines", type=int, default=1000, help="Min count of lines of statements after declarations")
+    parser.add_argument("--functions", type=int, default=10, help="Count of functions")
+    parser.add_argument("--expr-depth", type=int, default=3, help="Nested parentheses of expressions")
+    parser.add_argument("--nesting", type=int, default=2, help="Nesting depth of if blocks")
+    parser.add_argument("--string-length", type=int, default=16, help="Length of string literals")
+    parser.add_argument("--identifiers", type=int, default=20, help="Count of distinct global vars")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of random choices")
+    args = parser.parse_args()
+
+    generator = ProgramGenerator(
+        args.lines, args.functions, args.expr_depth, args.nesting, args.string_length, args.identifiers, args.seed
+    )
+    print(generator.generate(), end="")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+""" Benchmark suite of representative programs with a regression runner.
+    Every program of benchmarks/programs is lexed, parsed, analyzed, optimized and evaluated
+    several times, every phase is timed separately.
+
+    Run from the repository root:
+        python3 -m benchmarks.suite [--repeats 5] [--engine tree] [--programs fibonacci strings]
+        python3 -m benchmarks.suite --save baseline.json
+        python3 -m benchmarks.suite --baseline baseline.json [--threshold 0.2] [--min-delta-ms 1.0]
+
+    With --baseline the runner exits with status 1 if median time of any phase
+    is slower than the baseline by more than the threshold.
+"""
+
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from argparse import ArgumentParser
+from contextlib import redirect_stdout
+
+from interpreter.lexer import iter_tokens
+from interpreter.parser import Parser
+from interpreter.semantics import SemanticAnalyzer
+from interpreter.optimizer import Optimizer
+from interpreter.cli.cli_startup import EVALUATION_ENGINES, load_engine
+
+
+PROGRAMS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "programs")
+
+PHASES = ("lex", "parse", "analyze", "optimize", "evaluate")
+
+# changes of the results layout make old baselines incomparable
+BASELINE_FORMAT_VERSION = 1
+
+
+def program_names():
+    return sorted(name[:-len(".txt")] for name in os.listdir(PROGRAMS_DIR) if name.endswith(".txt"))
+
+
+def run_once(filename: str, engine_name: str, memo_size: int):
+    """ Returns phase : wall time of one run of the program, its output is discarded """
+
+    times = {}
+    start = time.perf_counter()
+    tokens = list(iter_tokens(filename))
+    times["lex"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    ast = Parser(tokens).parse()
+    times["parse"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scope_controller = SemanticAnalyzer(ast).analyze()
+    times["analyze"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    ast = Optimizer(ast, scope_controller).optimize()
+    times["optimize"] = time.perf_counter() - start
+
+    engine = load_engine(engine_name)(ast, scope_controller, memo_size=memo_size)
+    with redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        engine.evaluate()
+        times["evaluate"] = time.perf_counter() - start
+    return times
+
+
+def phase_stats(samples: list):
+    """ Returns statistics of samples in milliseconds """
+
+    samples_ms = [sample * 1000 for sample in samples]
+    return {
+        "min_ms"    : min(samples_ms),
+        "median_ms" : statistics.median(samples_ms),
+        "mean_ms"   : statistics.mean(samples_ms),
+        "stdev_ms"  : statistics.stdev(samples_ms) if len(samples_ms) > 1 else 0.0,
+    }
+
+
+def run_program(name: str, engine_name: str, repeats: int, memo_size: int):
+    """ Returns phase : statistics of repeated runs, the first run only warms up """
+
+    filename = os.path.join(PROGRAMS_DIR, name + ".txt")
+    run_once(filename, engine_name, memo_size)
+    samples = {phase: [] for phase in PHASES}
+    for _ in range(repeats):
+        for phase, elapsed in run_once(filename, engine_name, memo_size).items():
+            samples[phase].append(elapsed)
+    return {phase: phase_stats(phase_samples) for phase, phase_samples in samples.items()}
+
+
+def find_regressions(results: dict, baseline: dict, threshold: float, min_delta_ms: float):
+    """ Returns (program, phase, baseline median, median) of phases slower than baseline.
+        Tiny phases are noisy, so slowdown must also exceed min_delta_ms """
+
+    regressions = []
+    for name, phases in results.items():
+        for phase, stats in phases.items():
+            base_stats = baseline.get(name, {}).get(phase)
+            if base_stats is None:
+                continue
+            base, median = base_stats["median_ms"], stats["median_ms"]
+            if median > base * (1 + threshold) and median - base > min_delta_ms:
+                regressions.append((name, phase, base, median))
+    return regressions
+
+
+def print_results(results: dict):
+    print(f"{'program':<18} {'phase':<10} {'min ms':>10} {'median ms':>10} {'mean ms':>10} {'stdev ms':>10}")
+    for name, phases in results.items():
+        for phase, stats in phases.items():
+            print(
+                f"{name:<18} {phase:<10} {stats['min_ms']:>10.3f} {stats['median_ms']:>10.3f} "
+                f"{stats['mean_ms']:>10.3f} {stats['stdev_ms']:>10.3f}"
+            )
+
+
+def load_baseline(path: str, engine_name: str, memo_size: int):
+    with open(path) as file:
+        baseline = json.load(file)
+    if baseline.get("version") != BASELINE_FORMAT_VERSION:
+        sys.exit(f"Baseline '{path}' has unsupported format")
+    if baseline["engine"] != engine_name or baseline["memo_size"] != memo_size:
+        print(
+            f"Warning: baseline was measured with engine '{baseline['engine']}' "
+            f"and memo size {baseline['memo_size']}", file=sys.stderr
+        )
+    return baseline["results"]
+
+
+def main():
+    parser = ArgumentParser(description="Benchmark suite with regression runner.")
+    parser.add_argument(
+        "--programs", nargs="+", choices=program_names(), default=program_names(), help="Programs to measure"
+    )
+    parser.add_argument("--engine", choices=list(EVALUATION_ENGINES.keys()), default="tree", help="Evaluation engine")
+    parser.add_argument("--repeats", type=int, default=5, help="Measured runs of every program")
+    parser.add_argument(
+        "--memo-size", type=int, default=0,
+        help="Memo size of pure functions (0 by default, so every call is evaluated)"
+    )
+    parser.add_argument("--save", type=str, default=None, help="Save results as JSON baseline")
+    parser.add_argument("--baseline", type=str, default=None, help="Compare results with JSON baseline")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="Allowed relative slowdown of median time of a phase"
+    )
+    parser.add_argument(
+        "--min-delta-ms", type=float, default=1.0, help="Slowdowns smaller than this are never regressions"
+    )
+    args = parser.parse_args()
+    if args.repeats < 1:
+        parser.error("--repeats must be positive")
+
+    baseline = None if args.baseline is None else load_baseline(args.baseline, args.engine, args.memo_size)
+
+    results = {name: run_program(name, args.engine, args.repeats, args.memo_size) for name in args.programs}
+    print_results(results)
+
+    if args.save is not None:
+        with open(args.save, "w") as file:
+            json.dump({
+                "version"   : BASELINE_FORMAT_VERSION,
+                "engine"    : args.engine,
+                "memo_size" : args.memo_size,
+                "repeats"   : args.repeats,
+                "python"    : platform.python_version(),
+                "results"   : results,
+            }, file, indent=2)
+
+    if baseline is not None:
+        regressions = find_regressions(results, baseline, args.threshold, args.min_delta_ms)
+        for name, phase, base, median in regressions:
+            print(f"REGRESSION {name} {phase}: {base:.3f} ms -> {median:.3f} ms ({median / base - 1:+.0%})")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions against '{args.baseline}'")
+
+
+if __name__ == "__main__":
+    main()
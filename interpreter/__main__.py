@@ -1,9 +1,16 @@
-from interpreter.cli import parse_args, run_main_loop
+import sys
+
+from interpreter.cli import parse_args, run_cli
 
 
 def main():
+    # daemon mode, scripts are submitted by interpreter/server/client.py
+    if sys.argv[1:2] == ["serve"]:
+        from interpreter.server import serve_main
+        serve_main(sys.argv[2:])
+        return
     args = parse_args()
-    run_main_loop(args)
+    sys.exit(run_cli(args))
 
 
 if __name__ == "__main__":
@@ -1,3 +1,3 @@
 from .nodes import *
 from .traverse import *
-from .ast_printer import *
\ No newline at end of file
+# AST_Printer is imported from .ast_printer by its users, so it is not loaded at startup
\ No newline at end of file
@@ -1,3 +1,5 @@
+from types import GeneratorType
+
 from .nodes import *
 from .traverse import TreeVisitor
 
@@ -8,85 +10,120 @@ class AST_Printer(TreeVisitor):
         super().__init__(ast)
         self.silent = False
 
+        # visited nodes in order of visiting and depth of the visited one
+        self.path = []
+        self.depth = 0
+        self.nodes_handlers = {
+            node_type: self.__recorded(handler) for node_type, handler in self.nodes_handlers.items()
+        }
+
+    def __recorded(self, handler: callable):
+        def recorded_handler(node):
+            self.path.append(node)
+            self.depth += 1
+            result = handler(node)
+            if type(result) is GeneratorType:
+                return self.__visiting(result)
+            self.depth -= 1
+            return result
+
+        return recorded_handler
+
+    def __visiting(self, handler_visiting):
+        """ Keeps depth of the node until its handler visits all children """
+
+        result = yield from handler_visiting
+        self.depth -= 1
+        return result
+
     def visit_literal(self, node):
         self.__print(f"Literal '{node.value}'")
 
     def visit_var(self, node):
         self.__print(f"Variable '{node.name}'")
 
+    def visit_index(self, node):
+        self.__print(f"Index '{node.name}'")
+        yield node.index
+
     def visit_type(self, node):
         self.__print(f"Type '{node.name}'")
 
     def visit_binop(self, node):
         self.__print(f"BinOp {node.token_type_op}")
-        self.visit_node(node.left)
-        self.visit_node(node.right)
+        yield node.left
+        yield node.right
 
     def visit_unop(self, node):
         self.__print(f"UnOp {node.token_type_op}")
-        self.visit_node(node.left)
+        yield node.left
 
     def visit_var_decl(self, node):
         self.__print(f"VarDecl '{node.name}'")
-        self.visit_node(node.type_node)
+        yield node.type_node
         if node.value:
-            self.visit_node(node.value)
+            yield node.value
 
     def visit_var_assign(self, node):
         self.__print(f"VarAssign '{node.name}'")
-        self.visit_node(node.value)
+        yield node.value
+
+    def visit_index_assign(self, node):
+        self.__print(f"IndexAssign '{node.name}'")
+        yield node.index
+        yield node.value
 
     def visit_if_else(self, node):
         self.__print(f"If")
 
         if node.condition:
             self.__print(f" IfCondition:")
-            self.visit_node(node.condition)
+            yield node.condition
             
         self.__print(f" IfBody:")
-        self.visit_node(node.body)
+        yield node.body
 
         if node.else_branch:
             self.__print(f" IfElse:")
-            self.visit_node(node.else_branch)
+            yield node.else_branch
         
     def visit_loop(self, node):
         self.__print(f"Loop")
         
         if node.var:
             self.__print(f" ItVar")
-            self.visit_node(node.var)
+            yield node.var
         if node.range:
             self.__print(f" ItRange")
-            self.visit_node(node.range[0])
-            self.visit_node(node.range[1])
+            yield node.range[0]
+            yield node.range[1]
         if node.step:
             self.__print(f" ItStep")
-            self.visit_node(node.step)
+            yield node.step
 
         self.__print(f" ItBody")        
-        self.visit_node(node.body)
+        yield node.body
     
     def visit_func_decl(self, node):
         self.__print(f"FunctionDecl '{node.name}'")
-        self.visit_node(node.ret_type_node)
+        yield node.ret_type_node
         
         self.__print(f" FuncParams")
         for param in node.params:
-            self.visit_node(param)
+            yield param
 
         self.__print(f" FuncBody")
-        self.visit_node(node.body)
+        yield node.body
 
     def visit_func_call(self, node):
         self.__print(f"FunctionCall '{node.name}'")
         self.__print(f" FuncCallArgs")
         for arg in node.args:
-            self.visit_node(arg)
+            yield arg
 
     def visit_return(self, node):
         self.__print(f"Return")
-        self.visit_node(node.value)
+        yield node.value
 
     def visit_continue(self, node):
         self.__print(f"Continue")
@@ -97,7 +134,7 @@ class AST_Printer(TreeVisitor):
     def visit_block(self, node):
         self.__print(f"Block")
         for stm in node.statements:
-            self.visit_node(stm)
+            yield stm
 
     def __print(self, message: str):
         """ Prints messages with offset related to depth """
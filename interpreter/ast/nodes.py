@@ -4,29 +4,69 @@ from abc import ABC
 from interpreter.lexer.token import Token, TokenType
 
 class AST_Node(ABC):
+    """ Nodes are slotted, so large programs are not dominated by per-node dicts """
+
+    __slots__ = ("start_token",)
+
     def __init__(self, start_token: Token):
         self.start_token = start_token
 
 
-class Literal_Node(AST_Node):
+class Expression_Node(AST_Node):
+    """ Node with a value. Semantic analyzer sets expr_type (type symbol of the expression)
+        and value_type (python type its value always has or None).
+        Subclasses declare slots of them, so func call may be a statement node too """
+
+    __slots__ = ()
+
+    def __init__(self, start_token: Token):
+        super().__init__(start_token)
+        self.expr_type = None
+        self.value_type = None
+
+
+class Literal_Node(Expression_Node):
+    __slots__ = ("value", "expr_type", "value_type")
+
     def __init__(self, start_token: Token, value: any):
         super().__init__(start_token)
         self.value = value
 
 
-class Var_Node(AST_Node):
+class Var_Node(Expression_Node):
+    __slots__ = ("name", "depth", "slot", "expr_type", "value_type")
+
     def __init__(self, start_token: Token, name: str):
         super().__init__(start_token)
         self.name = name
+        # frame depth and slot of the var, resolved by semantic analyzer
+        self.depth = None
+        self.slot = None
+
+
+class Index_Node(Expression_Node):
+    __slots__ = ("name", "index", "depth", "slot", "expr_type", "value_type")
+
+    def __init__(self, start_token: Token, name: str, index: AST_Node):
+        super().__init__(start_token)
+        self.name = name
+        self.index = index
+        # frame depth and slot of the array var, resolved by semantic analyzer
+        self.depth = None
+        self.slot = None
 
 
 class Type_Node(AST_Node):
+    __slots__ = ("name",)
+
     def __init__(self, start_token: Token, name: str):
         super().__init__(start_token)
         self.name = name
 
 
-class Binary_Op_Node(AST_Node):    
+class Binary_Op_Node(Expression_Node):
+    __slots__ = ("left", "right", "token_type_op", "expr_type", "value_type")
+
     def __init__(self, start_token: Token, left: AST_Node, right: AST_Node, token_type_op: TokenType):
         super().__init__(start_token)
         self.left = left
@@ -34,7 +74,9 @@ class Binary_Op_Node(AST_Node):
         self.token_type_op = token_type_op
 
 
-class Unary_Op_Node(AST_Node):    
+class Unary_Op_Node(Expression_Node):
+    __slots__ = ("left", "token_type_op", "expr_type", "value_type")
+
     def __init__(self, start_token: Token, left: AST_Node, token_type_op: TokenType):
         super().__init__(start_token)
         self.left = left
@@ -42,33 +84,65 @@ class Unary_Op_Node(AST_Node):
 
 
 class Block_Node(AST_Node):
+    __slots__ = ("statements",)
+
     def __init__(self, start_token: Token, statements: list[AST_Node]):
         super().__init__(start_token)
         self.statements = statements
 
 
 class Statement_Node(AST_Node):    
+    __slots__ = ("require_semicolon",)
+
     def __init__(self, start_token: Token, require_semicolon: bool = True):
         super().__init__(start_token)
         self.require_semicolon = require_semicolon
 
 
 class Var_Decl_Node(Statement_Node):    
+    __slots__ = ("name", "type_node", "value", "depth", "slot")
+
     def __init__(self, start_token: Token, name: str, type_node: Type_Node, value: AST_Node = None):
         super().__init__(start_token)
         self.name = name
         self.type_node = type_node
         self.value = value
+        # frame depth and slot of the var, resolved by semantic analyzer
+        self.depth = None
+        self.slot = None
 
 
 class Var_Assign_Node(Statement_Node):    
+    __slots__ = ("name", "value", "depth", "slot", "var_type")
+
     def __init__(self, start_token: Token, name: str, value: AST_Node):
         super().__init__(start_token)
         self.name = name
         self.value = value
+        # frame depth, slot and type symbol of the var, resolved by semantic analyzer
+        self.depth = None
+        self.slot = None
+        self.var_type = None
+
+
+class Index_Assign_Node(Statement_Node):    
+    __slots__ = ("name", "index", "value", "depth", "slot", "var_type")
+
+    def __init__(self, start_token: Token, name: str, index: AST_Node, value: AST_Node):
+        super().__init__(start_token)
+        self.name = name
+        self.index = index
+        self.value = value
+        # frame depth and slot of the array var and type symbol of its elements, 
+        # resolved by semantic analyzer
+        self.depth = None
+        self.slot = None
+        self.var_type = None
 
 
 class If_Else_Node(Statement_Node):
+    __slots__ = ("condition", "body", "else_branch")
+
     def __init__(self, start_token: Token, condition: AST_Node, body: AST_Node, else_branch: AST_Node):
         super().__init__(start_token, False)
         self.condition = condition
@@ -77,42 +151,71 @@ class If_Else_Node(Statement_Node):
 
 
 class Loop_Node(Statement_Node):
+    __slots__ = ("var", "range", "step", "body", "reduction")
+
     def __init__(self, start_token: Token, var: AST_Node, _range: tuple[AST_Node, AST_Node], step: AST_Node, body: AST_Node):
         super().__init__(start_token, False)
         self.var = var
         self.range = _range
         self.step = step
         self.body = body
+        # evaluation of all iterations at once, set by loop analyzer of the optimizer
+        self.reduction = None
 
 
 class Func_Decl_Node(Statement_Node):
+    __slots__ = ("name", "params", "ret_type_node", "body", "symbol")
+
     def __init__(self, start_token: Token, name: str, params: list[Var_Decl_Node], ret_type_node: Type_Node, body: AST_Node):
         super().__init__(start_token, False)
         self.name = name
         self.params = params
         self.ret_type_node = ret_type_node
         self.body = body
+        # declared func symbol, set by semantic analyzer
+        self.symbol = None
+
 
+class Func_Call_Node(Statement_Node, Expression_Node):
+    __slots__ = ("name", "args", "symbol", "expr_type", "value_type")
 
-class Func_Call_Node(Statement_Node):
     def __init__(self, start_token: Token, name: str, args: list[AST_Node]):
         super().__init__(start_token)
         self.name = name
         self.args = args
+        # called func symbol, resolved by semantic analyzer
+        self.symbol = None
 
 
 class Return_Node(Statement_Node):
+    __slots__ = ("value", "tail_call")
+
     def __init__(self, start_token: Token, value: AST_Node):
         super().__init__(start_token)
         self.value = value
+        # value is a call of the function itself, set by semantic analyzer
+        self.tail_call = False
 
 
 class Continue_Node(Statement_Node):
+    __slots__ = ()
+
     def __init__(self, start_token: Token):
         super().__init__(start_token)
 
 
 class Break_Node(Statement_Node):
+    __slots__ = ()
+
     def __init__(self, start_token: Token):
         super().__init__(start_token)
 
+
+class Use_Node(Statement_Node):
+    """ Use of module file, module loader replaces it by statements of the module before analysis """
+
+    __slots__ = ("path",)
+
+    def __init__(self, start_token: Token, path: str):
+        super().__init__(start_token)
+        self.path = path
@@ -1,20 +1,27 @@
 from abc import ABC, abstractmethod
+from types import GeneratorType
 
 from .nodes import *
 
 
 class TreeVisitor(ABC):
-    """ Abstract class for traversing nodes of AST """        
+    """ Abstract class for traversing nodes of AST.
+        Handler may be a generator, it yields child node to visit and receives result of the child.
+        Handler can also yield a generator to run it as a subtask and receive its result.
+        These generators are kept on the work stack of visit_node instead of the python stack,
+        so depth of visited trees is not limited by the recursion limit """
 
     def __init__(self, ast: AST_Node):
         self.nodes_handlers = {
             Literal_Node    : self.visit_literal,
             Var_Node        : self.visit_var,
+            Index_Node      : self.visit_index,
             Type_Node       : self.visit_type,
             Binary_Op_Node  : self.visit_binop,
             Unary_Op_Node   : self.visit_unop,
             Var_Decl_Node   : self.visit_var_decl,
             Var_Assign_Node : self.visit_var_assign,
+            Index_Assign_Node : self.visit_index_assign,
             Block_Node      : self.visit_block,
             If_Else_Node    : self.visit_if_else,
             Loop_Node       : self.visit_loop,
@@ -25,8 +32,6 @@ class TreeVisitor(ABC):
             Break_Node      : self.visit_break,
         }
         self.ast = ast
-        self.path = []
-        self.depth = 0
 
     @abstractmethod
     def visit_literal(self, node):
@@ -36,6 +41,10 @@ class TreeVisitor(ABC):
     def visit_var(self, node):
         pass
 
+    @abstractmethod
+    def visit_index(self, node):
+        pass
+
     @abstractmethod
     def visit_type(self, node):
         pass
@@ -56,6 +65,10 @@ class TreeVisitor(ABC):
     def visit_var_assign(self, node):
         pass
 
+    @abstractmethod
+    def visit_index_assign(self, node):
+        pass
+
     @abstractmethod
     def visit_if_else(self, node):
         pass
@@ -92,13 +105,53 @@ class TreeVisitor(ABC):
         if not node:
             return
 
-        self.path.append(node)
-        
-        self.depth += 1
-        result = self.nodes_handlers[type(node)](node)
-        self.depth -= 1
-        return result
+        handlers = self.nodes_handlers
+        result = handlers[type(node)](node)
+        if type(result) is not GeneratorType:
+            return result
+
+        # generators of unfinished handlers and subtasks, which wait for the running one
+        stack = []
+        running = result
+        result = None
+        while True:
+            try:
+                item = running.send(result)
+            except StopIteration as stop:
+                if not stack:
+                    return stop.value
+                running = stack.pop()
+                result = stop.value
+                continue
+
+            if type(item) is GeneratorType:
+                stack.append(running)
+                running = item
+                result = None
+            elif item is None:
+                result = None
+            else:
+                result = handlers[type(item)](item)
+                if type(result) is GeneratorType:
+                    stack.append(running)
+                    running = result
+                    result = None
 
     def traverse(self):
-        self.path.clear()
-        self.visit_node(self.ast)
\ No newline at end of file
+        self.visit_node(self.ast)
+
+
+def iter_nodes(ast: AST_Node):
+    """ Yields every node of the tree, children are found by slots of nodes """
+
+    stack = [ast]
+    while stack:
+        node = stack.pop()
+        yield node
+        for cls in type(node).__mro__:
+            for name in getattr(cls, "__slots__", ()):
+                child = getattr(node, name, None)
+                if isinstance(child, AST_Node):
+                    stack.append(child)
+                elif type(child) in (list, tuple):
+                    stack.extend(item for item in child if isinstance(item, AST_Node))
@@ -1,4 +1,90 @@
+import operator
+from array import array
+
+from interpreter.error import runtime_error
 
 
 def intrinsic_show(arg):
-    print(arg)
\ No newline at end of file
+    print(arg)
+
+
+# Arrays are indexed without checks, python errors of the indexing are reported by these.
+
+def array_item_error(values, index: int, value: any = None):
+    """ Throws runtime error of failed indexing of the array """
+
+    if not -len(values) <= index < len(values):
+        runtime_error(f"Index {index} is out of array of length {len(values)}")
+    runtime_error(f"Value {value} is out of range of elements of the array")
+
+
+def array_load(values, index: int):
+    try:
+        return values[index]
+    except IndexError:
+        array_item_error(values, index)
+
+
+# Array intrinsics work on whole buffers in C loops of the array module and builtins.
+# Args of intrinsics are not casted, so scalars are casted to the element type here.
+
+def array_new(typecode: str):
+    """ Returns intrinsic creating zero filled array of the length """
+
+    itemsize = array(typecode).itemsize
+
+    def new(length):
+        if length < 0:
+            runtime_error(f"Length of array {length} is negative")
+        return array(typecode, bytes(int(length) * itemsize))
+    return new
+
+
+def array_fill(element_cast: type):
+    """ Returns intrinsic setting all elements of the array to the value """
+
+    def fill(values, value):
+        try:
+            element = array(values.typecode, [element_cast(value)])
+        except OverflowError:
+            runtime_error(f"Value {value} is out of range of elements of the array")
+        values[:] = element * len(values)
+    return fill
+
+
+def array_sum(start: any):
+    """ Returns intrinsic of sum of array elements, start keeps the type of sum of empty array """
+
+    def sum_values(values):
+        return sum(values, start)
+    return sum_values
+
+
+def array_extremum(extremum):
+    """ Returns intrinsic of min or max element of not empty array """
+
+    def extremum_value(values):
+        if not values:
+            runtime_error(f"{extremum.__name__} of empty array")
+        return extremum(values)
+    return extremum_value
+
+
+def array_sort(values):
+    values[:] = array(values.typecode, sorted(values))
+
+
+def array_dot(element_cast: type):
+    """ Returns intrinsic of dot product of two arrays of the same length """
+
+    def dot(left, right):
+        if len(left) != len(right):
+            runtime_error(f"dot product of arrays of lengths {len(left)} and {len(right)}")
+        return element_cast(sum(map(operator.mul, left, right)))
+    return dot
+
+
+def array_count(values):
+    """ Returns count of true elements of bool array """
+
+    return values.count(1)
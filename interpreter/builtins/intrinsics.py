@@ -15,24 +15,49 @@ class IntrinsicVar(Intrinsic):
 
 
 class IntrinsicFunc(Intrinsic):
-    def __init__(self, name: str, intr_type: BuiltinType, args_types: list[BuiltinType], actual_value: any):
+    def __init__(self, name: str, intr_type: BuiltinType, args_types: list[BuiltinType], actual_value: any, pure: bool = False):
         super().__init__(name, intr_type, actual_value)
         self.args_types = args_types
+        # result depends only on args and there are no side effects
+        self.pure = pure
 
 
 INTRINSICS_LIST = [
     IntrinsicVar("true",  BOOL_TYPE, True),
     IntrinsicVar("false", BOOL_TYPE, False),
 
-    IntrinsicFunc("float_to_str", STR_TYPE, [FLOAT_TYPE], str),
-    IntrinsicFunc("int_to_str", STR_TYPE, [INT_TYPE], str),
-    IntrinsicFunc("bool_to_str", STR_TYPE, [BOOL_TYPE], str),
+    IntrinsicFunc("float_to_str", STR_TYPE, [FLOAT_TYPE], str, pure=True),
+    IntrinsicFunc("int_to_str", STR_TYPE, [INT_TYPE], str, pure=True),
+    IntrinsicFunc("bool_to_str", STR_TYPE, [BOOL_TYPE], str, pure=True),
     
-    IntrinsicFunc("str_to_int", INT_TYPE, [STR_TYPE], int),
-    IntrinsicFunc("str_to_float", FLOAT_TYPE, [STR_TYPE], float),
-    IntrinsicFunc("str_to_bool", BOOL_TYPE, [STR_TYPE], bool),
+    IntrinsicFunc("str_to_int", INT_TYPE, [STR_TYPE], int, pure=True),
+    IntrinsicFunc("str_to_float", FLOAT_TYPE, [STR_TYPE], float, pure=True),
+    IntrinsicFunc("str_to_bool", BOOL_TYPE, [STR_TYPE], bool, pure=True),
     
     IntrinsicFunc("show", ANY_TYPE, [STR_TYPE], lambda x : print(x, end="")),
     IntrinsicFunc("shown", ANY_TYPE, [STR_TYPE], print),
     IntrinsicFunc("read", STR_TYPE, [STR_TYPE], input),
+
+    IntrinsicFunc("int_array", INT_ARRAY_TYPE, [INT_TYPE], array_new(INT_ARRAY_TYPE.typecode)),
+    IntrinsicFunc("int_len", INT_TYPE, [INT_ARRAY_TYPE], len, pure=True),
+    IntrinsicFunc("int_fill", ANY_TYPE, [INT_ARRAY_TYPE, INT_TYPE], array_fill(int)),
+    IntrinsicFunc("int_sum", INT_TYPE, [INT_ARRAY_TYPE], array_sum(0), pure=True),
+    IntrinsicFunc("int_min", INT_TYPE, [INT_ARRAY_TYPE], array_extremum(min), pure=True),
+    IntrinsicFunc("int_max", INT_TYPE, [INT_ARRAY_TYPE], array_extremum(max), pure=True),
+    IntrinsicFunc("int_dot", INT_TYPE, [INT_ARRAY_TYPE, INT_ARRAY_TYPE], array_dot(int), pure=True),
+    IntrinsicFunc("int_sort", ANY_TYPE, [INT_ARRAY_TYPE], array_sort),
+
+    IntrinsicFunc("float_array", FLOAT_ARRAY_TYPE, [INT_TYPE], array_new(FLOAT_ARRAY_TYPE.typecode)),
+    IntrinsicFunc("float_len", INT_TYPE, [FLOAT_ARRAY_TYPE], len, pure=True),
+    IntrinsicFunc("float_fill", ANY_TYPE, [FLOAT_ARRAY_TYPE, FLOAT_TYPE], array_fill(float)),
+    IntrinsicFunc("float_sum", FLOAT_TYPE, [FLOAT_ARRAY_TYPE], array_sum(0.0), pure=True),
+    IntrinsicFunc("float_min", FLOAT_TYPE, [FLOAT_ARRAY_TYPE], array_extremum(min), pure=True),
+    IntrinsicFunc("float_max", FLOAT_TYPE, [FLOAT_ARRAY_TYPE], array_extremum(max), pure=True),
+    IntrinsicFunc("float_dot", FLOAT_TYPE, [FLOAT_ARRAY_TYPE, FLOAT_ARRAY_TYPE], array_dot(float), pure=True),
+    IntrinsicFunc("float_sort", ANY_TYPE, [FLOAT_ARRAY_TYPE], array_sort),
+
+    IntrinsicFunc("bool_array", BOOL_ARRAY_TYPE, [INT_TYPE], array_new(BOOL_ARRAY_TYPE.typecode)),
+    IntrinsicFunc("bool_len", INT_TYPE, [BOOL_ARRAY_TYPE], len, pure=True),
+    IntrinsicFunc("bool_fill", ANY_TYPE, [BOOL_ARRAY_TYPE, BOOL_TYPE], array_fill(bool)),
+    IntrinsicFunc("bool_count", INT_TYPE, [BOOL_ARRAY_TYPE], array_count, pure=True),
 ]
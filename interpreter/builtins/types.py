@@ -1,10 +1,40 @@
+from array import array
+
 
 class BuiltinType():
-    def __init__(self, name: str):
+    def __init__(self, name: str, value_type: type = None):
         self.name = name
+        # python type of values casted to this type
+        self.value_type = value_type
+
+
+class ArrayType(BuiltinType):
+    """ Array of fixed size with elements of element type, 
+        elements are stored in contiguous buffer of the array module """
+
+    def __init__(self, element_type: BuiltinType, typecode: str):
+        super().__init__(f"{element_type.name}[]", array)
+        self.element_type = element_type
+        # typecode of the array module buffer
+        self.typecode = typecode
+
+INT_TYPE   = BuiltinType("int", int)
+FLOAT_TYPE = BuiltinType("float", float)
+STR_TYPE   = BuiltinType("str", str)
+BOOL_TYPE  = BuiltinType("bool", bool)
+ANY_TYPE   = BuiltinType("any")
+
+# ints are limited to 64 bits in the buffer, bools are stored as 0 and 1
+INT_ARRAY_TYPE   = ArrayType(INT_TYPE, "q")
+FLOAT_ARRAY_TYPE = ArrayType(FLOAT_TYPE, "d")
+BOOL_ARRAY_TYPE  = ArrayType(BOOL_TYPE, "b")
+
+# type name : array type
+ARRAY_TYPES = {
+    array_type.name: array_type for array_type in [INT_ARRAY_TYPE, FLOAT_ARRAY_TYPE, BOOL_ARRAY_TYPE]
+}
 
-INT_TYPE   = BuiltinType("int")
-FLOAT_TYPE = BuiltinType("float")
-STR_TYPE   = BuiltinType("str")
-BOOL_TYPE  = BuiltinType("bool")
-ANY_TYPE   = BuiltinType("any")
\ No newline at end of file
+BUILTIN_TYPES = [
+    INT_TYPE, FLOAT_TYPE, STR_TYPE, BOOL_TYPE, ANY_TYPE, 
+    INT_ARRAY_TYPE, FLOAT_ARRAY_TYPE, BOOL_ARRAY_TYPE
+]
@@ -0,0 +1,197 @@
+import gc
+import hashlib
+import io
+import os
+import pickle
+import sys
+
+from interpreter.builtins import INTRINSICS_LIST, IntrinsicFunc
+
+
+# changes of the entry layout invalidate all entries
+CACHE_FORMAT_VERSION = 4
+
+INTERPRETER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# intrinsic func name : python function, functions are stored by name (some of them are lambdas)
+INTRINSICS_VALUES = {intr.name: intr.actual_value for intr in INTRINSICS_LIST if type(intr) == IntrinsicFunc}
+
+INTRINSICS_NAMES = {id(value): name for name, value in INTRINSICS_VALUES.items()}
+
+# modules of classes which entries consist of, other globals of pickles are never loaded
+ENTRY_MODULES = (
+    "interpreter.ast.nodes", "interpreter.lexer.token", "interpreter.lexer.token_types",
+    "interpreter.semantics.scopes", "interpreter.optimizer.loops",
+)
+
+# module : names of other classes which entries may contain
+ENTRY_GLOBALS = {
+    "builtins": {"int", "float", "str", "bool", "list", "tuple", "dict", "set", "frozenset"},
+    "array": {"array"},
+}
+
+_interpreter_fingerprint = None
+
+
+def interpreter_fingerprint():
+    """ Returns hash of paths, modification times and sizes of the interpreter sources and python version,
+        so entries made by other version of the interpreter are never loaded.
+        Sources are not read, so the fingerprint costs a directory walk on every cached run """
+
+    global _interpreter_fingerprint
+    if _interpreter_fingerprint is None:
+        digest = hashlib.sha256(f"{CACHE_FORMAT_VERSION} {sys.version}".encode())
+        for dir_path, dir_names, file_names in os.walk(INTERPRETER_DIR):
+            dir_names.sort()
+            for file_name in sorted(file_names):
+                if file_name.endswith(".py"):
+                    path = os.path.join(dir_path, file_name)
+                    stat_result = os.stat(path)
+                    relpath = os.path.relpath(path, INTERPRETER_DIR)
+                    digest.update(f"{relpath} {stat_result.st_mtime_ns} {stat_result.st_size}\0".encode())
+        _interpreter_fingerprint = digest.hexdigest()
+    return _interpreter_fingerprint
+
+
+class ProgramPickler(pickle.Pickler):
+    def persistent_id(self, obj):
+        return INTRINSICS_NAMES.get(id(obj))
+
+
+class ProgramUnpickler(pickle.Unpickler):
+    def persistent_load(self, pid):
+        return INTRINSICS_VALUES[pid]
+
+    def find_class(self, module, name):
+        """ Loads only classes of the program, so an entry can not call arbitrary functions """
+
+        if name in ENTRY_GLOBALS.get(module, ()):
+            return super().find_class(module, name)
+        if module in ENTRY_MODULES and "." not in name:
+            cls = super().find_class(module, name)
+            if isinstance(cls, type) and cls.__module__ == module:
+                return cls
+        raise pickle.UnpicklingError(f"Entry refers to '{module}.{name}'")
+
+
+def owned_by_user(stat_result: os.stat_result):
+    """ Files which other users can change may contain any code, so only files of the user are trusted """
+
+    if not hasattr(os, "getuid"):
+        return True
+    return stat_result.st_uid == os.getuid() and not stat_result.st_mode & 0o022
+
+
+def source_digest(source: bytes):
+    return hashlib.sha256(source).hexdigest()
+
+
+class ProgramCache():
+    """ Directory of analyzed programs (AST and scope controller) or parsed modules keyed by hash of the source,
+        its path, the interpreter fingerprint and variant of processing (optimized, not optimized or module).
+        Entry also keeps hashes of sources of used modules, it is valid only while they are unchanged.
+        Unchanged program is loaded instead of lexing, parsing and analysis.
+        Only the last stored entry of a path and variant is kept, so the directory does not grow on edits.
+        Broken entries and entries which other users could write are ignored """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+
+    @staticmethod
+    def read_source(filename: str):
+        with open(filename, "rb") as file:
+            return file.read()
+
+    def trusted_dir(self):
+        try:
+            return owned_by_user(os.stat(self.cache_dir))
+        except OSError:
+            return False
+
+    @staticmethod
+    def entry_prefix(filename: str, variant: str):
+        """ Returns start of names of all entries of the path and variant """
+
+        # positions of tokens keep the file name
+        return hashlib.sha256(f"{os.path.abspath(filename)}\0{variant}".encode()).hexdigest()[:32] + "-"
+
+    def entry_path(self, filename: str, source: bytes, variant: str):
+        digest = hashlib.sha256(interpreter_fingerprint().encode() + b"\0" + source)
+        return os.path.join(self.cache_dir, self.entry_prefix(filename, variant) + digest.hexdigest() + ".pickle")
+
+    def prune(self, filename: str, variant: str, entry_path: str):
+        """ Removes entries of the path and variant left by previous sources and interpreters """
+
+        prefix = self.entry_prefix(filename, variant)
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.startswith(prefix) and entry.path != entry_path:
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+
+    @staticmethod
+    def dependencies_changed(dependencies: dict):
+        """ Checks sources of used modules by path : hash of its source """
+
+        try:
+            return any(
+                source_digest(ProgramCache.read_source(path)) != digest for path, digest in dependencies.items()
+            )
+        except OSError:
+            return True
+
+    def load(self, filename: str, source: bytes, variant: str):
+        """ Returns stored tuple (ast and scope controller of program or ast of module) or None """
+
+        if not self.trusted_dir():
+            return None
+        # loading creates a lot of objects and no garbage, so collections only slow it down
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            fd = os.open(self.entry_path(filename, source, variant), os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0))
+            with os.fdopen(fd, "rb") as file:
+                if not owned_by_user(os.fstat(fd)):
+                    return None
+                dependencies, program = ProgramUnpickler(file).load()
+            return None if self.dependencies_changed(dependencies) else program
+        except Exception:
+            # missing or broken entry, broken one is replaced by the next store
+            return None
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    def store(self, filename: str, source: bytes, variant: str, *program, dependencies: dict = None):
+        """ Saves program if its file and used modules (path : source) were not changed during analysis.
+            Entry appears atomically, failures of saving are ignored """
+
+        dependencies = {path: source_digest(module_source) for path, module_source in (dependencies or {}).items()}
+        try:
+            if self.read_source(filename) != source or self.dependencies_changed(dependencies):
+                return False
+
+            buffer = io.BytesIO()
+            ProgramPickler(buffer, pickle.HIGHEST_PROTOCOL).dump((dependencies, program))
+
+            # saving happens only on misses, so its module is not imported at startup
+            import tempfile
+
+            # pickles are loaded only from the directory of the owner
+            os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+            if not self.trusted_dir():
+                return False
+            entry_path = self.entry_path(filename, source, variant)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as file:
+                    file.write(buffer.getvalue())
+                os.replace(tmp_path, entry_path)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+            self.prune(filename, variant, entry_path)
+        except (OSError, pickle.PicklingError, RecursionError, TypeError, AttributeError):
+            return False
+        return True
@@ -0,0 +1,135 @@
+""" Batch of independent scripts run by one interpreter:
+        ./run.sh a.txt b.txt c.txt -j 4
+        ./run.sh --manifest scripts.txt -j 0 --jsonl
+
+    The interpreter is imported and warmed up once, then worker processes are forked from it,
+    so every worker starts with the ready interpreter instead of importing it again.
+    Output of every script is captured and printed in order of the scripts, so it is the same
+    as output of the scripts run one by one. The summary of exit codes and times goes to stderr.
+"""
+
+import io
+import json
+import os
+import sys
+import time
+import traceback
+from contextlib import redirect_stdout, redirect_stderr
+from copy import copy
+from functools import partial
+from importlib import import_module
+
+from interpreter.error import InterpreterError
+from interpreter.cache import interpreter_fingerprint
+from .cli_startup import run_main_loop, load_engine
+
+
+def read_manifest(path: str):
+    """ Returns paths of scripts of the manifest, empty lines and lines starting with '#' are skipped """
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    with open(path) as file:
+        lines = [line.strip() for line in file]
+    return [os.path.join(base_dir, line) for line in lines if line and not line.startswith("#")]
+
+
+def warm_up(cli_args):
+    """ Imports everything scripts of the batch need before workers are forked """
+
+    load_engine(cli_args.engine)
+    import_module("interpreter.modules")
+    if not cli_args.no_optimize:
+        import_module("interpreter.optimizer")
+    if not cli_args.no_cache:
+        # fingerprint of sources is computed once for cached programs of all workers
+        interpreter_fingerprint()
+    if cli_args.timings:
+        import_module("interpreter.cli.timings")
+
+
+def run_script(cli_args, filename: str):
+    """ Runs one script with captured output, returns its result.
+        Errors of the script are reported in its output as in the usual run """
+
+    script_args = copy(cli_args)
+    script_args.filename = filename
+    stdout, stderr = io.StringIO(), io.StringIO()
+    start = time.perf_counter()
+    with redirect_stdout(stdout), redirect_stderr(stderr):
+        try:
+            run_main_loop(script_args)
+            exit_code = 0
+        except InterpreterError as error:
+            print(error)
+            exit_code = error.exit_code
+        except SystemExit as exit_error:
+            exit_code = exit_error.code if isinstance(exit_error.code, int) else 1
+        except Exception:
+            traceback.print_exc()
+            exit_code = 1
+    return {
+        "file"      : filename,
+        "exit_code" : exit_code,
+        "wall_ms"   : (time.perf_counter() - start) * 1000,
+        "stdout"    : stdout.getvalue(),
+        "stderr"    : stderr.getvalue(),
+    }
+
+
+def iter_results(cli_args, filenames: list, jobs: int):
+    """ Yields results of scripts in order of filenames as soon as they are ready """
+
+    run = partial(run_script, cli_args)
+    if jobs == 1 or len(filenames) == 1:
+        yield from map(run, filenames)
+        return
+
+    import multiprocessing
+
+    # forked workers share the warmed up interpreter, other platforms import it in every worker
+    if "fork" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("fork")
+    else:
+        context = multiprocessing.get_context()
+    sys.stdout.flush()
+    sys.stderr.flush()
+    with context.Pool(min(jobs, len(filenames))) as pool:
+        yield from pool.imap(run, filenames)
+
+
+def summary_table(results: list, jobs: int, wall_ms: float):
+    name_width = max(len("script"), *(len(result["file"]) for result in results))
+    lines = [f"{'script':<{name_width}} {'exit':>5} {'wall ms':>10}"]
+    for result in results:
+        lines.append(f"{result['file']:<{name_width}} {result['exit_code']:>5} {result['wall_ms']:>10.3f}")
+    failed = sum(1 for result in results if result["exit_code"])
+    lines.append(f"{len(results)} scripts, {failed} failed, {jobs} jobs, {wall_ms:.3f} ms")
+    return "\n".join(lines)
+
+
+def run_batch(cli_args):
+    """ Runs every script of the batch, returns 1 if any of them failed """
+
+    jobs = cli_args.jobs
+    if jobs is None:
+        jobs = 1
+    elif jobs == 0:
+        jobs = os.cpu_count() or 1
+    filenames = cli_args.filenames
+
+    start = time.perf_counter()
+    warm_up(cli_args)
+    results = []
+    for result in iter_results(cli_args, filenames, jobs):
+        results.append(result)
+        if cli_args.jsonl:
+            print(json.dumps(result), flush=True)
+        else:
+            sys.stdout.write(result["stdout"])
+            sys.stdout.flush()
+            sys.stderr.write(result["stderr"])
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    sys.stdout.flush()
+    print(summary_table(results, jobs, wall_ms), file=sys.stderr)
+    return 1 if any(result["exit_code"] for result in results) else 0
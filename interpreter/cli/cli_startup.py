@@ -1,25 +1,125 @@
 import os
-import logging
+import sys
 from argparse import ArgumentParser
+from contextlib import nullcontext
+from importlib import import_module
 
 from interpreter.lexer.token_types import TOKENS_GROUPS
-from interpreter.error import cli_error
-from interpreter.lexer import tokenize_source
+from interpreter.error import cli_error, InterpreterError
+from interpreter.lexer import iter_tokens
 from interpreter.parser import Parser
 from interpreter.semantics import SemanticAnalyzer
-from interpreter.ast import AST_Printer
-from interpreter.evaluation import *
+from interpreter.evaluation.limits import DEFAULT_MEMO_SIZE, DEFAULT_MAX_CALL_DEPTH
 
 
-def parse_args():
-    """ Parsing args and return it """
+# Logs, listings, reports, engines, the optimizer, the cache and modules are imported only when they are used,
+# so startup of the usual run does not pay for them.
+
+DEFAULT_CACHE_DIR_NAME = ".mtrcache"
+
+# engine name : (module, class) of evaluator
+EVALUATION_ENGINES = {
+    "tree"    : ("interpreter.evaluation", "EvaluationLoop"),
+    "closure" : ("interpreter.evaluation", "ClosureCompiler"),
+    "vm"      : ("interpreter.vm", "VirtualMachine"),
+    "python"  : ("interpreter.transpiler", "PythonEngine"),
+}
+
+# engines which do not use python stack for interpreted calls, their call depth is limited by option
+STACKLESS_ENGINES = ("tree", "vm")
+
+# engines which calls of functions can be measured by profiler
+PROFILED_ENGINES = ("tree", "closure", "python")
+
+
+def load_engine(name: str):
+    """ Returns evaluator class of the engine """
+
+    module_name, class_name = EVALUATION_ENGINES[name]
+    return getattr(import_module(module_name), class_name)
+
+
+def parse_args(argv: list = None):
+    """ Parsing args (command line args by default) and return it """
 
     parser = ArgumentParser(description="Python based typed Interpreter.")
-    parser.add_argument(dest="filename", type=str, help="Main file for interpretation")
+    parser.add_argument(
+        dest="filenames", type=str, nargs="*", metavar="filename",
+        help="Main file for interpretation, several files are run as a batch"
+    )
+    parser.add_argument(
+        "--manifest", type=str, default=None,
+        help="File with paths of scripts of the batch, one per line (relative to the manifest)"
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=None,
+        help="Run scripts of the batch in N processes (0 is count of CPUs), output of every script "
+             "is captured and printed in order of the scripts with the summary on stderr"
+    )
+    parser.add_argument(
+        "--jsonl", action="store_true",
+        help="Print every script of the batch as JSON line with its output, exit code and time"
+    )
     parser.add_argument("-L", "--log", action="store_true", help="Complete log of execution")
+    parser.add_argument(
+        "--engine", choices=EVALUATION_ENGINES.keys(), default="tree",
+        help="Evaluation engine: AST walker, AST compiled to closures, bytecode virtual machine "
+             "or python code compiled by CPython"
+    )
+    parser.add_argument(
+        "-D", "--disassemble", action="store_true", 
+        help="Print bytecode of the program instead of its evaluation"
+    )
+    parser.add_argument(
+        "--emit-python", action="store_true",
+        help="Print python code generated for the program instead of its evaluation"
+    )
+    parser.add_argument(
+        "--no-optimize", action="store_true",
+        help="Evaluate AST without constant folding and simplifications"
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="Lex, parse, analyze and optimize the program even if its result is cached"
+    )
+    parser.add_argument(
+        "--cache-dir", type=str, default=None,
+        help=f"Directory of cached analyzed programs ('{DEFAULT_CACHE_DIR_NAME}' near the entry file by default)"
+    )
+    parser.add_argument(
+        "--memo-size", type=int, default=DEFAULT_MEMO_SIZE,
+        help="Max count of cached results of every pure function (0 disables memoization)"
+    )
+    parser.add_argument(
+        "--max-call-depth", type=int, default=DEFAULT_MAX_CALL_DEPTH,
+        help=f"Max depth of interpreted calls for {' and '.join(STACKLESS_ENGINES)} engines, "
+             "other engines are limited by the python recursion limit"
+    )
+    parser.add_argument(
+        "--profile", nargs="?", choices=["table", "json"], const="table", default=None,
+        help=f"Print calls count, inclusive and self time of every function and intrinsic to stderr "
+             f"as table or json ({', '.join(PROFILED_ENGINES)} engines)"
+    )
+    parser.add_argument(
+        "--timings", nargs="?", choices=["table", "json"], const="table", default=None,
+        help="Print wall time, CPU time and peak memory of every phase and sizes of the program to stderr "
+             "as table or json (the program is analyzed even if it is cached, memory tracing slows phases down)"
+    )
 
-
-    return parser.parse_args()
+    args = parser.parse_args(argv)
+    if args.manifest is not None:
+        from .batch import read_manifest
+        try:
+            args.filenames.extend(read_manifest(args.manifest))
+        except OSError as error:
+            parser.error(f"can not read manifest: {error}")
+    if not args.filenames:
+        parser.error("no files to interpret")
+    if args.jobs is not None and args.jobs < 0:
+        parser.error("--jobs must not be negative")
+    args.batch = len(args.filenames) > 1 or args.manifest is not None or args.jobs is not None
+    args.filename = args.filenames[0]
+    return args
 
 
 def log_header(msg):
@@ -56,6 +156,8 @@ def log_parser(ast, to_log=False):
     if not to_log:
         return
 
+    from interpreter.ast.ast_printer import AST_Printer
+
     log_header("PARSER")
     printer = AST_Printer(ast)
     printer.print()
@@ -69,6 +171,15 @@ def log_semantics(scope_controller, to_log=False):
     print(scope_controller)
 
 
+def log_optimizer(optimizer, to_log=False):
+    if not to_log:
+        return
+
+    log_header("OPTIMIZER")
+    print(f"Folded or simplified expressions: {optimizer.folded_count}")
+    print(f"Loops computed at once: {optimizer.reduced_loops_count}")
+
+
 def log_evaluation(to_log=False):
     if not to_log:
         return
@@ -76,6 +187,108 @@ def log_evaluation(to_log=False):
     log_header("EVALUATION")
 
 
+def log_memoization(interpreter, to_log=False):
+    if not to_log:
+        return
+
+    log_header("MEMOIZATION")
+    if not interpreter.memo_caches:
+        print("No pure functions were memoized")
+    for memo in interpreter.memo_caches.values():
+        print(memo)
+
+
+def report_profile(profiler, report_format):
+    if profiler is None:
+        return
+
+    sys.stdout.flush()
+    print(profiler.as_json() if report_format == "json" else profiler.table(), file=sys.stderr)
+
+
+def report_timings(timings, report_format):
+    if timings is None:
+        return
+
+    sys.stdout.flush()
+    print(timings.as_json() if report_format == "json" else timings.table(), file=sys.stderr)
+
+
+def phase(timings, name):
+    """ Returns context which measures the phase if timings are reported """
+
+    return nullcontext() if timings is None else timings.measure(name)
+
+
+def analyze_program(entry_file_name, cli_args, timings=None, loader=None):
+    """ Returns AST and scope controller of analyzed and optimized program with its modules """
+
+    to_log = cli_args.log
+    # lexer part (tokens are streamed to the parser unless they are logged or timed)
+    tokens = iter_tokens(entry_file_name)
+    if to_log or timings is not None:
+        with phase(timings, "lex"):
+            tokens = list(tokens)
+    log_lexer(tokens, to_log)
+    # parser part (used modules are parsed too)
+    with phase(timings, "parse"):
+        parser = Parser(tokens)
+        ast = parser.parse()
+        if loader is None:
+            from interpreter.modules import ModuleLoader
+            loader = ModuleLoader()
+        ast = loader.load(ast, entry_file_name)
+    log_parser(ast, to_log)
+    # semantics part
+    with phase(timings, "analyze"):
+        sem_analyzer = SemanticAnalyzer(ast)
+        scope_controller = sem_analyzer.analyze()
+    log_semantics(scope_controller, to_log)
+    if timings is not None:
+        from interpreter.ast import iter_nodes
+
+        timings.count("tokens", len(tokens))
+        timings.count("ast_nodes", sum(1 for _ in iter_nodes(ast)))
+        timings.count("scopes", scope_controller.get_scopes_count())
+    # optimization part
+    if not cli_args.no_optimize:
+        from interpreter.optimizer import Optimizer
+
+        with phase(timings, "optimize"):
+            optimizer = Optimizer(ast, scope_controller)
+            ast = optimizer.optimize()
+        log_optimizer(optimizer, to_log)
+    return ast, scope_controller
+
+
+def load_program(entry_file_name, cli_args, timings=None):
+    """ Returns program ready for evaluation from cache or analyzes it and caches the result """
+
+    if cli_args.no_cache:
+        return analyze_program(entry_file_name, cli_args, timings)
+
+    from interpreter.cache import ProgramCache
+
+    cache_dir = cli_args.cache_dir
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(entry_file_name), DEFAULT_CACHE_DIR_NAME)
+    cache = ProgramCache(cache_dir)
+    source = cache.read_source(entry_file_name)
+    # optimized and not optimized programs are separate entries
+    variant = "analyzed" if cli_args.no_optimize else "optimized"
+
+    # logs and timings show every part of the front end, so cached program is not used
+    program = None if cli_args.log or timings is not None else cache.load(entry_file_name, source, variant)
+    if program is None:
+        from interpreter.modules import ModuleLoader
+
+        # parsed modules are cached separately, so unchanged ones are not parsed again for other programs
+        loader = ModuleLoader(cache)
+        program = analyze_program(entry_file_name, cli_args, timings, loader)
+        cache.store(entry_file_name, source, variant, *program, dependencies=loader.sources)
+    return program
+
+
 def run_main_loop(cli_args):
     """ Run main interpreter cycle if no cli errors """
 
@@ -83,24 +296,59 @@ def run_main_loop(cli_args):
     if os.path.exists(entry_file_name) and os.path.isfile(entry_file_name):
 
         to_log = cli_args.log
-        
-        # lexer part
-        tokens = tokenize_source(entry_file_name)
-        log_lexer(tokens, to_log)
-        # parser part
-        parser = Parser(tokens)
-        ast = parser.parse()
-        log_parser(ast, to_log)
-        # semantics part
-        sem_analyzer = SemanticAnalyzer(ast)
-        scope_controller = sem_analyzer.analyze()
-        log_semantics(scope_controller, to_log)
+        timings = None
+        if cli_args.timings:
+            from .timings import PhaseTimings
+            timings = PhaseTimings()
+
+        # front end and optimization part
+        ast, scope_controller = load_program(entry_file_name, cli_args, timings)
+        # bytecode listing
+        if cli_args.disassemble:
+            from interpreter.vm import BytecodeCompiler, disassemble
+            print(disassemble(BytecodeCompiler(ast, scope_controller).compile()))
+            report_timings(timings, cli_args.timings)
+            return
+        # python code listing
+        if cli_args.emit_python:
+            from interpreter.transpiler import PythonCodeGenerator
+            print(PythonCodeGenerator(ast, scope_controller, cli_args.memo_size > 0).generate(), end="")
+            report_timings(timings, cli_args.timings)
+            return
         # evaluation
         log_evaluation(to_log)
-        interpreter = EvaluationLoop(ast, scope_controller)
-        interpreter.evaluate()
+        engine_options = {"memo_size": cli_args.memo_size}
+        if cli_args.engine in STACKLESS_ENGINES:
+            engine_options["max_call_depth"] = cli_args.max_call_depth
+        profiler = None
+        if cli_args.profile:
+            if cli_args.engine not in PROFILED_ENGINES:
+                cli_error(f"Profiling is not supported by '{cli_args.engine}' engine")
+            from interpreter.evaluation import Profiler
+            profiler = engine_options["profiler"] = Profiler()
+        interpreter = load_engine(cli_args.engine)(ast, scope_controller, **engine_options)
+        with phase(timings, "evaluate"):
+            interpreter.evaluate()
+        log_memoization(interpreter, to_log)
+        report_profile(profiler, cli_args.profile)
+        report_timings(timings, cli_args.timings)
 
 
         
     else:
         cli_error(f"Can not find file with name '{entry_file_name}'")
+
+
+def run_cli(cli_args):
+    """ Runs the program or the batch of programs, returns exit status """
+
+    if cli_args.batch:
+        from .batch import run_batch
+        return run_batch(cli_args)
+    try:
+        run_main_loop(cli_args)
+    except InterpreterError as error:
+        sys.stdout.flush()
+        print(error)
+        return error.exit_code
+    return 0
@@ -0,0 +1,60 @@
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+class PhaseTimings():
+    """ Wall time, CPU time and peak of traced memory of pipeline phases,
+        and sizes of the program (tokens, AST nodes, scopes) """
+
+    def __init__(self):
+        # phase name : {"wall_ms", "cpu_ms", "peak_memory_kb"} in order of phases
+        self.phases = {}
+        # name : count of program items
+        self.counts = {}
+
+    @contextmanager
+    def measure(self, phase: str):
+        """ Measures the code of the context as the phase, memory is traced only inside of it """
+
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+        else:
+            tracemalloc.start()
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+            peak = tracemalloc.get_traced_memory()[1]
+            if not tracing:
+                tracemalloc.stop()
+            self.phases[phase] = {
+                "wall_ms"        : wall * 1000,
+                "cpu_ms"         : cpu * 1000,
+                "peak_memory_kb" : peak / 1024,
+            }
+
+    def count(self, name: str, value: int):
+        self.counts[name] = value
+
+    def table(self):
+        """ Returns text table of phases followed by counts """
+
+        lines = [f"{'phase':<12} {'wall ms':>12} {'cpu ms':>12} {'peak memory KiB':>16}"]
+        for phase, stats in self.phases.items():
+            lines.append(
+                f"{phase:<12} {stats['wall_ms']:>12.3f} {stats['cpu_ms']:>12.3f} {stats['peak_memory_kb']:>16.1f}"
+            )
+        if self.phases:
+            wall = sum(stats["wall_ms"] for stats in self.phases.values())
+            cpu = sum(stats["cpu_ms"] for stats in self.phases.values())
+            lines.append(f"{'total':<12} {wall:>12.3f} {cpu:>12.3f}")
+        for name, value in self.counts.items():
+            lines.append(f"{name}: {value}")
+        return "\n".join(lines)
+
+    def as_json(self):
+        return json.dumps({"phases": self.phases, "counts": self.counts}, indent=2)
@@ -1,29 +1,59 @@
+class InterpreterError(Exception):
+    """ Error of the interpreted program or of the command line, its message is the report for the user.
+        It is printed by the top level, so one failing script does not stop the others """
+
+    exit_code = 1
+
+
+class CliError(InterpreterError):
+    pass
+
+
+class ProgramSyntaxError(InterpreterError):
+    pass
+
+
+class ProgramSemanticError(InterpreterError):
+    pass
+
+
+class ProgramRuntimeError(InterpreterError):
+    pass
+
 
 def cli_error(message: str):
     """ Throws cli error """
 
-    print("Error occured!")
-    print(f"    {message}")
-    exit(1)
+    raise CliError(
+        "Error occured!\n"
+        f"    {message}"
+    )
 
 
 def analysis_error_template(message: str, code_fragment: str, row: int, col: int, filename: str):
-    print(f"    {message}")
-    print(f"    in file '{filename}'")
-    print(f"    -> '{code_fragment}...' at pos [{row}:{col}].")
+    return (
+        f"    {message}\n"
+        f"    in file '{filename}'\n"
+        f"    -> '{code_fragment}...' at pos [{row}:{col}]."
+    )
 
 
 def syntax_error(*args):
     """ Throws syntax error """
 
-    print("Syntax error occured")
-    analysis_error_template(*args)
-    exit(1)
+    raise ProgramSyntaxError("Syntax error occured\n" + analysis_error_template(*args))
 
 
 def semantic_error(*args):
     """ Throws semantic error """
 
-    print("Semantic error occured")
-    analysis_error_template(*args)
-    exit(1)
\ No newline at end of file
+    raise ProgramSemanticError("Semantic error occured\n" + analysis_error_template(*args))
+
+
+def runtime_error(message: str):
+    """ Throws runtime error """
+
+    raise ProgramRuntimeError(
+        "Runtime error occured\n"
+        f"    {message}"
+    )
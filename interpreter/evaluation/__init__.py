@@ -1 +1,27 @@
-from .evaluation import *
\ No newline at end of file
+from importlib import import_module
+
+from .limits import *
+from .operations import *
+from .memoization import *
+
+
+# Engines and the profiler are imported at first use, so the cli does not pay for the engines it does not run.
+# name : module which defines it
+LAZY_NAMES = {
+    "EvaluationLoop"  : ".evaluation",
+    "ClosureCompiler" : ".closure_compiler",
+    "BREAK"           : ".closure_compiler",
+    "CONTINUE"        : ".closure_compiler",
+    "Profiler"        : ".profiler",
+    "FunctionProfile" : ".profiler",
+}
+
+__all__ = [
+    name for name in globals() if not name.startswith("_") and name not in ("import_module", "LAZY_NAMES")
+] + list(LAZY_NAMES)
+
+
+def __getattr__(name: str):
+    if name not in LAZY_NAMES:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+    return getattr(import_module(LAZY_NAMES[name], __name__), name)
@@ -0,0 +1,375 @@
+from interpreter.ast import *
+from interpreter.builtins import *
+from interpreter.lexer import TokenType
+from interpreter.semantics import *
+from .evaluation import EvaluationLoop
+from .operations import *
+from .memoization import *
+
+
+BREAK = EvaluationLoop.BlockRetType.BREAK
+CONTINUE = EvaluationLoop.BlockRetType.CONTINUE
+TailCall = EvaluationLoop.TailCall
+
+
+def and_closure(left, right):
+    def and_op():
+        # both operands are evaluated as in EvaluationLoop (no short circuit)
+        x = left()
+        y = right()
+        return x and y
+    return and_op
+
+
+def or_closure(left, right):
+    def or_op():
+        x = left()
+        y = right()
+        return x or y
+    return or_op
+
+
+# operator : factory of closure which evaluates operands closures and applies operator
+BINOP_CLOSURES = {
+    TokenType.PLUS_OP  : lambda left, right: lambda: left() + right(),
+    TokenType.MINUS_OP : lambda left, right: lambda: left() - right(),
+    TokenType.MULT_OP  : lambda left, right: lambda: left() * right(),
+    TokenType.DIV_OP   : lambda left, right: lambda: left() / right(),
+    TokenType.AND_OP   : and_closure,
+    TokenType.OR_OP    : or_closure,
+
+    TokenType.GT_OP    : lambda left, right: lambda: left() > right(),
+    TokenType.GTE_OP   : lambda left, right: lambda: left() >= right(),
+    TokenType.LT_OP    : lambda left, right: lambda: left() < right(),
+    TokenType.LTE_OP   : lambda left, right: lambda: left() <= right(),
+    TokenType.EQ_OP    : lambda left, right: lambda: left() == right(),
+    TokenType.NEQ_OP   : lambda left, right: lambda: left() != right(),
+}
+
+UNOP_CLOSURES = {
+    TokenType.MINUS_OP : lambda left: lambda: -left(),
+    TokenType.NOT_OP   : lambda left: lambda: not left(),
+}
+
+
+class ClosureCompiler(TreeVisitor):
+    """ Compiles every node of analyzed AST once into python closure with
+        resolved symbols and operators, then runs program by calling root closure.
+        Produces the same output as EvaluationLoop """
+
+    def __init__(
+        self, ast: AST_Node, scope_controller: ScopeController, memo_size: int = DEFAULT_MEMO_SIZE,
+        profiler: "Profiler" = None
+    ):
+        super().__init__(ast)
+        self.scope_controller = scope_controller
+        # calls of functions are measured only if there is a profiler
+        self.profiler = profiler
+
+        # func symbol : results cache of pure function (no caches if memo size is 0)
+        self.memo_size = memo_size
+        self.memo_caches = {}
+
+        self.cur_func_symbol = None
+
+        # depth : values array of the function running at this depth
+        self.global_frame = scope_controller.global_frame_layout.new_frame()
+        self.frames = [self.global_frame]
+
+    def visit_literal(self, node):
+        value = LITERAL_CONVERSIONS[node.start_token.type](node.value)
+        return lambda: value
+
+    def slot_getter(self, depth: int, slot: int):
+        if depth == 0:
+            global_frame = self.global_frame
+            return lambda: global_frame[slot]
+        frames = self.frames
+        return lambda: frames[depth][slot]
+
+    def slot_setter(self, depth: int, slot: int, cast, value):
+        """ Returns closure which stores casted value in the slot, cast may be None """
+
+        if depth == 0:
+            global_frame = self.global_frame
+            if cast is None:
+                def store():
+                    global_frame[slot] = value()
+                return store
+
+            def store():
+                global_frame[slot] = cast(value())
+            return store
+
+        frames = self.frames
+        if cast is None:
+            def store():
+                frames[depth][slot] = value()
+            return store
+
+        def store():
+            frames[depth][slot] = cast(value())
+        return store
+
+    def value_cast(self, value_node, type_name: str):
+        """ Returns conversion of the value to the type or None if value already has the type """
+
+        if not is_cast_needed(value_node, type_name):
+            return None
+        return type_cast_func(type_name)
+
+    def visit_var(self, node):
+        return self.slot_getter(node.depth, node.slot)
+
+    def visit_index(self, node):
+        values = self.slot_getter(node.depth, node.slot)
+        index = self.visit_node(node.index)
+        index_cast = self.value_cast(node.index, INT_TYPE.name)
+        if index_cast is not None:
+            index = lambda index=index: index_cast(index())
+
+        def load():
+            items, position = values(), index()
+            try:
+                return items[position]
+            except IndexError:
+                array_item_error(items, position)
+
+        # bools are stored as ints
+        if node.value_type is bool:
+            return lambda: bool(load())
+        return load
+
+    def visit_type(self, node):
+        pass
+
+    def visit_binop(self, node):
+        left = self.visit_node(node.left)
+        right = self.visit_node(node.right)
+        return BINOP_CLOSURES[node.start_token.type](left, right)
+
+    def visit_unop(self, node):
+        left = self.visit_node(node.left)
+        return UNOP_CLOSURES[node.start_token.type](left)
+
+    def visit_var_decl(self, node):
+        if not node.value:
+            return self.slot_setter(node.depth, node.slot, None, lambda: None)
+
+        cast = self.value_cast(node.value, node.type_node.name)
+        return self.slot_setter(node.depth, node.slot, cast, self.visit_node(node.value))
+
+    def visit_var_assign(self, node):
+        cast = self.value_cast(node.value, node.var_type.name)
+        return self.slot_setter(node.depth, node.slot, cast, self.visit_node(node.value))
+
+    def visit_index_assign(self, node):
+        values = self.slot_getter(node.depth, node.slot)
+        index = self.visit_node(node.index)
+        index_cast = self.value_cast(node.index, INT_TYPE.name)
+        if index_cast is not None:
+            index = lambda index=index: index_cast(index())
+        value = self.visit_node(node.value)
+        cast = self.value_cast(node.value, node.var_type.name)
+        if cast is not None:
+            value = lambda value=value: cast(value())
+
+        def store():
+            # value is evaluated before the array and index as in EvaluationLoop
+            item = value()
+            items, position = values(), index()
+            try:
+                items[position] = item
+            except (IndexError, OverflowError):
+                array_item_error(items, position, item)
+        return store
+
+    def visit_if_else(self, node):
+        body = self.visit_node(node.body)
+        # else branch
+        if not node.condition:
+            return body
+
+        condition = self.visit_node(node.condition)
+        else_branch = self.visit_node(node.else_branch)
+
+        if not else_branch:
+            def if_else():
+                if condition():
+                    return body()
+            return if_else
+
+        def if_else():
+            if condition():
+                return body()
+            return else_branch()
+        return if_else
+
+    def visit_loop(self, node):
+        body = self.visit_node(node.body)
+
+        # loop without condition
+        if not node.var:
+            def loop():
+                while True:
+                    result = body()
+                    if result is not None:
+                        if result is BREAK:
+                            break
+                        elif result is CONTINUE:
+                            continue
+                        # return case
+                        else:
+                            return result
+            return loop
+
+        # loop with condition
+        range_from = self.visit_node(node.range[0])
+        range_to = self.visit_node(node.range[1])
+        step = self.visit_node(node.step)
+
+        depth, slot = node.var.depth, node.var.slot
+        frames = self.frames
+        reduction = node.reduction
+
+        def loop():
+            range_from_val = range_from()
+            range_to_val = range_to()
+            step_val = step() if step else None
+
+            # all iterations of simple counted loop are computed at once if its values allow
+            if reduction is not None and reduction.run(frames, range_from_val, range_to_val, step_val):
+                return None
+            if step_val is None:
+                step_val = 1 if range_from_val < range_to_val else -1
+
+            frame = frames[depth]
+            frame[slot] = range_from_val
+            for frame[slot] in range(range_from_val, range_to_val, step_val):
+                result = body()
+                if result is not None:
+                    if result is BREAK:
+                        break
+                    elif result is CONTINUE:
+                        continue
+                    # return case
+                    else:
+                        return result
+        return loop
+
+    def visit_func_decl(self, node):
+        func_symbol = node.symbol
+        frame_layout = func_symbol.frame_layout
+        depth = frame_layout.depth
+        params_slots = [param.slot for param in node.params]
+        ret_cast = type_cast_func(func_symbol.ret_type.name)
+        frames = self.frames
+
+        tmp_func_symbol = self.cur_func_symbol
+        self.cur_func_symbol = func_symbol
+        body = self.visit_node(node.body)
+        self.cur_func_symbol = tmp_func_symbol
+
+        acquire_frame = frame_layout.acquire_frame
+        release_frame = frame_layout.release_frame
+
+        def func(*args):
+            # every call has its own values of the function vars
+            frame = acquire_frame()
+            for slot, arg in zip(params_slots, args):
+                frame[slot] = arg
+
+            tmp_frame = frames[depth]
+            frames[depth] = frame
+            result = body()
+
+            # tail calls rebind params in the same frame
+            if type(result) is TailCall:
+                initial_values = frame_layout.initial_values
+                while type(result) is TailCall:
+                    frame[:] = initial_values
+                    for slot, arg in zip(params_slots, result.args):
+                        frame[slot] = arg
+                    result = body()
+                # result of the last call is casted by the return of the first one
+                result = ret_cast(result)
+
+            frames[depth] = tmp_frame
+
+            release_frame(frame)
+            return result
+
+        if func_symbol.pure and self.memo_size > 0:
+            self.memo_caches[func_symbol] = MemoCache(func_symbol.name, self.memo_size)
+            func = memoized(func, self.memo_caches[func_symbol])
+        if self.profiler is not None:
+            func = self.profiler.profiled(func, self.profiler.function_profile(func_symbol, node))
+
+        def func_decl():
+            if len(frames) <= depth:
+                frames.append(None)
+            func_symbol.value = func
+        return func_decl
+
+    def visit_func_call(self, node):
+        func_symbol = node.symbol
+        args = [self.visit_node(arg) for arg in node.args]
+
+        if len(args) == 0:
+            return lambda: func_symbol.value()
+        elif len(args) == 1:
+            arg = args[0]
+            return lambda: func_symbol.value(arg())
+        elif len(args) == 2:
+            arg1, arg2 = args
+            return lambda: func_symbol.value(arg1(), arg2())
+        return lambda: func_symbol.value(*[arg() for arg in args])
+
+    def visit_return(self, node):
+        assert self.cur_func_symbol
+        if node.tail_call:
+            args = [self.visit_node(arg) for arg in node.value.args]
+            return lambda: TailCall([arg() for arg in args])
+
+        cast = self.value_cast(node.value, self.cur_func_symbol.ret_type.name)
+        value = self.visit_node(node.value)
+        if cast is None:
+            return value
+        return lambda: cast(value())
+
+    def visit_continue(self, node):
+        return lambda: CONTINUE
+
+    def visit_break(self, node):
+        return lambda: BREAK
+
+    def visit_block(self, node):
+        is_global_scope = node is self.ast
+        statements = [self.visit_node(stm) for stm in node.statements]
+
+        # results of global statements are ignored
+        if is_global_scope:
+            def block():
+                for stm in statements:
+                    stm()
+            return block
+
+        # first statement result ends the block
+        def block():
+            for stm in statements:
+                stm_result = stm()
+                if stm_result is not None:
+                    return stm_result
+        return block
+
+    def compile(self):
+        """ Returns closure of the whole program """
+
+        return self.visit_node(self.ast)
+
+    def evaluate(self):
+        if self.profiler is None:
+            self.compile()()
+            return
+        with self.profiler.instrumented_intrinsics(self.scope_controller):
+            self.compile()()
@@ -3,6 +3,19 @@ from interpreter.ast import *
 from interpreter.error import *
 from interpreter.builtins import *
 from interpreter.semantics import *
+from .operations import *
+from .memoization import *
+from .limits import DEFAULT_MAX_CALL_DEPTH
+
+
+# max height of subtree visited by python recursion, higher ones are visited on the work stack
+MAX_PLAIN_HEIGHT = 32
+
+# nodes which may be visited by python recursion (literals, vars, next and stop are always visited so)
+PLAIN_NODE_TYPES = (
+    Binary_Op_Node, Unary_Op_Node, Func_Call_Node, Var_Decl_Node, Var_Assign_Node, Return_Node, If_Else_Node, Block_Node,
+    Index_Node, Index_Assign_Node
+)
 
 
 class EvaluationLoop(TreeVisitor):
@@ -11,128 +24,235 @@ class EvaluationLoop(TreeVisitor):
         CONTINUE = 1,
         BREAK = 2,
 
-    def __init__(self, ast: AST_Node, scope_controller: ScopeController):
+    class TailCall():
+        """ Result of self call in return statement, 
+            the function evaluates its body again with these args """
+
+        def __init__(self, args: list):
+            self.args = args
+
+    def __init__(
+        self, ast: AST_Node, scope_controller: ScopeController, memo_size: int = DEFAULT_MEMO_SIZE,
+        max_call_depth: int = DEFAULT_MAX_CALL_DEPTH, profiler: "Profiler" = None
+    ):
         super().__init__(ast)
         self.silent = False
         self.scope_controller = scope_controller
-        self.cur_block_node = None
+        # calls of functions are measured only if there is a profiler
+        self.profiler = profiler
+
+        # func symbol : results cache of pure function (no caches if memo size is 0)
+        self.memo_size = memo_size
+        self.memo_caches = {}
     
         self.cur_func_symbol = None
+        self.max_call_depth = max_call_depth
+        self.call_depth = 0
 
-    def get_scope(self):
-        return self.scope_controller.get_scope(self.cur_block_node)
+        # depth : values array of the function running at this depth
+        self.frames = [scope_controller.global_frame_layout.new_frame()]
+
+        # node : it is visited by python recursion
+        self.plain_nodes = {}
+        # node type : its handler which uses the work stack
+        self.stacked_handlers = {}
+        for node_type in PLAIN_NODE_TYPES:
+            self.stacked_handlers[node_type] = self.nodes_handlers[node_type]
+            self.nodes_handlers[node_type] = self.visit_plain_or_stacked
 
     def type_cast(self, type_name: str, value: any):
-        conversion = {
-            INT_TYPE.name   : int,
-            FLOAT_TYPE.name : float,
-            STR_TYPE.name   : str,
-            BOOL_TYPE.name  : bool
-        }
-        return conversion[type_name](value)
+        return TYPE_CASTS[type_name](value)
+
+    def value_cast(self, value_node, type_name: str, value: any):
+        """ Casts evaluated value of the node if it may have another type """
+
+        if is_cast_needed(value_node, type_name):
+            return self.type_cast(type_name, value)
+        return value
+
+    def load_item(self, node, values, index: any):
+        """ Returns element of array, bools are stored as ints """
+
+        index = self.value_cast(node.index, INT_TYPE.name, index)
+        try:
+            value = values[index]
+        except IndexError:
+            array_item_error(values, index)
+        return bool(value) if node.value_type is bool else value
+
+    def store_item(self, node, value: any, values, index: any):
+        index = self.value_cast(node.index, INT_TYPE.name, index)
+        try:
+            values[index] = value
+        except (IndexError, OverflowError):
+            array_item_error(values, index, value)
+
+    def is_plain(self, node, max_height: int = MAX_PLAIN_HEIGHT):
+        """ Checks that node is expression (or statement with expression) which is not too high
+            and has no interpreted calls, so it can be visited by python recursion,
+            which is much faster than the work stack """
+
+        node_type = type(node)
+        if node_type in (Literal_Node, Var_Node, Continue_Node, Break_Node):
+            return True
+        if max_height <= 1:
+            return False
+
+        if node_type is Binary_Op_Node:
+            operands = (node.left, node.right)
+        elif node_type is Unary_Op_Node:
+            operands = (node.left,)
+        elif node_type is Func_Call_Node and node.symbol.frame_layout is None:
+            operands = node.args
+        elif node_type is Var_Decl_Node:
+            operands = (node.value,) if node.value else ()
+        elif node_type is Var_Assign_Node:
+            operands = (node.value,)
+        elif node_type is Index_Node:
+            operands = (node.index,)
+        elif node_type is Index_Assign_Node:
+            operands = (node.index, node.value)
+        elif node_type is Return_Node:
+            operands = node.value.args if node.tail_call else (node.value,)
+        elif node_type is If_Else_Node:
+            operands = [operand for operand in (node.condition, node.body, node.else_branch) if operand]
+        elif node_type is Block_Node:
+            operands = node.statements
+        else:
+            return False
+        return all(self.is_plain(operand, max_height - 1) for operand in operands)
+
+    def plain_visit(self, node):
+        """ Visits plain node by python recursion """
+
+        node_type = type(node)
+        if node_type is Var_Node:
+            return self.frames[node.depth][node.slot]
+        if node_type is Literal_Node:
+            return LITERAL_CONVERSIONS[node.start_token.type](node.value)
+        if node_type is Binary_Op_Node:
+            return binary_operation(node)(self.plain_visit(node.left), self.plain_visit(node.right))
+        if node_type is Unary_Op_Node:
+            return UNARY_OPERATIONS[node.start_token.type](self.plain_visit(node.left))
+        if node_type is Func_Call_Node:
+            return node.symbol.value(*[self.plain_visit(arg) for arg in node.args])
+        if node_type is Var_Decl_Node:
+            init_value = None
+            if node.value:
+                init_value = self.value_cast(node.value, node.type_node.name, self.plain_visit(node.value))
+            self.frames[node.depth][node.slot] = init_value
+            return None
+        if node_type is Var_Assign_Node:
+            value = self.value_cast(node.value, node.var_type.name, self.plain_visit(node.value))
+            self.frames[node.depth][node.slot] = value
+            return None
+        if node_type is Index_Node:
+            return self.load_item(node, self.frames[node.depth][node.slot], self.plain_visit(node.index))
+        if node_type is Index_Assign_Node:
+            value = self.value_cast(node.value, node.var_type.name, self.plain_visit(node.value))
+            self.store_item(node, value, self.frames[node.depth][node.slot], self.plain_visit(node.index))
+            return None
+        if node_type is Block_Node:
+            is_global_scope = node is self.ast
+            for stm in node.statements:
+                stm_result = self.plain_visit(stm)
+                if stm_result != None and not is_global_scope:
+                    return stm_result
+            return None
+        if node_type is If_Else_Node:
+            if not node.condition or self.plain_visit(node.condition):
+                return self.plain_visit(node.body)
+            elif node.else_branch:
+                return self.plain_visit(node.else_branch)
+            return None
+        if node_type is Continue_Node:
+            return self.BlockRetType.CONTINUE
+        if node_type is Break_Node:
+            return self.BlockRetType.BREAK
+        # return
+        if node.tail_call:
+            return self.TailCall([self.plain_visit(arg) for arg in node.value.args])
+        return self.value_cast(node.value, self.cur_func_symbol.ret_type.name, self.plain_visit(node.value))
+
+    def visit_plain_or_stacked(self, node):
+        """ Handler of nodes which are visited on the work stack only if they are not plain """
+
+        plain = self.plain_nodes.get(node)
+        if plain is None:
+            plain = self.plain_nodes[node] = self.is_plain(node)
+
+        if plain:
+            return self.plain_visit(node)
+        return self.stacked_handlers[type(node)](node)
 
     def visit_literal(self, node):
-        conversion = {
-            TokenType.INT_LITERAL   : int,
-            TokenType.FLOAT_LITERAL : float,
-            TokenType.STR_LITERAL   : str
-        }
-        return conversion[node.start_token.type](node.value)
+        return LITERAL_CONVERSIONS[node.start_token.type](node.value)
 
     def visit_var(self, node):
-        scope = self.get_scope()
-        var_symbol = scope.get_symbol(node.name)
-        return var_symbol.value
+        return self.frames[node.depth][node.slot]
+
+    def visit_index(self, node):
+        values = self.frames[node.depth][node.slot]
+        return self.load_item(node, values, (yield node.index))
 
     def visit_type(self, node):
         pass
 
     def visit_binop(self, node):
-        op = node.start_token.type
-        left = self.visit_node(node.left)
-        right = self.visit_node(node.right)
-
-        operation = {
-            TokenType.PLUS_OP  : lambda x, y: x + y,
-            TokenType.MINUS_OP : lambda x, y: x - y,
-            TokenType.MULT_OP  : lambda x, y: x * y,
-            TokenType.DIV_OP   : lambda x, y: x / y,
-            TokenType.AND_OP   : lambda x, y: x and y,
-            TokenType.OR_OP    : lambda x, y: x or y,
-
-            TokenType.GT_OP    : lambda x, y: x > y,
-            TokenType.GTE_OP   : lambda x, y: x >= y,
-            TokenType.LT_OP    : lambda x, y: x < y,
-            TokenType.LTE_OP   : lambda x, y: x <= y,
-            TokenType.EQ_OP    : lambda x, y: x == y,
-            TokenType.NEQ_OP   : lambda x, y: x != y,
-        }
-
-        return operation[op](left, right)
+        left = yield node.left
+        right = yield node.right
+        return binary_operation(node)(left, right)
 
     def visit_unop(self, node):
-        op = node.start_token.type
-        left = self.visit_node(node.left)
-
-        operation = {
-            TokenType.MINUS_OP : lambda x: -x,
-            TokenType.NOT_OP   : lambda x: not x,
-        }
-
-        return operation[op](left)
+        left = yield node.left
+        return UNARY_OPERATIONS[node.start_token.type](left)
 
     def visit_var_decl(self, node):
-        scope = self.get_scope()
-        var_symbol = scope.get_symbol(node.name)
         init_value = None
         if node.value:
-            init_value = self.type_cast(
-                var_symbol.type.name,
-                self.visit_node(node.value)
-            )
-        var_symbol.value = init_value
+            init_value = self.value_cast(node.value, node.type_node.name, (yield node.value))
+        self.frames[node.depth][node.slot] = init_value
 
     def visit_var_assign(self, node):
-        scope = self.get_scope()
-        var_symbol = scope.get_symbol(node.name)
-        var_symbol.value = self.type_cast(
-            var_symbol.type.name,
-            self.visit_node(node.value)
-        )
+        self.frames[node.depth][node.slot] = self.value_cast(node.value, node.var_type.name, (yield node.value))
+
+    def visit_index_assign(self, node):
+        value = self.value_cast(node.value, node.var_type.name, (yield node.value))
+        values = self.frames[node.depth][node.slot]
+        self.store_item(node, value, values, (yield node.index))
 
     def visit_if_else(self, node):
         cond_res = True
         if node.condition:
-            cond_res = self.visit_node(node.condition)
+            cond_res = yield node.condition
         
         if cond_res:
-            return self.visit_node(node.body)
+            return (yield node.body)
         elif node.else_branch:
-            return self.visit_node(node.else_branch)
+            return (yield node.else_branch)
         
     def visit_loop(self, node):
         # loop with condition
         if node.var:
-            range_from_val = self.visit_node(node.range[0])
-            range_to_val = self.visit_node(node.range[1])
-            step = 0
+            range_from_val = yield node.range[0]
+            range_to_val = yield node.range[1]
+            step = None
             if node.step:
-                step = self.visit_node(node.step)
-            else:
+                step = yield node.step
+
+            # all iterations of simple counted loop are computed at once if its values allow
+            if node.reduction is not None and node.reduction.run(self.frames, range_from_val, range_to_val, step):
+                return None
+            if step is None:
                 step = 1 if range_from_val < range_to_val else -1
             
-            scope = None
-            if isinstance(node.var, Var_Decl_Node):
-                scope = self.scope_controller.get_scope(node.body)
-            else:
-                scope = self.get_scope()
-
-            it_var_symbol = scope.get_symbol(node.var.name)
+            frame = self.frames[node.var.depth]
+            slot = node.var.slot
 
             # loop runtime logic
-            it_var_symbol.value = range_from_val
-            for it_var_symbol.value in range (range_from_val, range_to_val, step):
-                result = self.visit_node(node.body)
+            frame[slot] = range_from_val
+            for frame[slot] in range (range_from_val, range_to_val, step):
+                result = yield node.body
                 if result != None:
                     if result == self.BlockRetType.BREAK:
                         break
@@ -144,7 +264,7 @@ class EvaluationLoop(TreeVisitor):
         # loop without condition
         else:
             while True:
-                result = self.visit_node(node.body)
+                result = yield node.body
                 if result != None:
                     if result == self.BlockRetType.BREAK:
                         break
@@ -157,42 +277,91 @@ class EvaluationLoop(TreeVisitor):
         return None
     
     def visit_func_decl(self, node):
-        func_body_scope = self.scope_controller.get_scope(node.body)
-        func_symbol = func_body_scope.get_symbol(node.name)
+        func_symbol = node.symbol
+        frame_layout = func_symbol.frame_layout
+        depth = frame_layout.depth
+        params_slots = [param.slot for param in node.params]
+        ret_type_name = func_symbol.ret_type.name
+
+        if len(self.frames) <= depth:
+            self.frames.append(None)
+
+        memo = None
+        if func_symbol.pure and self.memo_size > 0:
+            # cache is shared by every evaluation of the declaration
+            if func_symbol not in self.memo_caches:
+                self.memo_caches[func_symbol] = MemoCache(func_symbol.name, self.memo_size)
+            memo = self.memo_caches[func_symbol]
 
         def func(*args):
-            # setting current args and saving args values of previous func call
-            prev_call_params = []
-            for i in range(len(node.params)):
-                param_symbol = func_body_scope.get_symbol(node.params[i].name)
-                prev_call_params.append(param_symbol.value)
-                param_symbol.value = args[i]
+            """ Generator of the call, visit_func_call runs it on the work stack of the traversal """
+
+            memo_key = None
+            if memo is not None and memo.enabled:
+                memo_key = memo.key(args)
+                if memo_key is not None:
+                    result = memo.get(memo_key)
+                    if result is not MISS:
+                        return result
+
+            if self.call_depth >= self.max_call_depth:
+                runtime_error(f"Max call depth {self.max_call_depth} is exceeded by call of '{func_symbol.name}'")
+            self.call_depth += 1
+
+            # every call has its own values of the function vars
+            frame = frame_layout.acquire_frame()
+            for slot, arg in zip(params_slots, args):
+                frame[slot] = arg
 
             # func body evaluation
+            tmp_frame = self.frames[depth]
             tmp_func_symbol = self.cur_func_symbol
+            self.frames[depth] = frame
             self.cur_func_symbol = func_symbol
-            result = self.visit_node(node.body)
-            self.cur_func_symbol = tmp_func_symbol
+            result = yield node.body
+
+            # tail calls rebind params in the same frame
+            if isinstance(result, self.TailCall):
+                while isinstance(result, self.TailCall):
+                    frame[:] = frame_layout.initial_values
+                    for slot, arg in zip(params_slots, result.args):
+                        frame[slot] = arg
+                    result = yield node.body
+                # result of the last call is casted by the return of the first one
+                result = self.type_cast(ret_type_name, result)
 
-            # back to params of the previous func call
-            for i in range(len(node.params)):
-                param_symbol.value = prev_call_params.pop()
+            self.cur_func_symbol = tmp_func_symbol
+            self.frames[depth] = tmp_frame
+            self.call_depth -= 1
 
+            frame_layout.release_frame(frame)
+            if memo_key is not None:
+                memo.put(memo_key, result)
             return result
-        
+
+        if self.profiler is not None:
+            func = self.profiler.profiled_generator(func, self.profiler.function_profile(func_symbol, node))
         func_symbol.value = func
 
     def visit_func_call(self, node):
-        scope = self.get_scope()
-        func_symbol = scope.get_symbol(node.name)
-        func = func_symbol.value
-        args = [self.visit_node(arg) for arg in node.args]
-        return func(*args)
+        args = []
+        for arg in node.args:
+            args.append((yield arg))
+
+        func_symbol = node.symbol
+        # builtins are python functions
+        if func_symbol.frame_layout is None:
+            return func_symbol.value(*args)
+        return (yield func_symbol.value(*args))
 
     def visit_return(self, node):
         assert self.cur_func_symbol
-        ret_value = self.visit_node(node.value)
-        return self.type_cast(self.cur_func_symbol.ret_type.name, ret_value)
+        if node.tail_call:
+            args = []
+            for arg in node.value.args:
+                args.append((yield arg))
+            return self.TailCall(args)
+        return self.value_cast(node.value, self.cur_func_symbol.ret_type.name, (yield node.value))
 
     def visit_continue(self, node):
         return self.BlockRetType.CONTINUE
@@ -201,23 +370,22 @@ class EvaluationLoop(TreeVisitor):
         return self.BlockRetType.BREAK
 
     def visit_block(self, node):
-        prev_block_node = self.cur_block_node
-        self.cur_block_node = node
-        
-        is_global_scope = self.get_scope() == self.scope_controller.get_global_scope()
+        is_global_scope = node is self.ast
 
         ret_value = None
 
         for stm in node.statements:
-            stm_result = self.visit_node(stm)
+            stm_result = yield stm
 
             if stm_result != None and not is_global_scope:
                 ret_value = stm_result
                 break
 
-        self.cur_block_node = prev_block_node
-
         return ret_value
 
     def evaluate(self):
-        self.traverse()
+        if self.profiler is None:
+            self.traverse()
+            return
+        with self.profiler.instrumented_intrinsics(self.scope_controller):
+            self.traverse()
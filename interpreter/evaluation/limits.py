@@ -0,0 +1,5 @@
+# max count of results cached for every pure function
+DEFAULT_MEMO_SIZE = 1024
+
+# max depth of interpreted calls, the evaluation loop does not use python stack for them
+DEFAULT_MAX_CALL_DEPTH = 100_000
@@ -0,0 +1,73 @@
+from collections import OrderedDict
+
+from .limits import DEFAULT_MEMO_SIZE
+
+# cache lookup result when there is no cached result for the args
+MISS = object()
+
+
+class MemoCache():
+    """ Bounded LRU cache of results of pure function calls.
+        Cache turns itself off when calls of the function are almost never repeated """
+
+    def __init__(self, name: str, max_size: int):
+        self.name = name
+        self.max_size = max_size
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+        # args key : result, least recently used first
+        self.results = OrderedDict()
+
+    def __repr__(self):
+        rate = self.hits / (self.hits + self.misses) if self.hits + self.misses else 0.0
+        state = "" if self.enabled else ", disabled"
+        return f"{self.name}: {self.hits} hits, {self.misses} misses, hit rate {rate:.1%}{state}"
+
+    @staticmethod
+    def key(args: tuple):
+        """ Returns cache key of args or None if the call can not be cached.
+            1, 1.0 and True are equal, so types of args are part of the key,
+            and 0.0 is equal to -0.0, so calls with float zero args are not cached
+            (int 0 and false are equal to 0.0 too, they are checked only if there is such arg) """
+
+        if 0.0 in args and any(type(arg) is float and arg == 0.0 for arg in args):
+            return None
+        return args + tuple(map(type, args))
+
+    def get(self, key: tuple):
+        result = self.results.get(key, MISS)
+        if result is MISS:
+            self.misses += 1
+            if self.misses >= 2 * self.max_size and self.hits * 10 < self.misses:
+                self.enabled = False
+                self.results.clear()
+            return MISS
+
+        self.hits += 1
+        self.results.move_to_end(key)
+        return result
+
+    def put(self, key: tuple, result: any):
+        if not self.enabled:
+            return
+        self.results[key] = result
+        if len(self.results) > self.max_size:
+            self.results.popitem(last=False)
+
+
+def memoized(func: callable, memo: MemoCache):
+    """ Returns func which results are looked up in the cache before the call """
+
+    def memoized_func(*args):
+        if memo.enabled:
+            key = memo.key(args)
+            if key is not None:
+                result = memo.get(key)
+                if result is MISS:
+                    result = func(*args)
+                    memo.put(key, result)
+                return result
+        return func(*args)
+
+    return memoized_func
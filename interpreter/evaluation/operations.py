@@ -0,0 +1,99 @@
+import operator
+from array import array
+
+from interpreter.ast import *
+from interpreter.builtins import *
+from interpreter.lexer import TokenType
+
+
+# token type : literal value conversion
+LITERAL_CONVERSIONS = {
+    TokenType.INT_LITERAL   : int,
+    TokenType.FLOAT_LITERAL : float,
+    TokenType.STR_LITERAL   : str,
+    TokenType.BOOL_LITERAL  : bool,
+}
+
+def array_cast(array_type: ArrayType):
+    """ Returns check of value assigned to var of the array type, arrays are never converted """
+
+    def cast(value):
+        if type(value) is not array or value.typecode != array_type.typecode:
+            raise TypeError(f"'{type(value).__name__}' value is not '{array_type.name}'")
+        return value
+    cast.__name__ = f"{array_type.element_type.name}_array_cast"
+    return cast
+
+
+# type name : conversion of value assigned to var of this type
+TYPE_CASTS = {
+    INT_TYPE.name   : int,
+    FLOAT_TYPE.name : float,
+    STR_TYPE.name   : str,
+    BOOL_TYPE.name  : bool,
+    **{array_type.name: array_cast(array_type) for array_type in ARRAY_TYPES.values()},
+}
+
+
+def and_operation(x, y):
+    # both operands are evaluated before (no short circuit)
+    return x and y
+
+
+def or_operation(x, y):
+    return x or y
+
+
+# operator : handler for operands of any type
+BINARY_OPERATIONS = {
+    TokenType.PLUS_OP  : operator.add,
+    TokenType.MINUS_OP : operator.sub,
+    TokenType.MULT_OP  : operator.mul,
+    TokenType.DIV_OP   : operator.truediv,
+    TokenType.AND_OP   : and_operation,
+    TokenType.OR_OP    : or_operation,
+
+    TokenType.GT_OP    : operator.gt,
+    TokenType.GTE_OP   : operator.ge,
+    TokenType.LT_OP    : operator.lt,
+    TokenType.LTE_OP   : operator.le,
+    TokenType.EQ_OP    : operator.eq,
+    TokenType.NEQ_OP   : operator.ne,
+}
+
+# operator : handler for bool operands, bitwise operators of bools return bools
+BOOL_BINARY_OPERATIONS = {
+    TokenType.AND_OP   : operator.and_,
+    TokenType.OR_OP    : operator.or_,
+}
+
+UNARY_OPERATIONS = {
+    TokenType.MINUS_OP : operator.neg,
+    TokenType.NOT_OP   : operator.not_,
+}
+
+
+def binary_operation(node: Binary_Op_Node):
+    """ Returns handler of binary operation specialized for python types of operands values.
+        Arithmetic and comparison handlers are C functions dispatching int and float operands already """
+
+    op = node.start_token.type
+    if node.left.value_type is bool and node.right.value_type is bool and op in BOOL_BINARY_OPERATIONS:
+        return BOOL_BINARY_OPERATIONS[op]
+    return BINARY_OPERATIONS[op]
+
+
+def type_cast_func(type_name: str):
+    """ Returns conversion for the type, types without conversion fail when it is called """
+
+    cast = TYPE_CASTS.get(type_name)
+    if cast is None:
+        return lambda value: TYPE_CASTS[type_name](value)
+    return cast
+
+
+def is_cast_needed(value_node: AST_Node, type_name: str):
+    """ Value which python type is known to be the type of conversion is not casted """
+
+    cast = TYPE_CASTS.get(type_name)
+    return cast is None or value_node.value_type is not cast
@@ -0,0 +1,145 @@
+import time
+from contextlib import contextmanager
+
+from interpreter.builtins import INTRINSICS_LIST, IntrinsicFunc
+
+
+class FunctionProfile():
+    """ Calls count and wall times of one interpreted function or intrinsic """
+
+    __slots__ = ("name", "kind", "row", "calls", "inclusive_time", "self_time", "active_calls")
+
+    def __init__(self, name: str, kind: str, row: int = None):
+        self.name = name
+        # "function" or "intrinsic"
+        self.kind = kind
+        # source row of the declaration (None for intrinsics)
+        self.row = row
+        self.calls = 0
+        # time from call to return, nested calls of the function itself are counted once
+        self.inclusive_time = 0.0
+        # time of the function own code without nested profiled calls
+        self.self_time = 0.0
+        # count of calls which did not return yet
+        self.active_calls = 0
+
+    @property
+    def average_time(self):
+        return self.inclusive_time / self.calls if self.calls else 0.0
+
+    def as_dict(self):
+        return {
+            "name"         : self.name,
+            "kind"         : self.kind,
+            "line"         : self.row,
+            "calls"        : self.calls,
+            "inclusive_ms" : self.inclusive_time * 1000,
+            "self_ms"      : self.self_time * 1000,
+            "average_ms"   : self.average_time * 1000,
+        }
+
+
+class Profiler():
+    """ Deterministic profiler of interpreted functions and intrinsics.
+        Engines wrap function values only when they are given a profiler,
+        so evaluation without it has no profiling code at all """
+
+    def __init__(self, clock: callable = time.perf_counter):
+        self.clock = clock
+        # func symbol : its profile
+        self.profiles = {}
+        # [profile, call start time, time of nested profiled calls] of calls which did not return yet
+        self.calls_stack = []
+
+    def function_profile(self, func_symbol, node = None):
+        """ Returns profile of the func symbol, user funcs are told apart by row of declaration """
+
+        if func_symbol not in self.profiles:
+            if node is None:
+                self.profiles[func_symbol] = FunctionProfile(func_symbol.name, "intrinsic")
+            else:
+                self.profiles[func_symbol] = FunctionProfile(func_symbol.name, "function", node.start_token.pos.row)
+        return self.profiles[func_symbol]
+
+    def enter(self, profile: FunctionProfile):
+        profile.calls += 1
+        profile.active_calls += 1
+        self.calls_stack.append([profile, self.clock(), 0.0])
+
+    def exit(self):
+        profile, start, nested_time = self.calls_stack.pop()
+        elapsed = self.clock() - start
+        profile.active_calls -= 1
+        profile.self_time += elapsed - nested_time
+        # time of recursive call is already a part of the outermost call
+        if not profile.active_calls:
+            profile.inclusive_time += elapsed
+        if self.calls_stack:
+            self.calls_stack[-1][2] += elapsed
+
+    def profiled(self, func: callable, profile: FunctionProfile):
+        """ Returns func which calls are measured """
+
+        def profiled_func(*args):
+            self.enter(profile)
+            try:
+                return func(*args)
+            finally:
+                self.exit()
+
+        return profiled_func
+
+    def profiled_generator(self, func: callable, profile: FunctionProfile):
+        """ Returns generator function of the call (as in EvaluationLoop) which runs are measured """
+
+        def profiled_func(*args):
+            self.enter(profile)
+            try:
+                return (yield from func(*args))
+            finally:
+                self.exit()
+
+        return profiled_func
+
+    @contextmanager
+    def instrumented_intrinsics(self, scope_controller):
+        """ Measures calls of intrinsic funcs while the context is active """
+
+        global_scope = scope_controller.get_global_scope()
+        symbols = [
+            global_scope.get_symbol(intr.name) for intr in INTRINSICS_LIST if type(intr) == IntrinsicFunc
+        ]
+        values = [symbol.value for symbol in symbols]
+        for symbol in symbols:
+            symbol.value = self.profiled(symbol.value, self.function_profile(symbol))
+        try:
+            yield
+        finally:
+            for symbol, value in zip(symbols, values):
+                symbol.value = value
+
+    def sorted_profiles(self):
+        """ Returns profiles of called functions, the most expensive own code goes first """
+
+        called = [profile for profile in self.profiles.values() if profile.calls]
+        return sorted(called, key=lambda profile: (-profile.self_time, profile.name))
+
+    def table(self):
+        """ Returns text table of profiles """
+
+        lines = [
+            f"{'function':<24} {'line':>6} {'calls':>10} {'inclusive ms':>14} {'self ms':>12} {'avg us':>12}"
+        ]
+        for profile in self.sorted_profiles():
+            name = profile.name if profile.kind == "function" else f"{profile.name} (intrinsic)"
+            row = "" if profile.row is None else str(profile.row)
+            lines.append(
+                f"{name:<24} {row:>6} {profile.calls:>10} {profile.inclusive_time * 1000:>14.3f} "
+                f"{profile.self_time * 1000:>12.3f} {profile.average_time * 1e6:>12.3f}"
+            )
+        return "\n".join(lines)
+
+    def as_json(self):
+        import json
+
+        return json.dumps({"functions": [profile.as_dict() for profile in self.sorted_profiles()]}, indent=2)
@@ -1,2 +1,2 @@
-from .lexer import tokenize_source
+from .lexer import tokenize_source, iter_tokens
 from .token_types import *
\ No newline at end of file
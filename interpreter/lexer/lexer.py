@@ -1,109 +1,154 @@
 import re
-from .token_types import TokenType, TOKEN_TYPES_REGEXES
-from .token import Token, TokenPos
+import sys
+from .token_types import TokenType, TOKEN_TYPES_REGEXES, KEYWORDS
+from .token import Token
 from interpreter.error import syntax_error
 
 
-_current_file_name = ""
-_string_token = None
+# token types which are dropped by iter_tokens
+TRIVIA_TOKEN_TYPES = (TokenType.SPACE, TokenType.LINE_COMMENT)
 
+# token types which values are not shared between tokens
+LITERAL_TOKEN_TYPES = (TokenType.INT_LITERAL, TokenType.FLOAT_LITERAL)
 
-def _lex_line(source_code_line: str, line_number: int):
-    """ Tokenize code line into tokens """
-    
-    global _current_file_name
-    global _string_token
 
-    if _string_token:
-        _string_token.value += "\n"
+def _build_master_regex():
+    """ Joins all token regexes into one alternation with a named group per token type.
+        Keywords share one group and are classified with KEYWORDS lookup """
+
+    keyword_types = set(KEYWORDS.values())
+    keywords = sorted(KEYWORDS, key=len, reverse=True)
+    keywords_regex = "|".join(re.escape(keyword) for keyword in keywords)
+
+    alternatives = []
+    for token_type, regex in TOKEN_TYPES_REGEXES.items():
+        if token_type in [TokenType.STR_LITERAL, TokenType.EOF]:
+            continue
+        if token_type in keyword_types:
+            # all keywords are tried at the place of the first one
+            if keywords_regex:
+                alternatives.append(f"(?P<KEYWORD>(?:{keywords_regex})(?!\\w))")
+                keywords_regex = None
+            continue
+        alternatives.append(f"(?P<{token_type.name}>{regex})")
+
+    master_regex = re.compile("|".join(alternatives))
+
+    # group index : token type (None for keywords)
+    group_token_types = {}
+    for name, index in master_regex.groupindex.items():
+        group_token_types[index] = None if name == "KEYWORD" else TokenType[name]
+
+    return master_regex, group_token_types
+
+
+_MASTER_REGEX, _GROUP_TOKEN_TYPES = _build_master_regex()
+
+
+def _lex_line(source_code_line: str, line_number: int, filename: str, string_token: Token = None, keep_trivia: bool = True):
+    """ Tokenize code line into tokens.
+        Returns tokens and string literal token which is still not closed at the end of line """
+
+    if string_token:
+        string_token.value += "\n"
 
     line = source_code_line
+    line_length = len(line)
+    pos = 0
     col_number = 0
     tokens = []
+    # start of line separates tokens as space does
+    spaced = True
 
-    while (len(line) > 0):
+    while pos < line_length:
         # string mode parsing
-        if _string_token:
-            regex = TOKEN_TYPES_REGEXES[TokenType.DOUBLE_QUOTE]
-            match_res = re.search(regex, line)
-            # matched
-            if match_res and match_res.start() == 0:
-                tokens.append(_string_token)
-                line = line[match_res.end():]
-                _string_token = None
-            else:
-                _string_token.value += line[0]
-                line = line[1:]
+        if string_token:
+            end = line.find('"', pos)
+            # not closed on this line
+            if end == -1:
+                string_token.value += line[pos:]
+                break
+            string_token.value += line[pos:end]
+            tokens.append(string_token)
+            string_token = None
+            pos = end + 1
+            spaced = False
             continue
 
         # normal mode parsing
-        found = False
-        for token_type, regex in TOKEN_TYPES_REGEXES.items():
-            match_res = re.search(regex, line)
-            # matched
-            if match_res and match_res.start() == 0:
-                found = True
-                start = match_res.start()
-                end = match_res.end()
-                tpos = TokenPos(line_number, col_number, _current_file_name)
-
-                token_value = line[start : end]
-                line = line[end:]
-                
-
-                # if string start|end
-                if token_type == TokenType.DOUBLE_QUOTE:
-                    if not _string_token:
-                        _string_token = Token(TokenType.STR_LITERAL, "", tpos)
-                        break;
-
-                token = Token(token_type, token_value, tpos)
-                tokens.append(token)
-                col_number += (end - start)
-
-                # if comment
-                if token_type == TokenType.LINE_COMMENT:
-                    token.value = line
-                    return tokens
-
-                break;
-        if not found:
+        match_res = _MASTER_REGEX.match(line, pos)
+        if not match_res:
             syntax_error(
-                "Undefined token found!", 
-                f"{line[0:5]}",
-                line_number, 
+                "Undefined token found!",
+                f"{line[pos:pos + 5]}",
+                line_number,
                 col_number,
-                _current_file_name
+                filename
             )
 
-    return tokens
+        end = match_res.end()
+        token_type = _GROUP_TOKEN_TYPES[match_res.lastindex]
 
+        # if string start
+        if token_type == TokenType.DOUBLE_QUOTE:
+            string_token = Token(TokenType.STR_LITERAL, "", line_number, col_number, filename, spaced)
+            pos = end
+            continue
 
-def tokenize_source(filename: str):
-    """ Return source code splited into tokens if no lexical errors """
+        # if comment
+        if token_type == TokenType.LINE_COMMENT:
+            if keep_trivia:
+                tokens.append(Token(token_type, line[end:], line_number, col_number, filename, spaced))
+            break
+
+        if keep_trivia or token_type != TokenType.SPACE:
+            token_value = match_res.group()
+            if token_type is None:
+                token_type = KEYWORDS[token_value]
+            if token_type not in LITERAL_TOKEN_TYPES:
+                # identifiers, keywords and operators repeat, so equal lexemes share one string
+                token_value = sys.intern(token_value)
+            tokens.append(Token(token_type, token_value, line_number, col_number, filename, spaced))
+
+        spaced = token_type == TokenType.SPACE
+        col_number += end - pos
+        pos = end
+
+    return tokens, string_token
 
-    global _current_file_name
-    _current_file_name = filename
+
+def _iter_source_tokens(filename: str, keep_trivia: bool):
+    """ Yields tokens of the source file line by line. 
+        File is read lazily through the buffered file iterator, 
+        so only the current line and its tokens are kept in memory """
 
     lines_count = 1
-    tokens = []
+    string_token = None
+    filename = sys.intern(filename)
 
     with open(filename, "r") as file:
         for line in file:
-            tokens += _lex_line(line.strip(), lines_count)
+            tokens, string_token = _lex_line(line.strip(), lines_count, filename, string_token, keep_trivia)
+            yield from tokens
             lines_count += 1
 
-
-    if _string_token:
+    if string_token:
         syntax_error(
-            "Unclosed string literal found", f'"{_string_token.value}',
-            _string_token.pos.row, _string_token.pos.col,_string_token.pos.filename
+            "Unclosed string literal found", f'"{string_token.value}',
+            string_token.pos.row, string_token.pos.col, string_token.pos.filename
         )
 
     # eof token
-    tokens.append(Token(
-        TokenType.EOF, "",
-        TokenPos(lines_count, 0, filename)
-    ))
+    yield Token(TokenType.EOF, "", lines_count, 0, filename)
+
+
+def iter_tokens(source: str):
+    """ Lazily yields significant tokens of the source file (no spaces and comments) """
+
+    return _iter_source_tokens(source, keep_trivia=False)
+
+
+def tokenize_source(filename: str):
+    """ Return source code splited into tokens if no lexical errors """
 
-    return tokens
\ No newline at end of file
+    return list(_iter_source_tokens(filename, keep_trivia=True))
@@ -2,14 +2,28 @@ from .token_types import TokenType
 
 
 class TokenPos():
+    __slots__ = ("row", "col", "filename")
+
     def __init__(self, row: int, col: int, filename: str):
         self.row = row
         self.col = col
         self.filename = filename
 
 
-class Token():
-    def __init__(self, ttype: TokenType, value: any, tpos: TokenPos):
+class Token(TokenPos):
+    """ Token keeps its position inline, so every token is one object """
+
+    __slots__ = ("type", "value", "spaced")
+
+    def __init__(self, ttype: TokenType, value: any, row: int, col: int, filename: str, spaced: bool = True):
         self.type = ttype
         self.value = value
-        self.pos = tpos
\ No newline at end of file
+        # token is not next to the previous one (space or start of line before it)
+        self.spaced = spaced
+        self.row = row
+        self.col = col
+        self.filename = filename
+
+    @property
+    def pos(self):
+        return self
@@ -47,13 +47,18 @@ class TokenType(Enum):
 
     LINE_COMMENT = 41,
 
+    # literal of folded bool constant, it is created only by optimizer
+    BOOL_LITERAL = 42,
+
+    USE_KWD = 43,
+
     IDENTIFIER = 99,
 
     EOF = 100
 
 
 TOKEN_TYPES_REGEXES = {
-    TokenType.FLOAT_LITERAL : r"(\d+)(\.)(\d+)",
+    TokenType.FLOAT_LITERAL : r"\d+\.\d+",
     TokenType.INT_LITERAL   : r"\d+",
     TokenType.GTE_OP        : r"\>\=",
     TokenType.LTE_OP        : r"\<\=",
@@ -88,20 +93,38 @@ TOKEN_TYPES_REGEXES = {
     TokenType.DEF_KWD       : r"\bdef\b",
     TokenType.NEXT_KWD      : r"\bnext\b",
     TokenType.STOP_KWD      : r"\bstop\b",
+    TokenType.USE_KWD       : r"\buse\b",
     TokenType.RANGE_MARK    : r"\.\.",
     TokenType.EXCL_MARK     : r"\!",
     TokenType.QUEST_MARK    : r"\?",
     TokenType.LINE_COMMENT  : r"\#",
-    TokenType.IDENTIFIER    : r"([A-Za-z\_\d+])+",
+    TokenType.IDENTIFIER    : r"[A-Za-z\_\d+]+",
     TokenType.STR_LITERAL   : r"(?!x)x", # match nothing
     TokenType.EOF           : r"(?!x)x", # match nothing
 }
 
 
+# lexeme : token type, used by the lexer to classify
+# matched keywords (and word operators) with one dict lookup
+KEYWORDS = {
+    "else if" : TokenType.IFELSE_KWD,
+    "else"    : TokenType.ELSE_KWD,
+    "if"      : TokenType.IF_KWD,
+    "loop"    : TokenType.LOOP_KWD,
+    "def"     : TokenType.DEF_KWD,
+    "next"    : TokenType.NEXT_KWD,
+    "stop"    : TokenType.STOP_KWD,
+    "use"     : TokenType.USE_KWD,
+    "not"     : TokenType.NOT_OP,
+    "and"     : TokenType.AND_OP,
+    "or"      : TokenType.OR_OP,
+}
+
+
 TOKENS_GROUPS = {
     "keywords": [
         TokenType.IF_KWD, TokenType.ELSE_KWD, TokenType.IFELSE_KWD, TokenType.LOOP_KWD, TokenType.DEF_KWD,
-        TokenType.NEXT_KWD, TokenType.STOP_KWD
+        TokenType.NEXT_KWD, TokenType.STOP_KWD, TokenType.USE_KWD
     ],
     "operators": [
         TokenType.PLUS_OP, TokenType.MINUS_OP, TokenType.MULT_OP, TokenType.DIV_OP, TokenType.ASSIGN_OP,
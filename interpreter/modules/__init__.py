@@ -0,0 +1 @@
+from .loader import *
\ No newline at end of file
@@ -0,0 +1,134 @@
+import os
+
+from interpreter.ast import *
+from interpreter.lexer import iter_tokens
+from interpreter.parser import Parser
+from interpreter.error import semantic_error
+from interpreter.cache import ProgramCache
+
+
+def parse_module(path: str, cache: ProgramCache = None):
+    """ Returns (ast, source) of the module, runs in processes of the pool """
+
+    source = ProgramCache.read_source(path)
+    if cache is not None:
+        module = cache.load(path, source, "module")
+        if module is not None:
+            return module[0], source
+
+    ast = Parser(iter_tokens(path)).parse()
+    if cache is not None:
+        cache.store(path, source, "module", ast)
+    return ast, source
+
+
+class ModuleLoader():
+    """ Replaces `use "path";` statements of the program by top level statements of used modules.
+        Module path is relative to the file which uses it, every module is included once at its first use,
+        so its functions and vars are globals of the program for the semantic analyzer.
+        Lexing and parsing hold the GIL, so modules are parsed in parallel by forked processes
+        (parsed ASTs are sent back as pickles). A single module waiting for parsing is parsed in place,
+        as are all modules on a machine with one CPU. Parsed modules are cached if there is a cache """
+
+    def __init__(self, cache: ProgramCache = None, max_workers: int = None):
+        self.cache = cache
+        self.max_workers = max_workers or os.cpu_count() or 1
+        # module path : its parsed ast
+        self.modules = {}
+        # module path : its source, used modules of the program
+        self.sources = {}
+
+    @staticmethod
+    def module_path(user_filename: str, node: Use_Node):
+        path = os.path.abspath(os.path.join(os.path.dirname(user_filename), node.path))
+        if not os.path.isfile(path):
+            token = node.start_token
+            semantic_error(
+                f"Can not find module '{node.path}'", f'use "{node.path}"',
+                token.pos.row, token.pos.col, token.pos.filename
+            )
+        return path
+
+    def create_pool(self):
+        # most programs use at most one module at once, so the pool is not imported at startup
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        # forked workers do not import the interpreter again
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else None)
+        return ProcessPoolExecutor(self.max_workers, mp_context=context)
+
+    def parse_modules(self, ast: Block_Node, filename: str):
+        """ Parses all modules used by the program directly or through other modules """
+
+        # paths of modules to parse
+        waiting = []
+        submitted = set()
+
+        def submit_uses(module_ast: Block_Node, module_filename: str):
+            for stm in module_ast.statements:
+                if type(stm) is Use_Node:
+                    path = self.module_path(module_filename, stm)
+                    if path not in submitted:
+                        submitted.add(path)
+                        waiting.append(path)
+
+        def add_module(path: str, module: tuple):
+            self.modules[path], self.sources[path] = module
+            submit_uses(self.modules[path], path)
+
+        submit_uses(ast, filename)
+        pool = None
+        # future : module path
+        pending = {}
+        try:
+            while waiting or pending:
+                if pool is None and not pending and (len(waiting) == 1 or self.max_workers == 1):
+                    path = waiting.pop(0)
+                    add_module(path, parse_module(path, self.cache))
+                    continue
+
+                if pool is None:
+                    from concurrent.futures import wait, FIRST_COMPLETED
+                    pool = self.create_pool()
+                for path in waiting:
+                    pending[pool.submit(parse_module, path, self.cache)] = path
+                waiting.clear()
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    add_module(pending.pop(future), future.result())
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+
+    def included_statements(self, ast: Block_Node, filename: str, included: set, using: list):
+        """ Returns statements of the file where uses are replaced by statements of modules """
+
+        statements = []
+        for stm in ast.statements:
+            if type(stm) is not Use_Node:
+                statements.append(stm)
+                continue
+
+            path = self.module_path(filename, stm)
+            if path in using:
+                token = stm.start_token
+                semantic_error(
+                    f"Circular use of module '{stm.path}'", f'use "{stm.path}"',
+                    token.pos.row, token.pos.col, token.pos.filename
+                )
+            if path not in included:
+                included.add(path)
+                statements.extend(self.included_statements(self.modules[path], path, included, using + [path]))
+        return statements
+
+    def load(self, ast: Block_Node, filename: str):
+        """ Returns ast of the program with statements of used modules """
+
+        filename = os.path.abspath(filename)
+        if not any(type(stm) is Use_Node for stm in ast.statements):
+            return ast
+        self.parse_modules(ast, filename)
+        ast.statements = self.included_statements(ast, filename, set(), [filename])
+        return ast
@@ -0,0 +1,367 @@
+import math
+
+from interpreter.ast import *
+from interpreter.builtins import INT_TYPE
+from interpreter.lexer import TokenType
+
+
+# max degree of polynomial of the loop var which sum is computed by closed form
+MAX_SUM_DEGREE = 3
+
+# expression operator : polynomial operation
+POLY_BINARY_OPS = (TokenType.PLUS_OP, TokenType.MINUS_OP, TokenType.MULT_OP)
+
+
+# Polynomials of the loop var are lists of int coefficients, the lowest degree goes first.
+
+def poly_trim(poly: list):
+    while len(poly) > 1 and poly[-1] == 0:
+        poly.pop()
+    return poly
+
+
+def poly_add(left: list, right: list, sign: int = 1):
+    result = left + [0] * (len(right) - len(left))
+    for degree, coef in enumerate(right):
+        result[degree] += sign * coef
+    return poly_trim(result)
+
+
+def poly_mul(left: list, right: list):
+    result = [0] * (len(left) + len(right) - 1)
+    for left_degree, left_coef in enumerate(left):
+        for right_degree, right_coef in enumerate(right):
+            result[left_degree + right_degree] += left_coef * right_coef
+    return poly_trim(result)
+
+
+def poly_value(poly: list, x: int):
+    result = 0
+    for coef in reversed(poly):
+        result = result * x + coef
+    return result
+
+
+def power_sums(n: int):
+    """ Returns sums of k ** degree for k in 0..n-1 and every degree up to MAX_SUM_DEGREE """
+
+    triangle = n * (n - 1) // 2
+    return [n, triangle, (n - 1) * n * (2 * n - 1) // 6, triangle * triangle]
+
+
+def range_poly_sum(poly: list, values: range):
+    """ Returns exact sum of polynomial over the range values """
+
+    # values are start + step * k, so the sum is over k of the polynomial shifted to k
+    shifted = [0]
+    for coef in reversed(poly):
+        shifted = poly_add(poly_mul(shifted, [values.start, values.step]), [coef])
+    sums = power_sums(len(values))
+    return sum(coef * sums[degree] for degree, coef in enumerate(shifted))
+
+
+class LoopReduction():
+    """ Counted loop which body only updates int vars by arithmetic of the loop var,
+        loop invariant vars and the updated var itself. Every update is new = a(i) * old + b(i),
+        where a and b are polynomials of the loop var i. Sums, products and linear recurrences
+        are computed at once with exact ints, other updates fall back to evaluation of the loop """
+
+    def __init__(self, loop_var: AST_Node, updates: list, invariants: list, slots_names: dict):
+        # (depth, slot) of updated vars and of loop invariant vars read by updates
+        self.updated_slots = [slot for slot, _ in updates]
+        self.invariant_slots = invariants
+        self.loop_var_slot = (loop_var.depth, loop_var.slot)
+        # update expression of every updated var in order of updated_slots
+        self.updates = [expr for _, expr in updates]
+        # (depth, slot) : name of var used by the reduction
+        self.slots_names = slots_names
+
+    def __repr__(self):
+        return f"loop reduction of {', '.join(self.slots_names[slot] for slot in self.updated_slots)}"
+
+    @property
+    def input_slots(self):
+        return self.updated_slots + self.invariant_slots
+
+    @property
+    def output_slots(self):
+        return self.updated_slots + [self.loop_var_slot]
+
+    @staticmethod
+    def combined_form(kind: any, left: tuple, right: tuple):
+        """ Returns linear form of binary operation of linear forms or None if it is not linear """
+
+        if kind == TokenType.MULT_OP:
+            # old * old is not linear
+            if left[0] != [0] and right[0] != [0]:
+                return None
+            return (
+                poly_add(poly_mul(left[0], right[1]), poly_mul(left[1], right[0])),
+                poly_mul(left[1], right[1])
+            )
+        sign = 1 if kind == TokenType.PLUS_OP else -1
+        return poly_add(left[0], right[0], sign), poly_add(left[1], right[1], sign)
+
+    def linear_form(self, expr: tuple, invariants: list):
+        """ Returns polynomials a and b of update expression a * old + b or None if it is not linear.
+            Deep expressions are walked by the explicit stack instead of python recursion """
+
+        # (expression, whether forms of its operands are computed), operands go before their operation
+        tasks = [(expr, False)]
+        forms = []
+        while tasks:
+            expr, operands_done = tasks.pop()
+            kind = expr[0]
+            if kind == "const":
+                forms.append(([0], [expr[1]]))
+            elif kind == "loop_var":
+                forms.append(([0], [0, 1]))
+            elif kind == "invariant":
+                forms.append(([0], [invariants[expr[1]]]))
+            elif kind == "updated":
+                forms.append(([1], [0]))
+            elif not operands_done:
+                tasks.append((expr, True))
+                tasks.extend((operand, False) for operand in reversed(expr[1:]))
+            elif kind == "neg":
+                a, b = forms.pop()
+                forms.append(([-coef for coef in a], [-coef for coef in b]))
+            else:
+                right = forms.pop()
+                form = self.combined_form(kind, forms.pop(), right)
+                if form is None:
+                    return None
+                forms.append(form)
+        return forms[0]
+
+    def reduced_value(self, old: int, a: list, b: list, values: range):
+        """ Returns value of var after all iterations of the update or None if there is no closed form """
+
+        count = len(values)
+        if count == 0:
+            return old
+        # assignment which does not read the var keeps value of the last iteration
+        if a == [0]:
+            return poly_value(b, values[-1])
+        # sum
+        if a == [1]:
+            if len(b) - 1 > MAX_SUM_DEGREE:
+                return None
+            return old + range_poly_sum(b, values)
+        if b == [0]:
+            # power of constant factor
+            if len(a) == 1:
+                return old * a[0] ** count
+            # product of linear factors, they are a range too
+            if len(a) == 2:
+                first = poly_value(a, values.start)
+                factors = range(first, first + a[1] * values.step * count, a[1] * values.step)
+                return old * math.prod(factors)
+            return None
+        # linear recurrence with constant coefficients
+        if len(a) == 1 and len(b) == 1:
+            factor, term = a[0], b[0]
+            if factor == 1:
+                return old + term * count
+            power = factor ** count
+            return power * old + term * ((power - 1) // (factor - 1))
+        return None
+
+    def reduce(self, start: any, end: any, step: any, *values):
+        """ Returns new values of updated vars and the loop var,
+            or None if the loop must be evaluated by iterations """
+
+        # only int values give exact results, other values keep python semantics of the loop
+        if any(type(value) is not int for value in values):
+            return None
+        try:
+            if step is None:
+                step = 1 if start < end else -1
+            loop_values = range(start, end, step)
+            len(loop_values)
+        except (TypeError, ValueError, OverflowError):
+            return None
+
+        updated_count = len(self.updated_slots)
+        invariants = values[updated_count:]
+        results = []
+        for expr, old in zip(self.updates, values):
+            form = self.linear_form(expr, invariants)
+            if form is None:
+                return None
+            value = self.reduced_value(old, *form, loop_values)
+            if value is None:
+                return None
+            results.append(value)
+
+        # the loop var keeps the last value or the range start
+        results.append(loop_values[-1] if loop_values else start)
+        return results
+
+    def run(self, frames: list, start: any, end: any, step: any):
+        """ Evaluates the loop over frames indexed by depth, returns False if it was not reduced """
+
+        results = self.reduce(start, end, step, *[frames[depth][slot] for depth, slot in self.input_slots])
+        if results is None:
+            return False
+        for (depth, slot), value in zip(self.output_slots, results):
+            frames[depth][slot] = value
+        return True
+
+
+class LoopAnalyzer(TreeVisitor):
+    """ Finds counted loops which body is a sequence of int var updates
+        without calls, so they can be evaluated at once by LoopReduction """
+
+    def __init__(self, ast: AST_Node):
+        super().__init__(ast)
+        self.reduced_count = 0
+        # (depth, slot) : name of var used by the loop which is analyzed now
+        self.slots_names = {}
+
+    def update_leaf(self, node: AST_Node, target: tuple, loop_var: tuple, updated: set, invariants: list):
+        """ Returns tuple of literal or var of update expression or None if it can not be reduced """
+
+        if type(node) is Literal_Node:
+            if node.start_token.type != TokenType.INT_LITERAL:
+                return None
+            return ("const", int(node.value))
+        slot = (node.depth, node.slot)
+        if slot == loop_var:
+            return ("loop_var",)
+        if slot == target:
+            return ("updated",)
+        # other updated vars change during the loop
+        if slot in updated:
+            return None
+        if slot not in invariants:
+            invariants.append(slot)
+            self.slots_names[slot] = node.name
+        return ("invariant", invariants.index(slot))
+
+    def update_expr(self, node: AST_Node, target: tuple, loop_var: tuple, updated: set, invariants: list):
+        """ Returns tuple tree of expression or None if expression can not be reduced.
+            Deep expressions are walked by the explicit stack instead of python recursion """
+
+        # nodes to visit and (operation, operands count) which wait for trees of their operands
+        tasks = [node]
+        trees = []
+        while tasks:
+            task = tasks.pop()
+            if type(task) is tuple:
+                kind, operands_count = task
+                operands = trees[len(trees) - operands_count:]
+                del trees[len(trees) - operands_count:]
+                trees.append((kind, *operands))
+                continue
+
+            node_type = type(task)
+            if node_type is Literal_Node or node_type is Var_Node:
+                leaf = self.update_leaf(task, target, loop_var, updated, invariants)
+                if leaf is None:
+                    return None
+                trees.append(leaf)
+            elif node_type is Unary_Op_Node and task.start_token.type == TokenType.MINUS_OP:
+                tasks.append(("neg", 1))
+                tasks.append(task.left)
+            elif node_type is Binary_Op_Node and task.start_token.type in POLY_BINARY_OPS:
+                # the left operand is visited first, so invariants keep order of the source
+                tasks.append((task.start_token.type, 2))
+                tasks.append(task.right)
+                tasks.append(task.left)
+            else:
+                return None
+        return trees[0]
+
+    def loop_reduction(self, node: Loop_Node):
+        """ Returns reduction of the loop or None """
+
+        if not node.var or not node.body.statements:
+            return None
+        if not all(isinstance(stm, Var_Assign_Node) for stm in node.body.statements):
+            return None
+
+        loop_var = (node.var.depth, node.var.slot)
+        updated = [(stm.depth, stm.slot) for stm in node.body.statements]
+        # every var is updated once and the loop var is not changed by the body
+        if len(set(updated)) != len(updated) or loop_var in updated:
+            return None
+        if any(stm.var_type.name != INT_TYPE.name for stm in node.body.statements):
+            return None
+
+        updates = []
+        invariants = []
+        self.slots_names = {loop_var: node.var.name}
+        for stm in node.body.statements:
+            self.slots_names[(stm.depth, stm.slot)] = stm.name
+        for stm in node.body.statements:
+            target = (stm.depth, stm.slot)
+            expr = self.update_expr(stm.value, target, loop_var, set(updated), invariants)
+            if expr is None:
+                return None
+            updates.append((target, expr))
+
+        return LoopReduction(node.var, updates, invariants, self.slots_names)
+
+    def visit_literal(self, node):
+        pass
+
+    def visit_var(self, node):
+        pass
+
+    def visit_index(self, node):
+        pass
+
+    def visit_type(self, node):
+        pass
+
+    def visit_binop(self, node):
+        pass
+
+    def visit_unop(self, node):
+        pass
+
+    def visit_var_decl(self, node):
+        pass
+
+    def visit_var_assign(self, node):
+        pass
+
+    def visit_index_assign(self, node):
+        pass
+
+    def visit_if_else(self, node):
+        yield node.body
+        yield node.else_branch
+
+    def visit_loop(self, node):
+        node.reduction = self.loop_reduction(node)
+        if node.reduction is not None:
+            self.reduced_count += 1
+        else:
+            yield node.body
+
+    def visit_func_decl(self, node):
+        yield node.body
+
+    def visit_func_call(self, node):
+        pass
+
+    def visit_return(self, node):
+        pass
+
+    def visit_continue(self, node):
+        pass
+
+    def visit_break(self, node):
+        pass
+
+    def visit_block(self, node):
+        for stm in node.statements:
+            yield stm
+
+    def analyze(self):
+        """ Sets reduction of every loop node, returns count of reduced loops """
+
+        self.traverse()
+        return self.reduced_count
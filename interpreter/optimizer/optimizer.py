@@ -0,0 +1,232 @@
+import math
+
+from interpreter.ast import *
+from interpreter.builtins import *
+from interpreter.lexer import TokenType
+from interpreter.lexer.token import Token
+from interpreter.semantics import *
+from interpreter.evaluation.operations import LITERAL_CONVERSIONS, BINARY_OPERATIONS, UNARY_OPERATIONS
+from .loops import LoopAnalyzer
+
+
+# python type of folded value : literal token type
+VALUE_LITERAL_TYPES = {value_type: token_type for token_type, value_type in LITERAL_CONVERSIONS.items()}
+
+# python type of folded value : name of its type
+VALUE_TYPES_NAMES = {
+    builtin_type.value_type: builtin_type.name for builtin_type in BUILTIN_TYPES 
+    if builtin_type.value_type in VALUE_LITERAL_TYPES
+}
+
+
+class Optimizer(TreeVisitor):
+    """ Rewrites analyzed AST: folds operators and pure intrinsics calls over literals
+        and removes identity operations, then marks loops which are computed at once.
+        Evaluation result of optimized AST is the same """
+
+    def __init__(self, ast: AST_Node, scope_controller: ScopeController):
+        super().__init__(ast)
+        self.scope_controller = scope_controller
+        self.folded_count = 0
+        self.reduced_loops_count = 0
+
+    def literal(self, node: AST_Node, value: any):
+        """ Returns literal node of folded value placed instead of the node """
+
+        self.folded_count += 1
+        pos = node.start_token.pos
+        token = Token(VALUE_LITERAL_TYPES[type(value)], value, pos.row, pos.col, pos.filename)
+        literal = Literal_Node(token, value)
+        literal.expr_type = self.scope_controller.get_global_scope().get_symbol(VALUE_TYPES_NAMES[type(value)])
+        literal.value_type = type(value)
+        return literal
+
+    def literal_value(self, node: AST_Node):
+        return LITERAL_CONVERSIONS[node.start_token.type](node.value)
+
+    def is_literal_number(self, node: AST_Node, number: int):
+        """ Checks that node is int or float literal equal to the number, -0.0 is not 0 here """
+
+        if not isinstance(node, Literal_Node) or node.start_token.type not in (TokenType.INT_LITERAL, TokenType.FLOAT_LITERAL):
+            return False
+        value = self.literal_value(node)
+        return value == number and math.copysign(1, value) == math.copysign(1, number)
+
+    def simplify_binop(self, node):
+        """ Returns operand of identity operation or the node itself.
+            Python types of operands values must be known: x + 0 is kept
+            for floats, because -0.0 + 0 is 0.0, and int x * 1.0 is float """
+
+        op = node.start_token.type
+        left, right = node.left, node.right
+
+        if op == TokenType.MULT_OP:
+            for operand, other in [(left, right), (right, left)]:
+                if self.is_literal_number(other, 1):
+                    if operand.value_type == float or operand.value_type == other.value_type == int:
+                        return operand
+        elif op == TokenType.PLUS_OP:
+            for operand, other in [(left, right), (right, left)]:
+                if self.is_literal_number(other, 0) and operand.value_type == other.value_type == int:
+                    return operand
+        elif op == TokenType.MINUS_OP:
+            if self.is_literal_number(right, 0):
+                if left.value_type == float or left.value_type == right.value_type == int:
+                    return left
+        return node
+
+    def reassociate_binop(self, node):
+        """ (x + c1) + c2 and similar int chains are replaced with x + (c1 + c2) """
+
+        op = node.start_token.type
+        inner = node.left
+        if (
+            op not in (TokenType.PLUS_OP, TokenType.MINUS_OP)
+            or not isinstance(inner, Binary_Op_Node)
+            or inner.start_token.type not in (TokenType.PLUS_OP, TokenType.MINUS_OP)
+            or not isinstance(node.right, Literal_Node)
+            or not isinstance(inner.right, Literal_Node)
+            or not node.right.value_type == inner.right.value_type == inner.left.value_type == int
+        ):
+            return node
+
+        # signed sum of both constants is added to x
+        inner_value = self.literal_value(inner.right)
+        if inner.start_token.type == TokenType.MINUS_OP:
+            inner_value = -inner_value
+        value = self.literal_value(node.right)
+        if op == TokenType.MINUS_OP:
+            value = -value
+
+        inner.right = self.literal(inner.right, abs(inner_value + value))
+        pos = inner.start_token.pos
+        inner.start_token = Token(
+            TokenType.PLUS_OP if inner_value + value >= 0 else TokenType.MINUS_OP,
+            "+" if inner_value + value >= 0 else "-",
+            pos.row, pos.col, pos.filename
+        )
+        inner.token_type_op = inner.start_token.type
+        return inner
+
+    def visit_literal(self, node):
+        return node
+
+    def visit_var(self, node):
+        return node
+
+    def visit_index(self, node):
+        node.index = yield node.index
+        return node
+
+    def visit_type(self, node):
+        return node
+
+    def visit_binop(self, node):
+        node.left = yield node.left
+        node.right = yield node.right
+
+        if isinstance(node.left, Literal_Node) and isinstance(node.right, Literal_Node):
+            operation = BINARY_OPERATIONS[node.start_token.type]
+            try:
+                value = operation(self.literal_value(node.left), self.literal_value(node.right))
+            except (ArithmeticError, TypeError, ValueError):
+                # error is raised at runtime as without optimization
+                return node
+            return self.literal(node, value)
+
+        simplified = self.simplify_binop(node)
+        if simplified is not node:
+            self.folded_count += 1
+            return simplified
+        return self.reassociate_binop(node)
+
+    def visit_unop(self, node):
+        node.left = yield node.left
+        op = node.start_token.type
+
+        if isinstance(node.left, Literal_Node):
+            try:
+                value = UNARY_OPERATIONS[op](self.literal_value(node.left))
+            except (ArithmeticError, TypeError, ValueError):
+                return node
+            return self.literal(node, value)
+
+        # not not x is x for bool x
+        inner = node.left
+        if (
+            op == TokenType.NOT_OP and isinstance(inner, Unary_Op_Node)
+            and inner.start_token.type == TokenType.NOT_OP and inner.left.value_type == bool
+        ):
+            self.folded_count += 1
+            return inner.left
+        return node
+
+    def visit_var_decl(self, node):
+        node.value = yield node.value
+        return node
+
+    def visit_var_assign(self, node):
+        node.value = yield node.value
+        return node
+
+    def visit_index_assign(self, node):
+        node.index = yield node.index
+        node.value = yield node.value
+        return node
+
+    def visit_if_else(self, node):
+        node.condition = yield node.condition
+        node.body = yield node.body
+        node.else_branch = yield node.else_branch
+        return node
+
+    def visit_loop(self, node):
+        if node.var:
+            node.range = ((yield node.range[0]), (yield node.range[1]))
+            node.step = yield node.step
+        node.body = yield node.body
+        return node
+
+    def visit_func_decl(self, node):
+        node.body = yield node.body
+        return node
+
+    def visit_func_call(self, node):
+        for i, arg in enumerate(node.args):
+            node.args[i] = yield arg
+
+        func_symbol = node.symbol
+        if func_symbol.pure and func_symbol.frame_layout is None and all(isinstance(arg, Literal_Node) for arg in node.args):
+            try:
+                value = func_symbol.value(*[self.literal_value(arg) for arg in node.args])
+            except (ArithmeticError, TypeError, ValueError):
+                return node
+            # arrays are created by every call, they are not literals
+            if type(value) in VALUE_LITERAL_TYPES:
+                return self.literal(node, value)
+        return node
+
+    def visit_return(self, node):
+        node.value = yield node.value
+        return node
+
+    def visit_continue(self, node):
+        return node
+
+    def visit_break(self, node):
+        return node
+
+    def visit_block(self, node):
+        for i, stm in enumerate(node.statements):
+            optimized_stm = yield stm
+            # folded call statement is kept, because its value still ends the block
+            if not isinstance(optimized_stm, Literal_Node):
+                node.statements[i] = optimized_stm
+        return node
+
+    def optimize(self):
+        """ Returns optimized AST """
+
+        self.ast = self.visit_node(self.ast)
+        self.reduced_loops_count = LoopAnalyzer(self.ast).analyze()
+        return self.ast
@@ -1,26 +1,67 @@
 from interpreter.ast import *
 from interpreter.lexer import TokenType
+from interpreter.lexer.lexer import TRIVIA_TOKEN_TYPES
 from interpreter.error import syntax_error
-from interpreter.ast import ast_printer
+
+# binary operator : precedence, operators of greater precedence bind tighter
+BINARY_OPS_PRECEDENCE = {
+    TokenType.AND_OP   : 1,
+    TokenType.OR_OP    : 1,
+    TokenType.GT_OP    : 2,
+    TokenType.GTE_OP   : 2,
+    TokenType.LT_OP    : 2,
+    TokenType.LTE_OP   : 2,
+    TokenType.EQ_OP    : 2,
+    TokenType.NEQ_OP   : 2,
+    TokenType.PLUS_OP  : 3,
+    TokenType.MINUS_OP : 3,
+    TokenType.MULT_OP  : 4,
+    TokenType.DIV_OP   : 4,
+}
+
+LITERAL_TOKEN_TYPES = (TokenType.INT_LITERAL, TokenType.FLOAT_LITERAL, TokenType.STR_LITERAL)
+
+UNARY_OP_TOKEN_TYPES = (TokenType.MINUS_OP, TokenType.NOT_OP)
+
+# tokens which start an arg of a call right after the func name
+CALL_ARG_START_TOKEN_TYPES = (*LITERAL_TOKEN_TYPES, TokenType.IDENTIFIER, TokenType.NOT_OP, TokenType.LEFT_PAR)
+
+# eaten tokens are dropped from the buffer once cursor passes this index
+BUFFER_COMPACT_SIZE = 64
+
 
 class Parser():
     """ Parses syntax tree from tokens """
 
     def __init__(self, tokens):
-        self.tokens = tokens
-    
-    def remove_spaces(self):
-        assert len(self.tokens)
-        while self.tokens[0].type == TokenType.SPACE:
-            self.tokens.pop(0) 
+        # tokens are pulled lazily from any iterable (list or iter_tokens stream)
+        self.tokens = iter(tokens)
+        # pulled significant tokens and index of the current one
+        self.buffer = []
+        self.cursor = 0
+
+    def fill_buffer(self, size: int):
+        """ Pulls significant tokens from the stream until buffer has size tokens """
+
+        while len(self.buffer) < size:
+            token = next(self.tokens, None)
+            # stream is over, so EOF token is repeated
+            if token is None:
+                assert len(self.buffer)
+                token = self.buffer[-1]
+                assert token.type == TokenType.EOF
+            elif token.type in TRIVIA_TOKEN_TYPES:
+                continue
+            self.buffer.append(token)
 
     def eat(self, token_types: list[TokenType] = []):
-        assert len(self.tokens)
+        token = self.peek()
 
-        if not TokenType.SPACE in token_types:
-            self.remove_spaces() 
+        self.cursor += 1
+        if self.cursor >= BUFFER_COMPACT_SIZE:
+            del self.buffer[:self.cursor]
+            self.cursor = 0
 
-        token = self.tokens.pop(0)
         if token_types and not token.type in token_types:
             syntax_error(
                 f"Unexpected token of type '{token.type}' found, but expected {token_types}", 
@@ -31,74 +72,70 @@ class Parser():
         return token
 
     def peek(self, idx: int = 0):
-        assert len(self.tokens) > idx
-        return self.tokens[idx]
+        idx += self.cursor
+        if len(self.buffer) <= idx:
+            self.fill_buffer(idx + 1)
+        return self.buffer[idx]
 
-    def parse_expr(self):
-        left = self.parse_comparison()
-        op_token = self.peek()
-        while (op_token.type in [TokenType.AND_OP, TokenType.OR_OP]):
-            self.eat()
-            left = Binary_Op_Node(op_token, left, self.parse_comparison(), op_token.type)
-            op_token = self.peek()        
+    def run(self, parsing):
+        """ Runs parsing generator and returns its node.
+            Parse methods yield generators of nested parsings and receive their nodes,
+            so these generators are kept on the work stack instead of the python stack """
 
-        return left
-
-    def parse_comparison(self):
-        left = self.parse_arithmetic_expr()
-        op_token = self.peek()
-        while (op_token.type in [
-            TokenType.GT_OP, TokenType.GTE_OP, TokenType.LT_OP, 
-            TokenType.LTE_OP, TokenType.EQ_OP, TokenType.NEQ_OP
-        ]):
-            self.eat()
-            left = Binary_Op_Node(op_token, left, self.parse_arithmetic_expr(), op_token.type)
-            op_token = self.peek()        
-
-        return left
-
-    def parse_arithmetic_expr(self):
-        left = self.parse_term()
-        op_token = self.peek()
-        while (op_token.type in [TokenType.PLUS_OP, TokenType.MINUS_OP]):
-            self.eat()
-            left = Binary_Op_Node(op_token, left, self.parse_term(), op_token.type)
-            op_token = self.peek()        
+        stack = [parsing]
+        node = None
+        while stack:
+            try:
+                nested_parsing = stack[-1].send(node)
+            except StopIteration as stop:
+                stack.pop()
+                node = stop.value
+                continue
+            stack.append(nested_parsing)
+            node = None
+        return node
 
-        return left
+    def parse_expr(self, min_precedence: int = 1):
+        """ Parses chain of binary operators by precedence climbing """
 
-    def parse_term(self):
-        left = self.parse_factor()
+        left = yield self.parse_factor()
         op_token = self.peek()
-        while (op_token.type in [TokenType.MULT_OP, TokenType.DIV_OP]):
+        precedence = BINARY_OPS_PRECEDENCE.get(op_token.type)
+        while precedence is not None and precedence >= min_precedence:
             self.eat()
-            left = Binary_Op_Node(op_token, left, self.parse_factor(), op_token.type)
-            op_token = self.peek()        
+            # operators of the same precedence are left associative
+            right = yield self.parse_expr(precedence + 1)
+            left = Binary_Op_Node(op_token, left, right, op_token.type)
+            op_token = self.peek()
+            precedence = BINARY_OPS_PRECEDENCE.get(op_token.type)
 
         return left
 
     def parse_factor(self):
         token = self.peek()
         # found: literal
-        if token.type in [TokenType.INT_LITERAL, TokenType.FLOAT_LITERAL, TokenType.STR_LITERAL]:
+        if token.type in LITERAL_TOKEN_TYPES:
             self.eat()
             return Literal_Node(token, token.value)
+        # found : indexing of array var
+        elif token.type == TokenType.IDENTIFIER and self.is_index_start():
+            return (yield self.parse_index())
         # found : variable
         elif token.type == TokenType.IDENTIFIER:
             return self.parse_var()
         # found: (expr|factor|term)
         elif token.type == TokenType.LEFT_PAR:
             self.eat([TokenType.LEFT_PAR])
-            node = self.parse_expr()
+            node = yield self.parse_expr()
             self.eat([TokenType.RIGHT_PAR])
             return node
         # found: unop
-        elif token.type in (TokenType.MINUS_OP, TokenType.NOT_OP):
+        elif token.type in UNARY_OP_TOKEN_TYPES:
             self.eat()
-            return Unary_Op_Node(token, self.parse_factor(), token.type)
+            return Unary_Op_Node(token, (yield self.parse_factor()), token.type)
         # found: funccall
         elif token.type == TokenType.LEFT_BRACKET:
-            return self.parse_func_call()
+            return (yield self.parse_func_call())
 
         else:
             syntax_error(
@@ -107,12 +144,39 @@ class Parser():
                 token.pos.row, token.pos.col, token.pos.filename
             )
 
+    def is_index_start(self):
+        """ Bracket starts index of the current var only when it is next to the var name
+            and does not start a call with args, so `if x [shown "x"];` and `if x[shown "x"];`
+            are still a condition followed by the call """
+
+        bracket = self.peek(1)
+        if bracket.type != TokenType.LEFT_BRACKET or bracket.spaced:
+            return False
+        # identifier followed by a value is a call, an index expression has an operator between them
+        arg = self.peek(3)
+        return not (
+            self.peek(2).type == TokenType.IDENTIFIER
+            and (arg.type in CALL_ARG_START_TOKEN_TYPES or arg.type == TokenType.LEFT_BRACKET and arg.spaced)
+        )
+
+    def parse_index(self):
+        token = self.eat([TokenType.IDENTIFIER])
+        self.eat([TokenType.LEFT_BRACKET])
+        index = yield self.parse_expr()
+        self.eat([TokenType.RIGHT_BRACKET])
+        return Index_Node(token, token.value, index)
+
     def parse_var(self):
         token = self.eat([TokenType.IDENTIFIER])
         return Var_Node(token, token.value)
 
     def parse_type(self):
         token = self.eat([TokenType.IDENTIFIER])
+        # array type: element type followed by []
+        if self.peek().type == TokenType.LEFT_BRACKET and self.peek(1).type == TokenType.RIGHT_BRACKET:
+            self.eat()
+            self.eat()
+            return Type_Node(token, f"{token.value}[]")
         return Type_Node(token, token.value)
 
     def parse_var_decl(self, parse_with_init_value: bool = True):
@@ -121,13 +185,19 @@ class Parser():
         init_value = None
         if parse_with_init_value and self.peek().type == TokenType.ASSIGN_OP:
             self.eat([TokenType.ASSIGN_OP])
-            init_value = self.parse_expr()
+            init_value = yield self.parse_expr()
         return Var_Decl_Node(id_token, id_token.value, type_node, init_value)
 
     def parse_var_assign(self):
         id_token = self.eat([TokenType.IDENTIFIER])
         self.eat([TokenType.ASSIGN_OP])
-        return Var_Assign_Node(id_token, id_token.value, self.parse_expr())
+        return Var_Assign_Node(id_token, id_token.value, (yield self.parse_expr()))
+
+    def parse_index_assign(self):
+        index_node = yield self.parse_index()
+        self.eat([TokenType.ASSIGN_OP])
+        value = yield self.parse_expr()
+        return Index_Assign_Node(index_node.start_token, index_node.name, index_node.index, value)
 
     def parse_if_else(self):
         token = self.eat()
@@ -138,19 +208,19 @@ class Parser():
         else_branch = None
 
         if token.type in [TokenType.IF_KWD, TokenType.IFELSE_KWD]:
-            condition = self.parse_expr()
+            condition = yield self.parse_expr()
 
         token = self.peek()
         
         if token.type == TokenType.LEFT_BRACE:
-            body = self.parse_block()
+            body = yield self.parse_block()
         else:
-            body = Block_Node(token, [ self.parse_statement() ])
+            body = Block_Node(token, [ (yield self.parse_statement()) ])
         
         token = self.peek()
         if start_token.type != TokenType.ELSE_KWD:
             if token.type in [TokenType.IFELSE_KWD, TokenType.ELSE_KWD]:
-                else_branch = self.parse_if_else()
+                else_branch = yield self.parse_if_else()
         
         return If_Else_Node(start_token, condition, body, else_branch)
 
@@ -173,7 +243,7 @@ class Parser():
                 var = self.parse_var()
             # var declaration
             elif next_token.type == TokenType.IDENTIFIER:
-                var = self.parse_var_decl()
+                var = yield self.parse_var_decl()
             else:
                 syntax_error(
                     f"Expect var or var declaration, but token type '{next_token.type}' found",
@@ -182,18 +252,18 @@ class Parser():
 
             self.eat([TokenType.COMMA])
             # range
-            start = self.parse_expr()
+            start = yield self.parse_expr()
             self.eat([TokenType.RANGE_MARK])
-            end = self.parse_expr()
+            end = yield self.parse_expr()
             loop_range = (start, end)
             # step
             token = self.peek()
             if (token.type == TokenType.COMMA):
                 self.eat()
-                step = self.parse_expr()
+                step = yield self.parse_expr()
         
         # print(self.peek().type)
-        body = self.parse_block()
+        body = yield self.parse_block()
         return Loop_Node(start_token, var, loop_range, step, body)
 
     def parse_func_decl(self):
@@ -213,13 +283,13 @@ class Parser():
         while self.peek().type != TokenType.PIPE:
             if len(params):
                 self.eat([TokenType.COMMA])
-            params.append(self.parse_var_decl(False))
+            params.append((yield self.parse_var_decl(False)))
         self.eat([TokenType.PIPE])
         # ret type
         self.eat([TokenType.RET_TYPE_MARK])
         ret_type = self.parse_type()
         # body
-        body = self.parse_block()
+        body = yield self.parse_block()
 
         return Func_Decl_Node(start_token, name, params, ret_type, body)
 
@@ -237,7 +307,7 @@ class Parser():
         while self.peek().type != TokenType.RIGHT_BRACKET:
             if len(args):
                 self.eat([TokenType.COMMA])
-            args.append(self.parse_expr())
+            args.append((yield self.parse_expr()))
 
         self.eat([TokenType.RIGHT_BRACKET])
 
@@ -245,7 +315,7 @@ class Parser():
 
     def parse_return(self):
         token = self.eat([TokenType.EXCL_MARK])
-        return Return_Node(token, self.parse_expr())        
+        return Return_Node(token, (yield self.parse_expr()))        
 
     def parse_continue(self):
         token = self.eat([TokenType.NEXT_KWD])
@@ -255,6 +325,16 @@ class Parser():
         token = self.eat([TokenType.STOP_KWD])
         return Break_Node(token)
 
+    def parse_use(self, top_level: bool):
+        token = self.eat([TokenType.USE_KWD])
+        if not top_level:
+            syntax_error(
+                "Modules can be used only by top level statements", token.value,
+                token.pos.row, token.pos.col, token.pos.filename
+            )
+        path_token = self.eat([TokenType.STR_LITERAL])
+        return Use_Node(token, path_token.value)
+
     def parse_block(self, require_braces: bool = True):
         token = self.peek()
         block = Block_Node(token, [])
@@ -266,7 +346,8 @@ class Parser():
         while(not token.type in [TokenType.RIGHT_BRACE, TokenType.EOF]):
             next_token = self.peek(1)
 
-            node = self.parse_statement()
+            # block without braces is the program itself
+            node = yield self.parse_statement(not require_braces)
 
             block.statements.append(node)
             token = self.peek()
@@ -276,7 +357,7 @@ class Parser():
 
         return block
 
-    def parse_statement(self):
+    def parse_statement(self, top_level: bool = False):
         node = None
         token = self.peek(0)
         next_token = self.peek(1)
@@ -284,30 +365,33 @@ class Parser():
         if token.type == TokenType.IDENTIFIER:
             # var decl
             if next_token.type == TokenType.IDENTIFIER:
-                node = self.parse_var_decl()
+                node = yield self.parse_var_decl()
             # var assign
             elif next_token.type == TokenType.ASSIGN_OP:
-                node = self.parse_var_assign()
+                node = yield self.parse_var_assign()
+            # array element assign
+            elif self.is_index_start():
+                node = yield self.parse_index_assign()
 
         # if else chain
         elif token.type == TokenType.IF_KWD:
-            node = self.parse_if_else()
+            node = yield self.parse_if_else()
 
         # cycle statement
         elif token.type == TokenType.LOOP_KWD:
-            node = self.parse_loop()
+            node = yield self.parse_loop()
         
         # func declaration
         elif token.type == TokenType.DEF_KWD:
-            node = self.parse_func_decl()
+            node = yield self.parse_func_decl()
         
         # func call
         elif token.type == TokenType.LEFT_BRACKET:
-            node = self.parse_func_call()
+            node = yield self.parse_func_call()
 
         # func return
         elif token.type == TokenType.EXCL_MARK:
-            node = self.parse_return();
+            node = yield self.parse_return();
 
         elif token.type == TokenType.NEXT_KWD:
             node = self.parse_continue()
@@ -315,6 +399,10 @@ class Parser():
         elif token.type == TokenType.STOP_KWD:
             node = self.parse_break()
 
+        # module use
+        elif token.type == TokenType.USE_KWD:
+            node = self.parse_use(top_level)
+
         if not node or not isinstance(node, Statement_Node):
             syntax_error(
                 f"Expect statement, but token type '{token.type}' found",
@@ -330,8 +418,4 @@ class Parser():
     def parse(self):
         """ Returns ast which is generated from tokens given to __init__ """
         
-        self.tokens = list(filter(
-            lambda token: not token.type in [TokenType.SPACE, TokenType.LINE_COMMENT], 
-            self.tokens
-        ))
-        return self.parse_block(False)
\ No newline at end of file
+        return self.run(self.parse_block(False))
@@ -1 +1,2 @@
-from .semantic_analyzer import *
\ No newline at end of file
+from .semantic_analyzer import *
+from .purity import *
@@ -0,0 +1,115 @@
+from interpreter.ast import *
+from .scopes import *
+
+
+class PurityAnalyzer(TreeVisitor):
+    """ Marks symbols of user funcs which results depend only on their args.
+        Pure func does not read or write vars of outer scopes and calls only pure funcs,
+        so builtins with side effects (show, shown, read) make it impure.
+        Arrays are mutable, so funcs taking or returning them are impure too.
+        Array constructors are not pure (every call is a new buffer), but a new local array is no side effect """
+
+    def __init__(self, ast: AST_Node):
+        super().__init__(ast)
+        # funcs which bodies are analyzed now (innermost is the last) and their purity
+        self.func_symbols = []
+        self.func_purity = []
+
+    def set_impure(self):
+        if self.func_symbols:
+            self.func_purity[-1] = False
+
+    def is_outer_var(self, depth: int):
+        return bool(self.func_symbols) and depth < self.func_symbols[-1].frame_layout.depth
+
+    @staticmethod
+    def is_array_constructor(symbol: Symbol_Func):
+        return symbol.frame_layout is None and symbol.ret_type.name in ARRAY_TYPES
+
+    def visit_literal(self, node):
+        pass
+
+    def visit_var(self, node):
+        if self.is_outer_var(node.depth):
+            self.set_impure()
+
+    def visit_index(self, node):
+        if self.is_outer_var(node.depth):
+            self.set_impure()
+        yield node.index
+
+    def visit_type(self, node):
+        pass
+
+    def visit_binop(self, node):
+        yield node.left
+        yield node.right
+
+    def visit_unop(self, node):
+        yield node.left
+
+    def visit_var_decl(self, node):
+        yield node.value
+
+    def visit_var_assign(self, node):
+        if self.is_outer_var(node.depth):
+            self.set_impure()
+        yield node.value
+
+    def visit_index_assign(self, node):
+        if self.is_outer_var(node.depth):
+            self.set_impure()
+        yield node.index
+        yield node.value
+
+    def visit_if_else(self, node):
+        yield node.condition
+        yield node.body
+        yield node.else_branch
+
+    def visit_loop(self, node):
+        if node.range:
+            yield node.range[0]
+            yield node.range[1]
+        yield node.step
+        yield node.body
+
+    def visit_func_decl(self, node):
+        self.func_symbols.append(node.symbol)
+        symbol = node.symbol
+        self.func_purity.append(
+            all(type_symbol.name not in ARRAY_TYPES for type_symbol in [*symbol.params_types, symbol.ret_type])
+        )
+        yield node.body
+        self.func_symbols.pop()
+        node.symbol.pure = self.func_purity.pop()
+
+    def visit_func_call(self, node):
+        for arg in node.args:
+            yield arg
+
+        callee = node.symbol
+        if self.func_symbols and callee is self.func_symbols[-1]:
+            # recursion does not change purity
+            return
+        if callee in self.func_symbols:
+            # purity of enclosing func is not known yet
+            self.set_impure()
+        elif not callee.pure and not self.is_array_constructor(callee):
+            self.set_impure()
+
+    def visit_return(self, node):
+        yield node.value
+
+    def visit_continue(self, node):
+        pass
+
+    def visit_break(self, node):
+        pass
+
+    def visit_block(self, node):
+        for stm in node.statements:
+            yield stm
+
+    def analyze(self):
+        self.traverse()
@@ -4,6 +4,8 @@ from interpreter.builtins import *
 
 
 class Symbol(ABC):
+    __slots__ = ("name", "value")
+
     def __init__(self, name: str):
         self.value = None
         self.name = name
@@ -13,22 +15,80 @@ class Symbol(ABC):
 
 
 class Symbol_Type(Symbol):
-    def __init__(self, name: str):
+    __slots__ = ("value_type",)
+
+    def __init__(self, name: str, value_type: type = None):
         super().__init__(name)
         self.name = name
+        # python type of values casted to this type (None for any)
+        self.value_type = value_type
 
 
 class Symbol_Var(Symbol):
+    __slots__ = ("type", "depth", "slot", "value_type")
+
     def __init__(self, name: str, type_symbol: Symbol_Type):
         super().__init__(name)
         self.type = type_symbol
+        # frame of declaring function (0 for globals) and index in it
+        self.depth = None
+        self.slot = None
+        # python type of every value stored in the var (None if it is not known)
+        self.value_type = None
 
 
 class Symbol_Func(Symbol):
+    __slots__ = ("params_types", "ret_type", "frame_layout", "pure")
+
     def __init__(self, name: str, params_types: list[Symbol_Type], ret_type_symbol: Symbol_Type):
         super().__init__(name)
         self.params_types = params_types
         self.ret_type = ret_type_symbol
+        # slots of function body vars (None for builtins)
+        self.frame_layout = None
+        # result depends only on args and there are no side effects
+        self.pure = False
+
+
+class FrameLayout():
+    """ Slots of vars declared in one function body (or in global code) """
+
+    def __init__(self, depth: int):
+        # count of functions around this one
+        self.depth = depth
+        # slot : initial value, builtin vars have their actual values
+        self.initial_values = []
+        # values arrays of finished calls, reused by next calls
+        self.free_frames = []
+
+    def __repr__(self):
+        return f"frame of depth {self.depth} with {self.size} slots"
+
+    @property
+    def size(self):
+        return len(self.initial_values)
+
+    def add_var(self, var_symbol: Symbol_Var):
+        var_symbol.depth = self.depth
+        var_symbol.slot = len(self.initial_values)
+        self.initial_values.append(var_symbol.value)
+
+    def new_frame(self):
+        """ Returns values array of this layout """
+
+        return self.initial_values.copy()
+
+    def acquire_frame(self):
+        """ Returns values array for function call, released arrays are reused """
+
+        if self.free_frames:
+            frame = self.free_frames.pop()
+            frame[:] = self.initial_values
+            return frame
+        return self.initial_values.copy()
+
+    def release_frame(self, frame: list):
+        self.free_frames.append(frame)
 
 
 class SymbolTable():
@@ -43,13 +103,18 @@ class SymbolTable():
 
         for name, symbol in self.__symbols.items():
             res_str += f"\n{name} -> {type(symbol).__name__}"
+            if isinstance(symbol, Symbol_Var):
+                res_str += f" [{symbol.depth}:{symbol.slot}]"
         return res_str
 
     def get_symbol(self, name: str):
-        symbol = self.__symbols.get(name)
+        scope = self
+        symbol = scope.__symbols.get(name)
 
-        if symbol == None and self.parent_scope:
-            symbol = self.parent_scope.get_symbol(name)
+        # nested scopes are searched by loop, depth of nesting is not limited by python stack
+        while symbol == None and scope.parent_scope:
+            scope = scope.parent_scope
+            symbol = scope.__symbols.get(name)
 
         return symbol
 
@@ -59,6 +124,7 @@ class SymbolTable():
 
 class ScopeController():
     def __init__(self, program_node: AST_Node):
+        self.global_frame_layout = FrameLayout(0)
         self.__global_scope = SymbolTable(
             program_node, 
             initial_symbols = self.get_initial_global_symbols()
@@ -72,11 +138,8 @@ class ScopeController():
         """ Creates globals symbols dict from builtins """
 
         global_symbols = {
-            INT_TYPE.name   : Symbol_Type(INT_TYPE.name),
-            FLOAT_TYPE.name : Symbol_Type(FLOAT_TYPE.name),
-            STR_TYPE.name   : Symbol_Type(STR_TYPE.name),
-            BOOL_TYPE.name  : Symbol_Type(BOOL_TYPE.name),
-            ANY_TYPE.name   : Symbol_Type(ANY_TYPE.name)
+            builtin_type.name : Symbol_Type(builtin_type.name, builtin_type.value_type)
+            for builtin_type in BUILTIN_TYPES
         }
 
         # intrinsics
@@ -84,14 +147,18 @@ class ScopeController():
             # vars
             if type(intr) == IntrinsicVar:
                 global_symbols[intr.name] = Symbol_Var(intr.name, global_symbols[intr.type.name])
+                global_symbols[intr.name].value_type = intr.type.value_type
             # funcs
             elif type(intr) == IntrinsicFunc:
                 params_types = []
                 for arg_type in intr.args_types:
                     params_types.append(global_symbols[arg_type.name])
                 global_symbols[intr.name] = Symbol_Func(intr.name, params_types, global_symbols[intr.type.name])
+                global_symbols[intr.name].pure = intr.pure
 
             global_symbols[intr.name].value = intr.actual_value;
+            if type(intr) == IntrinsicVar:
+                self.global_frame_layout.add_var(global_symbols[intr.name])
 
         return global_symbols
 
@@ -109,5 +176,8 @@ class ScopeController():
     def get_global_scope(self):
         return self.__global_scope
     
+    def get_scopes_count(self):
+        return len(self.__scopes)
+
     def get_scope(self, node):
         return self.__scopes.get(node)
\ No newline at end of file
@@ -3,6 +3,7 @@ from interpreter.error import semantic_error
 from interpreter.lexer import TokenType
 from interpreter.builtins import *
 from .scopes import *
+from .purity import PurityAnalyzer
 
 
 class SemanticAnalyzer(TreeVisitor):
@@ -13,6 +14,8 @@ class SemanticAnalyzer(TreeVisitor):
         super().__init__(ast)
         self.scope_controller = ScopeController(ast)
         self.scope = None
+        # slots of vars declared in current function (or globally)
+        self.frame_layout = self.scope_controller.global_frame_layout
 
         # lazy method to check contrinue, break, return statements semantics
         self.loop_block_now = False
@@ -20,6 +23,8 @@ class SemanticAnalyzer(TreeVisitor):
 
         # needs to add vars in scopes properly
         self.add_vardecl_to_scope = True 
+        # iteration var of the loop which body is visited now, it has int values of range
+        self.loop_var_node = None
 
     def type_check(self, node, left_type, right_type, err_code_fragment):
         if left_type != right_type:
@@ -29,17 +34,59 @@ class SemanticAnalyzer(TreeVisitor):
                 node.start_token.pos.filename
             )
 
+    def scalar_check(self, node, operand_type):
+        """ Operators are not applied to arrays, their elements are processed by intrinsics """
+
+        if operand_type.name in ARRAY_TYPES:
+            semantic_error(
+                f"Operator '{node.start_token.value}' cannot be applied to '{operand_type.name}' type expr", 
+                node.start_token.value, node.start_token.pos.row, node.start_token.pos.col, 
+                node.start_token.pos.filename
+            )
+
+    def builtin_type(self, name: str):
+        """ Builtin types are global, so the lookup does not walk the nested scopes """
+
+        return self.scope_controller.get_global_scope().get_symbol(name)
+
+    def set_expr_type(self, node, type_symbol, value_type):
+        node.expr_type = type_symbol
+        node.value_type = value_type
+        return type_symbol
+
+    def binop_value_type(self, op, left_value_type, right_value_type):
+        """ Returns python type of binary operation result if operands types are known """
+
+        numbers = (int, float)
+        if op in [TokenType.AND_OP, TokenType.OR_OP]:
+            # one of the operands is the result
+            return left_value_type if left_value_type == right_value_type else None
+        elif op in [TokenType.PLUS_OP, TokenType.MINUS_OP, TokenType.MULT_OP]:
+            if left_value_type == right_value_type and left_value_type in numbers:
+                return left_value_type
+            if op == TokenType.PLUS_OP and left_value_type == right_value_type == str:
+                return str
+        elif op == TokenType.DIV_OP:
+            if left_value_type in numbers and right_value_type in numbers:
+                return float
+        else:
+            # comparisons
+            return bool
+        return None
+
     def visit_literal(self, node):
         token_type = node.start_token.type
 
         type_binding = {
             TokenType.INT_LITERAL   : INT_TYPE.name,
             TokenType.FLOAT_LITERAL : FLOAT_TYPE.name,
-            TokenType.STR_LITERAL   : STR_TYPE.name
+            TokenType.STR_LITERAL   : STR_TYPE.name,
+            TokenType.BOOL_LITERAL  : BOOL_TYPE.name
         }
 
         # assert 0 & "Should not be here"
-        return self.scope.get_symbol(type_binding[node.start_token.type])
+        type_symbol = self.builtin_type(type_binding[node.start_token.type])
+        return self.set_expr_type(node, type_symbol, type_symbol.value_type)
         
 
     def visit_var(self, node):
@@ -50,7 +97,33 @@ class SemanticAnalyzer(TreeVisitor):
                 node.start_token.pos.row, node.start_token.pos.col, node.start_token.pos.filename
             )
 
-        return var_symbol.type 
+        node.depth, node.slot = var_symbol.depth, var_symbol.slot
+        return self.set_expr_type(node, var_symbol.type, var_symbol.value_type)
+
+    def array_var(self, node):
+        """ Returns symbol of indexed var and type symbol of its elements """
+
+        var_symbol = self.scope.get_symbol(node.name)
+        if not isinstance(var_symbol, Symbol_Var):
+            semantic_error(
+                f"Cannot find var '{node.name}'", node.name, 
+                node.start_token.pos.row, node.start_token.pos.col, node.start_token.pos.filename
+            )
+        array_type = ARRAY_TYPES.get(var_symbol.type.name)
+        if array_type is None:
+            semantic_error(
+                f"Cannot index var '{node.name}' of '{var_symbol.type.name}' type", node.name, 
+                node.start_token.pos.row, node.start_token.pos.col, node.start_token.pos.filename
+            )
+        return var_symbol, self.builtin_type(array_type.element_type.name)
+
+    def visit_index(self, node):
+        var_symbol, element_type = self.array_var(node)
+        self.type_check(node.index, self.builtin_type(INT_TYPE.name), (yield node.index), node.name)
+
+        node.depth, node.slot = var_symbol.depth, var_symbol.slot
+        # elements are stored as values of the element type
+        return self.set_expr_type(node, element_type, element_type.value_type)
 
     def visit_type(self, node):
         type_symbol = self.scope.get_symbol(node.name)
@@ -62,14 +135,12 @@ class SemanticAnalyzer(TreeVisitor):
         return self.scope.get_symbol(node.name)
 
     def visit_binop(self, node):
-        left_type = self.visit_node(node.left)
-        right_type = self.visit_node(node.right)
+        left_type = yield node.left
+        right_type = yield node.right
         
         op = node.start_token.type
 
-        int_type = self.scope.get_symbol(INT_TYPE.name)
-        float_type = self.scope.get_symbol(FLOAT_TYPE.name)
-        bool_type = self.scope.get_symbol(BOOL_TYPE.name)
+        bool_type = self.builtin_type(BOOL_TYPE.name)
 
         ret_type = {
             TokenType.PLUS_OP  : left_type,
@@ -87,29 +158,44 @@ class SemanticAnalyzer(TreeVisitor):
         }
 
         self.type_check(node, left_type, right_type, node.start_token.value)
-        return ret_type[op]
+        self.scalar_check(node, left_type)
+        value_type = self.binop_value_type(op, node.left.value_type, node.right.value_type)
+        return self.set_expr_type(node, ret_type[op], value_type)
 
     def visit_unop(self, node):
-        left_type =  self.visit_node(node.left)
+        left_type =  yield node.left
+        self.scalar_check(node, left_type)
         op = node.start_token.type
 
-        bool_type = self.scope.get_symbol(BOOL_TYPE.name)
+        bool_type = self.builtin_type(BOOL_TYPE.name)
         ret_type = {
             TokenType.NOT_OP   : bool_type,
             TokenType.MINUS_OP : left_type,
         }
-        return ret_type[op]
+
+        value_type = bool
+        if op == TokenType.MINUS_OP:
+            value_type = node.left.value_type if node.left.value_type in (int, float) else None
+        return self.set_expr_type(node, ret_type[op], value_type)
 
     def visit_var_decl(self, node):
-        type_symbol = self.visit_node(node.type_node)
+        type_symbol = yield node.type_node
         var_symbol = Symbol_Var(node.name, type_symbol)
         
         if node.value:
-            rhs_type_symbol = self.visit_node(node.value)
+            rhs_type_symbol = yield node.value
             self.type_check(node, type_symbol, rhs_type_symbol, node.name)
         
+        # values are casted to var type, but var without value is None until assignment
+        if node.value:
+            var_symbol.value_type = type_symbol.value_type
+        elif node is self.loop_var_node:
+            var_symbol.value_type = int
+
         if self.add_vardecl_to_scope:
             self.scope.add_symbol(node.name, var_symbol)
+            self.frame_layout.add_var(var_symbol)
+            node.depth, node.slot = var_symbol.depth, var_symbol.slot
 
         return var_symbol
 
@@ -121,18 +207,29 @@ class SemanticAnalyzer(TreeVisitor):
                 node.start_token.pos.row, node.start_token.pos.col, node.start_token.pos.filename
             )
         
-        self.type_check(node, var_symbol.type, self.visit_node(node.value), node.name)
+        self.type_check(node, var_symbol.type, (yield node.value), node.name)
 
+        node.depth, node.slot = var_symbol.depth, var_symbol.slot
+        node.var_type = var_symbol.type
         return var_symbol.type 
 
+    def visit_index_assign(self, node):
+        var_symbol, element_type = self.array_var(node)
+        self.type_check(node.index, self.builtin_type(INT_TYPE.name), (yield node.index), node.name)
+        self.type_check(node, element_type, (yield node.value), node.name)
+
+        node.depth, node.slot = var_symbol.depth, var_symbol.slot
+        node.var_type = element_type
+        return element_type
+
     def visit_if_else(self, node):
         if node.condition:
-            self.visit_node(node.condition)
+            yield node.condition
 
-        self.visit_node(node.body)
+        yield node.body
 
         if node.else_branch:
-            self.visit_node(node.else_branch)
+            yield node.else_branch
         
     def visit_loop(self, node):
         tmp_loop_now = self.loop_block_now
@@ -142,34 +239,37 @@ class SemanticAnalyzer(TreeVisitor):
             # It's need to add var symbol in scope properly.
             node.body.statements.insert(0, node.var)
             self.loop_block_now = True
-            loop_scope = self.visit_node(node.body)
+            self.loop_var_node = node.var
+            loop_scope = yield node.body
             self.loop_block_now = tmp_loop_now
             node.body.statements.pop(0)            
 
             var_type = loop_scope.get_symbol(node.var.name).type
 
             if node.range:
-                start_val_type = self.visit_node(node.range[0])
-                end_val_type = self.visit_node(node.range[1])
+                start_val_type = yield node.range[0]
+                end_val_type = yield node.range[1]
 
                 self.type_check(node, var_type, start_val_type, node.start_token.value)
                 self.type_check(node, var_type, end_val_type, node.start_token.value)
 
             if node.step:
-                step_type = self.visit_node(node.step)
+                step_type = yield node.step
             
                 self.type_check(node, var_type, step_type, node.start_token.value)
 
         else:
             self.loop_block_now = True
-            self.visit_node(node.body)
+            yield node.body
             self.loop_block_now = tmp_loop_now
     
     def visit_func_decl(self, node):
-        type_symbol = self.visit_node(node.ret_type_node)
+        type_symbol = yield node.ret_type_node
 
         func_symbol = Symbol_Func(node.name, [], type_symbol)
+        func_symbol.frame_layout = FrameLayout(self.frame_layout.depth + 1)
         self.scope.add_symbol(node.name, func_symbol)
+        node.symbol = func_symbol
 
         # Setting params as var decl statements 
         # at the begining of the function block.
@@ -177,14 +277,21 @@ class SemanticAnalyzer(TreeVisitor):
         self.add_vardecl_to_scope = False
         for param in node.params:
             assert param
-            func_symbol.params_types.append(self.visit_node(param).type)
+            func_symbol.params_types.append((yield param).type)
             node.body.statements.insert(0, param)
         self.add_vardecl_to_scope = True
 
+        # loop around function declaration can not be stopped from its body
+        tmp_loop_now = self.loop_block_now
         tmp_current_func_symbol = self.current_func_symbol
+        tmp_frame_layout = self.frame_layout
+        self.loop_block_now = False
         self.current_func_symbol = func_symbol
-        func_scope = self.visit_node(node.body)
+        self.frame_layout = func_symbol.frame_layout
+        func_scope = yield node.body
         self.current_func_symbol = tmp_current_func_symbol
+        self.loop_block_now = tmp_loop_now
+        self.frame_layout = tmp_frame_layout
         
         # Setting back actual statements in body  
         for param in node.params:
@@ -198,6 +305,7 @@ class SemanticAnalyzer(TreeVisitor):
                 f"Cannot find func '{node.name}'", node.name, 
                 node.start_token.pos.row, node.start_token.pos.col, node.start_token.pos.filename
             )
+        node.symbol = func_symbol
         
         # matching func call args to func params
         if len(func_symbol.params_types) != len(node.args):
@@ -207,10 +315,12 @@ class SemanticAnalyzer(TreeVisitor):
             )
         for i in range(len(func_symbol.params_types)):
             param_type = func_symbol.params_types[i]
-            arg_type = self.visit_node(node.args[i])
+            arg_type = yield node.args[i]
             self.type_check(node.args[i], param_type, arg_type, node.args[i].start_token.value)
-        
-        return func_symbol.ret_type
+
+        # results of interpreted funcs are not always casted
+        value_type = func_symbol.ret_type.value_type if func_symbol.frame_layout is None else None
+        return self.set_expr_type(node, func_symbol.ret_type, value_type)
 
     def visit_return(self, node):
         if not self.current_func_symbol:
@@ -219,7 +329,12 @@ class SemanticAnalyzer(TreeVisitor):
                 node.start_token.pos.row, node.start_token.pos.col, node.start_token.pos.filename
             )        
 
-        self.type_check(node, self.current_func_symbol.ret_type, self.visit_node(node.value), node.start_token.value)
+        self.type_check(node, self.current_func_symbol.ret_type, (yield node.value), node.start_token.value)
+
+        # self call result is returned as is, so it can reuse the frame of current call
+        node.tail_call = (
+            isinstance(node.value, Func_Call_Node) and node.value.symbol is self.current_func_symbol
+        )
 
     def visit_continue(self, node):
         if not self.loop_block_now:
@@ -242,7 +357,7 @@ class SemanticAnalyzer(TreeVisitor):
             self.scope = self.scope_controller.new_scope(node, self.scope)
 
         for stm in node.statements:
-            self.visit_node(stm)
+            yield stm
         
         tmp_scope = self.scope
 
@@ -252,6 +367,7 @@ class SemanticAnalyzer(TreeVisitor):
 
     def analyze(self):
         self.traverse()
+        PurityAnalyzer(self.ast).analyze()
         return self.scope_controller
         # self.__print(f"Block")
         # for stm in node.statements:
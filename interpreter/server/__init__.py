@@ -0,0 +1,2 @@
+from .client import *
+from .server import *
\ No newline at end of file
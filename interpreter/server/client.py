@@ -0,0 +1,113 @@
+""" Thin client of the interpreter daemon, it replaces run.sh for short scripts:
+        python3 -S interpreter/server/client.py file.txt [interpreter options]
+
+    The client imports nothing of the interpreter. It passes its stdin, stdout and stderr
+    to a pre-warmed worker of the daemon and exits with exit status of the script.
+    Streams are passed only to a socket and a daemon of the same user.
+    If the daemon is not running, the interpreter is started as usual.
+"""
+
+import json
+import os
+import socket
+import stat
+import struct
+import sys
+import tempfile
+
+
+SOCKET_ENV_VAR = "MTR_SOCKET"
+
+# max size of request of the client
+MAX_REQUEST_SIZE = 1 << 16
+
+
+def default_socket_path():
+    """ Returns socket path of the daemon, it may be changed by environment var.
+        By default the socket is in the runtime dir of the user or in the user's dir in temp dir """
+
+    path = os.environ.get(SOCKET_ENV_VAR)
+    if path:
+        return path
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "mtr.sock")
+    return os.path.join(tempfile.gettempdir(), f"mtr-{os.getuid()}", "mtr.sock")
+
+
+def owned_by_user(path: str):
+    """ Checks the path belongs to the user and other users can not write it """
+
+    stat_result = os.lstat(path)
+    return stat_result.st_uid == os.getuid() and not stat_result.st_mode & 0o022
+
+
+def trusted_socket(path: str):
+    """ Checks the socket and its dir belong to the user, so no one else can replace the daemon """
+
+    try:
+        return (
+            stat.S_ISSOCK(os.lstat(path).st_mode) and owned_by_user(path)
+            and owned_by_user(os.path.dirname(os.path.abspath(path)))
+        )
+    except OSError:
+        return False
+
+
+def peer_uid(client: socket.socket):
+    """ Returns uid of the process which listens the socket or None if it is unknown """
+
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    credentials = client.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    _, uid, _ = struct.unpack("3i", credentials)
+    return uid
+
+
+def run_locally(argv: list):
+    """ Replaces the client process by the interpreter """
+
+    package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    os.environ["PYTHONPATH"] = os.path.dirname(package_dir)
+    os.execv(sys.executable, [sys.executable, package_dir, *argv])
+
+
+def run_remotely(argv: list, socket_path: str):
+    """ Returns exit status of the script run by the daemon or None if the daemon is not available """
+
+    if not os.path.exists(socket_path):
+        return None
+    # streams of the client are passed only to the daemon of the user
+    if not trusted_socket(socket_path):
+        print(f"Socket '{socket_path}' does not belong to the user, it is not used", file=sys.stderr)
+        return None
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(socket_path)
+    except (FileNotFoundError, ConnectionRefusedError):
+        client.close()
+        return None
+
+    with client:
+        if peer_uid(client) not in (None, os.getuid()):
+            print(f"Daemon of '{socket_path}' is run by other user, it is not used", file=sys.stderr)
+            return None
+        request = json.dumps({"argv": argv, "cwd": os.getcwd()}).encode()
+        socket.send_fds(client, [request], [0, 1, 2])
+        # worker answers by exit status when the script ends
+        response = b""
+        while chunk := client.recv(64):
+            response += chunk
+    return int(response) if response.strip() else 1
+
+
+def main():
+    argv = sys.argv[1:]
+    status = run_remotely(argv, default_socket_path())
+    if status is None:
+        run_locally(argv)
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+import json
+import os
+import signal
+import socket
+import stat
+import sys
+import tempfile
+import traceback
+from argparse import ArgumentParser
+
+from interpreter.cli import parse_args, run_cli, load_engine, EVALUATION_ENGINES
+from interpreter.lexer import iter_tokens
+from interpreter.parser import Parser
+from interpreter.semantics import SemanticAnalyzer
+from interpreter.optimizer import Optimizer
+from interpreter.modules import ModuleLoader
+from interpreter.cache import interpreter_fingerprint
+from .client import default_socket_path, owned_by_user, MAX_REQUEST_SIZE
+
+
+DEFAULT_WORKERS_COUNT = 4
+
+# program which warms up the front end and the optimizer before workers are forked
+WARM_UP_PROGRAM = "def f |n int| -> int { ! n + 1; }\nx int = [f 1];\n"
+
+
+def warm_up():
+    """ Imports every engine and runs the front end once, so forked workers share imports and caches """
+
+    for name in EVALUATION_ENGINES:
+        load_engine(name)
+    # fingerprint of sources is computed once for all cached programs of workers
+    interpreter_fingerprint()
+    fd, filename = tempfile.mkstemp(suffix=".txt")
+    with os.fdopen(fd, "w") as file:
+        file.write(WARM_UP_PROGRAM)
+    try:
+        ast = ModuleLoader().load(Parser(iter_tokens(filename)).parse(), filename)
+        Optimizer(ast, SemanticAnalyzer(ast).analyze()).optimize()
+    finally:
+        os.remove(filename)
+
+
+def run_request(connection: socket.socket):
+    """ Runs script of the client with its standard streams, returns exit status """
+
+    message, fds, _, _ = socket.recv_fds(connection, MAX_REQUEST_SIZE, 3)
+    request = json.loads(message)
+    sys.stdout.flush()
+    sys.stderr.flush()
+    for target_fd, fd in enumerate(fds):
+        os.dup2(fd, target_fd)
+        os.close(fd)
+    # output of a terminal is shown by lines as in the usual run
+    sys.stdout.reconfigure(line_buffering=os.isatty(1))
+
+    os.chdir(request["cwd"])
+    try:
+        return run_cli(parse_args(request["argv"]))
+    except SystemExit as exit_error:
+        code = exit_error.code
+        if code is None or isinstance(code, int):
+            return code or 0
+        print(code, file=sys.stderr)
+        return 1
+    except BaseException:
+        traceback.print_exc()
+        return 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+
+
+def worker(listener: socket.socket):
+    """ Serves one client, the process ends after the script, so scripts never share state """
+
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    status = 1
+    try:
+        connection, _ = listener.accept()
+        listener.close()
+        with connection:
+            status = run_request(connection)
+            connection.sendall(f"{status}\n".encode())
+    except Exception:
+        # failures of the protocol go to the log of the daemon
+        traceback.print_exc()
+    finally:
+        os._exit(status)
+
+
+def spawn_worker(listener: socket.socket):
+    pid = os.fork()
+    if pid == 0:
+        worker(listener)
+    return pid
+
+
+def serve(socket_path: str, workers_count: int = DEFAULT_WORKERS_COUNT):
+    """ Listens on unix socket, keeps workers_count pre-warmed workers waiting for clients """
+
+    # clients pass their streams only to a socket in the dir of the user
+    socket_dir = os.path.dirname(os.path.abspath(socket_path))
+    os.makedirs(socket_dir, mode=0o700, exist_ok=True)
+    if not owned_by_user(socket_dir):
+        sys.exit(f"Dir '{socket_dir}' of the socket must belong to the user and be writable only by the user")
+    if os.path.lexists(socket_path):
+        if not stat.S_ISSOCK(os.lstat(socket_path).st_mode) or not owned_by_user(socket_path):
+            sys.exit(f"'{socket_path}' is not a socket of the user, it is not replaced")
+        os.remove(socket_path)
+
+    warm_up()
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(socket_path)
+    # scripts run with rights of the owner, so only the owner connects
+    os.chmod(socket_path, 0o600)
+    listener.listen(128)
+
+    workers = set()
+
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, stop)
+    print(f"Serving on '{socket_path}' with {workers_count} workers", file=sys.stderr)
+    try:
+        while True:
+            while len(workers) < workers_count:
+                workers.add(spawn_worker(listener))
+            pid, _ = os.wait()
+            workers.discard(pid)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for pid in workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        listener.close()
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+
+
+def serve_main(argv: list):
+    """ Runs daemon by args of 'serve' command """
+
+    parser = ArgumentParser(
+        prog="interpreter serve",
+        description="Preload the interpreter and run scripts of clients (interpreter/server/client.py) "
+                    "in pre-warmed workers."
+    )
+    parser.add_argument(
+        "--socket", type=str, default=default_socket_path(),
+        help="Path of unix socket in a dir of the user (MTR_SOCKET environment var, "
+             "XDG_RUNTIME_DIR or user's dir in temp dir by default)"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=DEFAULT_WORKERS_COUNT, help="Count of workers waiting for clients"
+    )
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be positive")
+    serve(args.socket, args.workers)
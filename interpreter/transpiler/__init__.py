@@ -0,0 +1,2 @@
+from .generator import *
+from .engine import *
@@ -0,0 +1,68 @@
+from interpreter.ast import *
+from interpreter.semantics import *
+from interpreter.builtins import array_load, array_item_error
+from interpreter.evaluation import and_operation, or_operation
+from interpreter.evaluation.memoization import DEFAULT_MEMO_SIZE, MemoCache, memoized
+from interpreter.evaluation.profiler import Profiler
+from .generator import PythonCodeGenerator, BlockExit, range_with_default_step
+
+
+class PythonEngine():
+    """ Transpiles analyzed AST into python source, compiles it
+        and lets evaluation loop of CPython run the program """
+
+    def __init__(
+        self, ast: AST_Node, scope_controller: ScopeController, memo_size: int = DEFAULT_MEMO_SIZE,
+        profiler: Profiler = None
+    ):
+        self.ast = ast
+        self.scope_controller = scope_controller
+        # calls of functions are measured only if there is a profiler
+        self.profiler = profiler
+
+        # func symbol : results cache of pure function (no caches if memo size is 0)
+        self.memo_size = memo_size
+        self.memo_caches = {}
+
+    def generate(self):
+        generator = PythonCodeGenerator(self.ast, self.scope_controller, self.memo_size > 0, self.profiler is not None)
+        return generator, generator.generate()
+
+    def compile(self):
+        """ Returns code object of the program and namespace to run it in """
+
+        generator, source = self.generate()
+
+        memo = {}
+        for name, func_symbol in generator.memoized_funcs.items():
+            memo[name] = self.memo_caches[func_symbol] = MemoCache(func_symbol.name, self.memo_size)
+
+        profiles = {}
+        for name, (func_symbol, node) in generator.profiled_funcs.items():
+            profiles[name] = self.profiler.function_profile(func_symbol, node)
+
+        namespace = {
+            "__name__"      : "__program__",
+            "__and"         : and_operation,
+            "__or"          : or_operation,
+            "__range"       : range_with_default_step,
+            "__load_item"   : array_load,
+            "__item_error"  : array_item_error,
+            "__BlockExit"   : BlockExit,
+            "__memoized"    : memoized,
+            "__memo"        : memo,
+            "__profiled"    : self.profiler.profiled if self.profiler else None,
+            "__profiles"    : profiles,
+            **generator.namespace,
+        }
+        return compile(source, "<program>", "exec"), namespace
+
+    def evaluate(self):
+        if self.profiler is None:
+            code, namespace = self.compile()
+            exec(code, namespace)
+            return
+        # intrinsics are bound in the namespace, so they are instrumented before compilation
+        with self.profiler.instrumented_intrinsics(self.scope_controller):
+            code, namespace = self.compile()
+            exec(code, namespace)
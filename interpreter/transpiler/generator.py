@@ -0,0 +1,459 @@
+import math
+import operator
+import re
+
+from interpreter.ast import *
+from interpreter.builtins import *
+from interpreter.lexer import TokenType
+from interpreter.semantics import *
+from interpreter.evaluation import (
+    LITERAL_CONVERSIONS, TYPE_CASTS, and_operation, or_operation,
+    binary_operation, type_cast_func, is_cast_needed
+)
+
+
+# handler of binary operation : python operator or name of helper function
+PYTHON_BINARY_OPERATORS = {
+    operator.add     : "+",
+    operator.sub     : "-",
+    operator.mul     : "*",
+    operator.truediv : "/",
+    operator.and_    : "&",
+    operator.or_     : "|",
+    operator.gt      : ">",
+    operator.ge      : ">=",
+    operator.lt      : "<",
+    operator.le      : "<=",
+    operator.eq      : "==",
+    operator.ne      : "!=",
+}
+
+PYTHON_BINARY_HELPERS = {
+    and_operation : "__and",
+    or_operation  : "__or",
+}
+
+INDENT = "    "
+
+
+class BlockExit(Exception):
+    """ Raised by non None result of call statement nested in global statement,
+        it ends the global statement as in EvaluationLoop """
+
+
+def range_with_default_step(start: int, end: int):
+    return range(start, end, 1 if start < end else -1)
+
+
+def python_name(name: str, suffix: str):
+    """ Returns python identifier made of language identifier, which can contain '+' """
+
+    name = re.sub(r"\W", "_", name)
+    if not (name + suffix).isidentifier():
+        name = "_" + name
+    return name + suffix
+
+
+class PythonCodeGenerator(TreeVisitor):
+    """ Generates python source of analyzed AST. Vars become locals of python functions,
+        global code is the body of __program function. Produces the same output as EvaluationLoop """
+
+    class FuncContext():
+        def __init__(self, func_symbol: Symbol_Func, params: list[str], tail_returns: list[tuple]):
+            self.symbol = func_symbol
+            self.params = params
+            # self calls in return statements are loops over the function body
+            self.has_tail_calls = bool(tail_returns)
+            self.has_loop_tail_calls = any(in_loop for _, in_loop in tail_returns)
+            # count of tail calls emitted inside loops
+            self.loop_tail_calls = 0
+            self.loops_depth = 0
+
+    def __init__(self, ast: AST_Node, scope_controller: ScopeController, memoize: bool = True, profile: bool = False):
+        super().__init__(ast)
+        self.scope_controller = scope_controller
+        self.memoize = memoize
+        self.profile = profile
+
+        self.lines = []
+        self.indent = 0
+        # function which body is generated now (None for global code)
+        self.func = None
+        # global if or loop statement is generated now
+        self.in_global_statement = False
+        self.block_exit_used = False
+
+        # python name : value of builtin func or constant bound in module namespace
+        self.namespace = {}
+        # func symbol : python name
+        self.func_names = {}
+        self.user_funcs_count = 0
+        # python name : symbol of pure func which results are cached
+        self.memoized_funcs = {}
+        # python name : (symbol, declaration node) of func which calls are measured
+        self.profiled_funcs = {}
+
+    def emit(self, line: str):
+        self.lines.append(INDENT * self.indent + line)
+
+    def var_name(self, node: AST_Node):
+        return python_name(node.name, f"_{node.depth}_{node.slot}")
+
+    def func_name(self, func_symbol: Symbol_Func):
+        if func_symbol not in self.func_names:
+            if func_symbol.frame_layout is None:
+                name = python_name(func_symbol.name, "")
+                self.namespace[name] = func_symbol.value
+            else:
+                name = python_name(func_symbol.name, f"_f{self.user_funcs_count}")
+                self.user_funcs_count += 1
+            self.func_names[func_symbol] = name
+        return self.func_names[func_symbol]
+
+    def const_name(self, value: any):
+        name = f"__const_{len(self.namespace)}"
+        self.namespace[name] = value
+        return name
+
+    def literal_text(self, value: any):
+        # not finite floats and huge ints have no literals
+        if type(value) is float and not math.isfinite(value) or type(value) is int and value.bit_length() > 64:
+            return self.const_name(value)
+        text = repr(value)
+        return f"({text})" if text.startswith("-") else text
+
+    def cast_text(self, type_name: str, value_text: str):
+        cast = TYPE_CASTS.get(type_name)
+        # checks of arrays and types without conversion are bound in the namespace
+        if not isinstance(cast, type):
+            name = f"__cast_{python_name(type_name, '')}"
+            self.namespace[name] = type_cast_func(type_name)
+            return f"{name}({value_text})"
+        return f"{cast.__name__}({value_text})"
+
+    def value_cast(self, value_node: AST_Node, type_name: str):
+        """ Returns code of value casted to the type if it may have another type """
+
+        value_text = self.visit_node(value_node)
+        if is_cast_needed(value_node, type_name):
+            return self.cast_text(type_name, value_text)
+        return value_text
+
+    def tail_returns(self, node: AST_Node, in_loop: bool = False):
+        """ Returns (return node, is in loop) pairs of self calls in the function body """
+
+        if isinstance(node, Return_Node):
+            return [(node, in_loop)] if node.tail_call else []
+        if isinstance(node, Block_Node):
+            return [tail for stm in node.statements for tail in self.tail_returns(stm, in_loop)]
+        if isinstance(node, If_Else_Node):
+            return self.tail_returns(node.body, in_loop) + (
+                self.tail_returns(node.else_branch, in_loop) if node.else_branch else []
+            )
+        if isinstance(node, Loop_Node):
+            return self.tail_returns(node.body, True)
+        return []
+
+    def outer_assigned_names(self, node: AST_Node, depth: int):
+        """ Returns names of vars of outer functions assigned in the function body """
+
+        names = []
+        if isinstance(node, Var_Assign_Node) and node.depth < depth:
+            names.append(self.var_name(node))
+        elif isinstance(node, Block_Node):
+            for stm in node.statements:
+                names += self.outer_assigned_names(stm, depth)
+        elif isinstance(node, If_Else_Node):
+            names += self.outer_assigned_names(node.body, depth)
+            if node.else_branch:
+                names += self.outer_assigned_names(node.else_branch, depth)
+        elif isinstance(node, Loop_Node):
+            # existing var can be the loop var
+            if node.var and node.var.depth < depth:
+                names.append(self.var_name(node.var))
+            names += self.outer_assigned_names(node.body, depth)
+        return names
+
+    def emit_body(self, block: Block_Node):
+        self.indent += 1
+        for stm in block.statements:
+            self.emit_statement(stm)
+        if not block.statements:
+            self.emit("pass")
+        self.indent -= 1
+
+    def emit_statement(self, node: AST_Node):
+        if isinstance(node, Func_Call_Node):
+            self.emit_call_statement(node)
+        else:
+            self.visit_node(node)
+
+    def emit_call_statement(self, node: Func_Call_Node):
+        """ Non None result of call statement ends the function uncasted,
+            or the global statement around it. Results of global calls are ignored """
+
+        call_text = self.visit_node(node)
+        if self.func:
+            self.emit(f"if (__r := {call_text}) is not None:")
+            if self.func.has_tail_calls:
+                # result of the last call is casted by the return of the first one
+                ret_cast = self.cast_text(self.func.symbol.ret_type.name, "__r")
+                self.emit(f"{INDENT}return {ret_cast} if __tailed else __r")
+            else:
+                self.emit(f"{INDENT}return __r")
+        elif self.in_global_statement:
+            self.emit(f"if {call_text} is not None:")
+            self.emit(f"{INDENT}raise __BlockExit")
+            self.block_exit_used = True
+        else:
+            self.emit(call_text)
+
+    def emit_global_statement(self, node: AST_Node):
+        """ Global if or loop is wrapped into try statement if results of calls can end it """
+
+        start = len(self.lines)
+        self.in_global_statement = True
+        self.block_exit_used = False
+        self.indent += 1
+        self.visit_node(node)
+        self.indent -= 1
+        self.in_global_statement = False
+
+        if self.block_exit_used:
+            self.lines.insert(start, INDENT * self.indent + "try:")
+            self.emit("except __BlockExit:")
+            self.emit(f"{INDENT}pass")
+        else:
+            self.lines[start:] = [line[len(INDENT):] for line in self.lines[start:]]
+
+    def literal_value(self, node: Literal_Node):
+        return LITERAL_CONVERSIONS[node.start_token.type](node.value)
+
+    def visit_literal(self, node):
+        return self.literal_text(self.literal_value(node))
+
+    def visit_var(self, node):
+        return self.var_name(node)
+
+    def visit_index(self, node):
+        item = f"__load_item({self.var_name(node)}, {self.value_cast(node.index, INT_TYPE.name)})"
+        # bools are stored as ints
+        return f"bool({item})" if node.value_type is bool else item
+
+    def visit_type(self, node):
+        pass
+
+    def visit_binop(self, node):
+        left = self.visit_node(node.left)
+        right = self.visit_node(node.right)
+
+        operation = binary_operation(node)
+        if operation in PYTHON_BINARY_HELPERS:
+            # both operands are evaluated before (no short circuit)
+            return f"{PYTHON_BINARY_HELPERS[operation]}({left}, {right})"
+        return f"({left} {PYTHON_BINARY_OPERATORS[operation]} {right})"
+
+    def visit_unop(self, node):
+        left = self.visit_node(node.left)
+        if node.start_token.type == TokenType.NOT_OP:
+            return f"(not {left})"
+        return f"(-{left})"
+
+    def visit_var_decl(self, node):
+        value = "None"
+        if node.value:
+            value = self.value_cast(node.value, node.type_node.name)
+        self.emit(f"{self.var_name(node)} = {value}")
+
+    def visit_var_assign(self, node):
+        self.emit(f"{self.var_name(node)} = {self.value_cast(node.value, node.var_type.name)}")
+
+    def visit_index_assign(self, node):
+        # value is evaluated before the array and index as in EvaluationLoop
+        value = self.value_cast(node.value, node.var_type.name)
+        self.emit(f"__item = {value}")
+        self.emit(f"__index = {self.value_cast(node.index, INT_TYPE.name)}")
+        # only errors of the store itself are errors of the array
+        self.emit("try:")
+        self.emit(f"{INDENT}{self.var_name(node)}[__index] = __item")
+        self.emit("except (IndexError, OverflowError):")
+        self.emit(f"{INDENT}__item_error({self.var_name(node)}, __index, __item)")
+
+    def visit_if_else(self, node):
+        keyword = "if"
+        while node:
+            if node.condition:
+                self.emit(f"{keyword} {self.visit_node(node.condition)}:")
+            else:
+                self.emit("else:")
+            self.emit_body(node.body)
+            node = node.else_branch
+            keyword = "elif"
+
+    def emit_range_values(self, node: Loop_Node):
+        """ Emits range values of the loop kept in locals, so they are evaluated once. Returns their names """
+
+        start, end = self.visit_node(node.range[0]), self.visit_node(node.range[1])
+        step = self.visit_node(node.step) if node.step else "None"
+        self.emit(f"__start, __end, __step = {start}, {end}, {step}")
+        # existing var is set to range start even for empty range
+        if isinstance(node.var, Var_Node):
+            self.emit(f"{self.var_name(node.var)} = __start")
+        return "__start", "__end", "__step"
+
+    def emit_reduction(self, node: Loop_Node):
+        """ Emits call of the loop reduction, the loop is evaluated by iterations in else branch """
+
+        reduction = node.reduction
+        name = f"__reduce_{len(self.namespace)}"
+        self.namespace[name] = reduction.reduce
+        var_name = lambda slot: python_name(reduction.slots_names[slot], f"_{slot[0]}_{slot[1]}")
+        inputs = ", ".join(var_name(slot) for slot in reduction.input_slots)
+        outputs = ", ".join(var_name(slot) for slot in reduction.output_slots)
+
+        # all iterations of simple counted loop are computed at once if its values allow
+        self.emit(f"if (__reduced := {name}(__start, __end, __step, {inputs})) is not None:")
+        self.emit(f"{INDENT}{outputs} = __reduced")
+        self.emit("else:")
+
+    def visit_loop(self, node):
+        reduced = node.reduction is not None
+        if node.var:
+            if reduced or isinstance(node.var, Var_Node):
+                start, end, step = self.emit_range_values(node)
+            else:
+                start, end = self.visit_node(node.range[0]), self.visit_node(node.range[1])
+                step = self.visit_node(node.step) if node.step else None
+            if reduced:
+                self.emit_reduction(node)
+                self.indent += 1
+
+            if node.step:
+                loop_range = f"range({start}, {end}, {step})"
+            elif isinstance(node.range[0], Literal_Node) and isinstance(node.range[1], Literal_Node):
+                step = 1 if self.literal_value(node.range[0]) < self.literal_value(node.range[1]) else -1
+                loop_range = f"range({start}, {end}, {step})"
+            else:
+                loop_range = f"__range({start}, {end})"
+            self.emit(f"for {self.var_name(node.var)} in {loop_range}:")
+        else:
+            self.emit("while True:")
+
+        if reduced:
+            self.emit_body(node.body)
+            self.indent -= 1
+            return
+
+        if not self.func:
+            self.emit_body(node.body)
+            return
+
+        loop_tail_calls = self.func.loop_tail_calls
+        self.func.loops_depth += 1
+        self.emit_body(node.body)
+        self.func.loops_depth -= 1
+
+        # tail call inside the loop breaks all loops up to the function body loop
+        if self.func.loop_tail_calls > loop_tail_calls:
+            self.emit("if __tail:")
+            if self.func.loops_depth:
+                self.emit(f"{INDENT}break")
+            else:
+                self.emit(f"{INDENT}__tail = False")
+                self.emit(f"{INDENT}continue")
+
+    def visit_func_decl(self, node):
+        func_symbol = node.symbol
+        name = self.func_name(func_symbol)
+        params = [self.var_name(param) for param in node.params]
+
+        self.emit(f"def {name}({', '.join(params)}):")
+        self.indent += 1
+
+        outer_names = self.outer_assigned_names(node.body, func_symbol.frame_layout.depth)
+        if outer_names:
+            self.emit(f"nonlocal {', '.join(dict.fromkeys(outer_names))}")
+
+        tmp_func = self.func
+        self.func = self.FuncContext(func_symbol, params, self.tail_returns(node.body))
+        if self.func.has_tail_calls:
+            self.emit("__tailed = False")
+            if self.func.has_loop_tail_calls:
+                self.emit("__tail = False")
+            self.emit("while True:")
+            self.emit_body(node.body)
+            self.indent += 1
+            # the last call ended without return
+            self.emit("if __tailed:")
+            self.emit(f"{INDENT}return {self.cast_text(func_symbol.ret_type.name, 'None')}")
+            self.emit("return None")
+            self.indent -= 1
+        else:
+            self.indent -= 1
+            self.emit_body(node.body)
+            self.indent += 1
+        self.func = tmp_func
+
+        self.indent -= 1
+
+        if func_symbol.pure and self.memoize:
+            self.memoized_funcs[name] = func_symbol
+            self.emit(f"{name} = __memoized({name}, __memo[{name!r}])")
+        if self.profile:
+            self.profiled_funcs[name] = (func_symbol, node)
+            self.emit(f"{name} = __profiled({name}, __profiles[{name!r}])")
+
+    def visit_func_call(self, node):
+        args = ", ".join(self.visit_node(arg) for arg in node.args)
+        return f"{self.func_name(node.symbol)}({args})"
+
+    def visit_return(self, node):
+        assert self.func
+        if not node.tail_call:
+            self.emit(f"return {self.value_cast(node.value, self.func.symbol.ret_type.name)}")
+            return
+
+        # args of self call rebind params, then the function body is evaluated again
+        args = [self.visit_node(arg) for arg in node.value.args]
+        if args:
+            self.emit(f"{', '.join(self.func.params)} = {', '.join(args)}")
+        self.emit("__tailed = True")
+        if self.func.loops_depth:
+            self.func.loop_tail_calls += 1
+            self.emit("__tail = True")
+            self.emit("break")
+        else:
+            self.emit("continue")
+
+    def visit_continue(self, node):
+        self.emit("continue")
+
+    def visit_break(self, node):
+        self.emit("break")
+
+    def visit_block(self, node):
+        # only the program block is visited, other blocks are bodies
+        for stm in node.statements:
+            if isinstance(stm, (If_Else_Node, Loop_Node)):
+                self.emit_global_statement(stm)
+            else:
+                self.emit_statement(stm)
+
+    def generate(self):
+        """ Returns python source of the program """
+
+        self.lines.clear()
+
+        self.emit("def __program():")
+        self.indent += 1
+        global_scope = self.scope_controller.get_global_scope()
+        for intr in INTRINSICS_LIST:
+            if type(intr) == IntrinsicVar:
+                var_symbol = global_scope.get_symbol(intr.name)
+                self.emit(f"{self.var_name(var_symbol)} = {self.literal_text(var_symbol.value)}")
+        self.visit_node(self.ast)
+        self.indent -= 1
+
+        self.emit("")
+        self.emit("__program()")
+        return "\n".join(self.lines) + "\n"
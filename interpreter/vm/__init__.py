@@ -0,0 +1,5 @@
+from .opcodes import *
+from .code import *
+from .compiler import *
+from .machine import *
+from .disassembler import *
\ No newline at end of file
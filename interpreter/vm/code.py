@@ -0,0 +1,86 @@
+class CodeObject():
+    """ Bytecode of the program or of one function with pools referenced by instructions args """
+
+    def __init__(self, name: str, depth: int):
+        self.name = name
+        # depth of function frame (0 for program)
+        self.depth = depth
+        # flat list of (opcode, arg) pairs
+        self.code = []
+        # source row of every instruction
+        self.rows = []
+        self.consts = []
+        # (depth, slot) pairs of vars of outer functions
+        self.outer_slots = []
+        # (func symbol, args count) pairs of calls
+        self.call_targets = []
+        # (depth, slot) : var name, for disassembly
+        self.slots_names = {}
+
+        self.__consts_indexes = {}
+        self.__outer_slots_indexes = {}
+        self.__call_targets_indexes = {}
+
+    def emit(self, opcode: int, arg: int = 0, row: int = 0):
+        """ Appends instruction and returns its offset """
+
+        offset = len(self.code)
+        self.code += [opcode, arg]
+        self.rows.append(row)
+        return offset
+
+    def patch(self, offset: int, arg: int):
+        """ Sets arg of already emitted instruction """
+
+        self.code[offset + 1] = arg
+
+    def offset(self):
+        return len(self.code)
+
+    def const_index(self, value: any):
+        # type is a part of the key, so 1, 1.0 and True are separate constants
+        try:
+            key = (type(value), value)
+            hash(key)
+        except TypeError:
+            key = (type(value), id(value))
+        # 0.0 and -0.0 are equal, but they are printed differently
+        if type(value) is float:
+            key = (float, repr(value))
+
+        if key not in self.__consts_indexes:
+            self.__consts_indexes[key] = len(self.consts)
+            self.consts.append(value)
+        return self.__consts_indexes[key]
+
+    def outer_slot_index(self, depth: int, slot: int):
+        key = (depth, slot)
+        if key not in self.__outer_slots_indexes:
+            self.__outer_slots_indexes[key] = len(self.outer_slots)
+            self.outer_slots.append(key)
+        return self.__outer_slots_indexes[key]
+
+    def call_target_index(self, func_symbol, args_count: int):
+        key = (id(func_symbol), args_count)
+        if key not in self.__call_targets_indexes:
+            self.__call_targets_indexes[key] = len(self.call_targets)
+            self.call_targets.append((func_symbol, args_count))
+        return self.__call_targets_indexes[key]
+
+
+class Function():
+    """ Runtime value of interpreted function symbol """
+
+    def __init__(self, func_symbol, code: CodeObject, params_slots: list[int], ret_cast):
+        self.name = func_symbol.name
+        self.symbol = func_symbol
+        self.code = code
+        self.params_slots = params_slots
+        self.frame_layout = func_symbol.frame_layout
+        # conversion of result to declared type
+        self.ret_cast = ret_cast
+        # results cache of pure function, it is set by the machine
+        self.memo = None
+
+    def __repr__(self):
+        return f"<function {self.name}>"
@@ -0,0 +1,250 @@
+from interpreter.ast import *
+from interpreter.lexer import TokenType
+from interpreter.builtins import INT_TYPE
+from interpreter.semantics import *
+from interpreter.evaluation import (
+    LITERAL_CONVERSIONS, BINARY_OPERATIONS, BOOL_BINARY_OPERATIONS, UNARY_OPERATIONS,
+    binary_operation, type_cast_func, is_cast_needed, BREAK, CONTINUE
+)
+from .opcodes import *
+from .code import CodeObject, Function
+
+
+# BINARY_OP arg : operator and its handler, handlers specialized for operands types go last
+BINARY_OPERATORS_TOKENS = list(BINARY_OPERATIONS.keys()) + list(BOOL_BINARY_OPERATIONS.keys())
+
+BINARY_OPERATORS = list(BINARY_OPERATIONS.values()) + list(BOOL_BINARY_OPERATIONS.values())
+
+# UNARY_OP arg indexes
+UNARY_OPERATORS_TOKENS = list(UNARY_OPERATIONS.keys())
+
+UNARY_OPERATORS = list(UNARY_OPERATIONS.values())
+
+
+class BytecodeCompiler(TreeVisitor):
+    """ Lowers analyzed AST into code objects of the program and its functions """
+
+    class LoopLabels():
+        def __init__(self, continue_offset: int, has_iterator: bool):
+            self.continue_offset = continue_offset
+            self.has_iterator = has_iterator
+            # offsets of jumps to the loop end
+            self.break_jumps = []
+
+    def __init__(self, ast: AST_Node, scope_controller: ScopeController):
+        super().__init__(ast)
+        self.scope_controller = scope_controller
+
+        self.cur_func_symbol = None
+        self.code = None
+        self.loops = []
+        # jumps to the end of current global statement
+        self.statement_end_jumps = []
+
+    def emit(self, node, opcode: int, arg: int = 0):
+        return self.code.emit(opcode, arg, node.start_token.pos.row)
+
+    def emit_statement_result(self, node, is_global_scope: bool):
+        """ Non None result of statement in not global block
+            ends evaluation of the block as in EvaluationLoop """
+
+        if self.cur_func_symbol:
+            self.emit(node, RETURN_IF_VALUE)
+        elif not is_global_scope:
+            self.statement_end_jumps.append(self.emit(node, JUMP_IF_VALUE))
+        else:
+            self.emit(node, POP_TOP)
+
+    def emit_slot_access(self, node, depth: int, slot: int, store: bool):
+        """ Emits load or store of var by its frame depth and slot """
+
+        self.code.slots_names[(depth, slot)] = node.name
+        if depth == 0:
+            self.emit(node, STORE_GLOBAL if store else LOAD_GLOBAL, slot)
+        elif depth == self.code.depth:
+            self.emit(node, STORE_LOCAL if store else LOAD_LOCAL, slot)
+        else:
+            self.emit(node, STORE_OUTER if store else LOAD_OUTER, self.code.outer_slot_index(depth, slot))
+
+    def visit_literal(self, node):
+        value = LITERAL_CONVERSIONS[node.start_token.type](node.value)
+        self.emit(node, LOAD_CONST, self.code.const_index(value))
+
+    def visit_var(self, node):
+        self.emit_slot_access(node, node.depth, node.slot, False)
+
+    def visit_index(self, node):
+        self.emit_slot_access(node, node.depth, node.slot, False)
+        yield node.index
+        self.emit_cast(node, node.index, INT_TYPE.name)
+        # bools are stored as ints
+        self.emit(node, LOAD_ITEM, int(node.value_type is bool))
+
+    def visit_type(self, node):
+        pass
+
+    def visit_binop(self, node):
+        yield node.left
+        yield node.right
+        self.emit(node, BINARY_OP, BINARY_OPERATORS.index(binary_operation(node)))
+
+    def visit_unop(self, node):
+        yield node.left
+        self.emit(node, UNARY_OP, UNARY_OPERATORS_TOKENS.index(node.start_token.type))
+
+    def emit_cast(self, node, value_node, type_name: str):
+        if is_cast_needed(value_node, type_name):
+            self.emit(node, CAST, self.code.const_index(type_cast_func(type_name)))
+
+    def visit_var_decl(self, node):
+        if node.value:
+            yield node.value
+            self.emit_cast(node, node.value, node.type_node.name)
+        else:
+            self.emit(node, LOAD_CONST, self.code.const_index(None))
+        self.emit_slot_access(node, node.depth, node.slot, True)
+
+    def visit_var_assign(self, node):
+        yield node.value
+        self.emit_cast(node, node.value, node.var_type.name)
+        self.emit_slot_access(node, node.depth, node.slot, True)
+
+    def visit_index_assign(self, node):
+        yield node.value
+        self.emit_cast(node, node.value, node.var_type.name)
+        self.emit_slot_access(node, node.depth, node.slot, False)
+        yield node.index
+        self.emit_cast(node, node.index, INT_TYPE.name)
+        self.emit(node, STORE_ITEM)
+
+    def visit_if_else(self, node):
+        # else branch
+        if not node.condition:
+            yield node.body
+            return
+
+        yield node.condition
+        else_jump = self.emit(node, POP_JUMP_IF_FALSE)
+        yield node.body
+
+        if node.else_branch:
+            end_jump = self.emit(node, JUMP)
+            self.code.patch(else_jump, self.code.offset())
+            yield node.else_branch
+            self.code.patch(end_jump, self.code.offset())
+        else:
+            self.code.patch(else_jump, self.code.offset())
+
+    def visit_loop(self, node):
+        # loop without condition
+        if not node.var:
+            loop = self.LoopLabels(self.code.offset(), False)
+            self.loops.append(loop)
+            yield node.body
+            self.emit(node, JUMP, loop.continue_offset)
+            self.loops.pop()
+
+            for jump in loop.break_jumps:
+                self.code.patch(jump, self.code.offset())
+            return
+
+        # loop with condition
+        yield node.range[0]
+        yield node.range[1]
+        if node.step:
+            yield node.step
+        else:
+            self.emit(node, LOAD_CONST, self.code.const_index(None))
+
+        # all iterations of simple counted loop are computed at once if its values allow
+        reduce_jump = None
+        if node.reduction is not None:
+            self.emit(node, LOAD_CONST, self.code.const_index(node.reduction))
+            reduce_jump = self.emit(node, REDUCE_LOOP)
+
+        # iteration var is set to range start even for empty range
+        self.emit(node, RANGE_ITER)
+        self.emit_slot_access(node.var, node.var.depth, node.var.slot, True)
+        loop = self.LoopLabels(self.code.offset(), True)
+        self.loops.append(loop)
+        end_jump = self.emit(node, FOR_ITER)
+        self.emit_slot_access(node.var, node.var.depth, node.var.slot, True)
+        yield node.body
+        self.emit(node, JUMP, loop.continue_offset)
+        self.loops.pop()
+
+        # iterator is already popped by FOR_ITER or by break
+        self.code.patch(end_jump, self.code.offset())
+        for jump in loop.break_jumps:
+            self.code.patch(jump, self.code.offset())
+        if reduce_jump is not None:
+            self.code.patch(reduce_jump, self.code.offset())
+
+    def visit_func_decl(self, node):
+        func_symbol = node.symbol
+        code = CodeObject(node.name, func_symbol.frame_layout.depth)
+        ret_cast = type_cast_func(func_symbol.ret_type.name)
+        func = Function(func_symbol, code, [param.slot for param in node.params], ret_cast)
+
+        tmp_code, tmp_loops = self.code, self.loops
+        tmp_func_symbol = self.cur_func_symbol
+        self.code, self.loops = func.code, []
+        self.cur_func_symbol = func_symbol
+
+        yield node.body
+        self.emit(node, LOAD_CONST, self.code.const_index(None))
+        self.emit(node, RETURN)
+
+        self.code, self.loops = tmp_code, tmp_loops
+        self.cur_func_symbol = tmp_func_symbol
+
+        self.emit(node, MAKE_FUNCTION, self.code.const_index(func))
+
+    def visit_func_call(self, node):
+        for arg in node.args:
+            yield arg
+        self.emit(node, CALL, self.code.call_target_index(node.symbol, len(node.args)))
+
+    def visit_return(self, node):
+        assert self.cur_func_symbol
+        if node.tail_call:
+            for arg in node.value.args:
+                yield arg
+            self.emit(node, TAIL_CALL, len(node.value.args))
+            return
+
+        yield node.value
+        self.emit_cast(node, node.value, self.cur_func_symbol.ret_type.name)
+        self.emit(node, RETURN)
+
+    def visit_continue(self, node):
+        loop = self.loops[-1]
+        self.emit(node, JUMP, loop.continue_offset)
+
+    def visit_break(self, node):
+        loop = self.loops[-1]
+        if loop.has_iterator:
+            self.emit(node, POP_TOP)
+        loop.break_jumps.append(self.emit(node, JUMP))
+
+    def visit_block(self, node):
+        is_global_scope = node is self.ast
+
+        for stm in node.statements:
+            yield stm
+            if isinstance(stm, Func_Call_Node):
+                self.emit_statement_result(stm, is_global_scope)
+
+            if is_global_scope:
+                for jump in self.statement_end_jumps:
+                    self.code.patch(jump, self.code.offset())
+                self.statement_end_jumps.clear()
+
+    def compile(self):
+        """ Returns code object of the whole program """
+
+        self.code = CodeObject("<program>", 0)
+        self.visit_node(self.ast)
+        self.emit(self.ast, LOAD_CONST, self.code.const_index(None))
+        self.emit(self.ast, RETURN)
+        return self.code
@@ -0,0 +1,60 @@
+from .opcodes import *
+from .code import CodeObject, Function
+from .compiler import BINARY_OPERATORS_TOKENS, UNARY_OPERATORS_TOKENS
+
+
+def disassemble(program: CodeObject):
+    """ Returns text listing of code object and of all functions it declares """
+
+    lines = []
+    code_objects = [program]
+
+    while code_objects:
+        code_object = code_objects.pop(0)
+        lines.append(f"Disassembly of {code_object.name}:")
+
+        prev_row = None
+        for offset in range(0, len(code_object.code), 2):
+            opcode = code_object.code[offset]
+            arg = code_object.code[offset + 1]
+            row = code_object.rows[offset // 2]
+
+            row_str = str(row) if row != prev_row else ""
+            prev_row = row
+            lines.append(f"{row_str:>6} {offset:>6} {OPCODE_NAMES[opcode]:<18} {arg:<5} {describe_arg(code_object, opcode, arg)}")
+
+        for const in code_object.consts:
+            if isinstance(const, Function):
+                code_objects.append(const.code)
+        lines.append("")
+
+    return "\n".join(lines)
+
+
+def describe_arg(code_object: CodeObject, opcode: int, arg: int):
+    if opcode in [LOAD_CONST, CAST]:
+        const = code_object.consts[arg]
+        return f"({getattr(const, '__name__', repr(const))})"
+    elif opcode in [LOAD_LOCAL, STORE_LOCAL]:
+        return f"({code_object.slots_names[(code_object.depth, arg)]})"
+    elif opcode in [LOAD_GLOBAL, STORE_GLOBAL]:
+        return f"({code_object.slots_names[(0, arg)]})"
+    elif opcode in [LOAD_OUTER, STORE_OUTER]:
+        depth, slot = code_object.outer_slots[arg]
+        return f"({code_object.slots_names[(depth, slot)]}, depth {depth})"
+    elif opcode == MAKE_FUNCTION:
+        return f"({code_object.consts[arg].name})"
+    elif opcode == CALL:
+        func_symbol, args_count = code_object.call_targets[arg]
+        return f"({func_symbol.name}, {args_count} args)"
+    elif opcode == LOAD_ITEM and arg:
+        return "(bool)"
+    elif opcode == TAIL_CALL:
+        return f"({arg} args)"
+    elif opcode in JUMP_OPCODES:
+        return f"(to {arg})"
+    elif opcode == BINARY_OP:
+        return f"({BINARY_OPERATORS_TOKENS[arg].name})"
+    elif opcode == UNARY_OP:
+        return f"({UNARY_OPERATORS_TOKENS[arg].name})"
+    return ""
@@ -0,0 +1,219 @@
+from interpreter.ast import *
+from interpreter.semantics import *
+from interpreter.error import runtime_error
+from interpreter.builtins import array_item_error
+from interpreter.evaluation import DEFAULT_MAX_CALL_DEPTH
+from interpreter.evaluation.memoization import DEFAULT_MEMO_SIZE, MISS, MemoCache
+from .opcodes import *
+from .code import CodeObject, Function
+from .compiler import BytecodeCompiler, BINARY_OPERATORS, UNARY_OPERATORS
+
+
+class VirtualMachine():
+    """ Compiles analyzed AST into bytecode and runs it in a dispatch loop.
+        Interpreted calls use frames stack of the machine instead of python recursion """
+
+    def __init__(
+        self, ast: AST_Node, scope_controller: ScopeController, memo_size: int = DEFAULT_MEMO_SIZE,
+        max_call_depth: int = DEFAULT_MAX_CALL_DEPTH
+    ):
+        self.ast = ast
+        self.scope_controller = scope_controller
+        self.max_call_depth = max_call_depth
+
+        # func symbol : results cache of pure function (no caches if memo size is 0)
+        self.memo_size = memo_size
+        self.memo_caches = {}
+
+    def compile(self):
+        return BytecodeCompiler(self.ast, self.scope_controller).compile()
+
+    def run(self, program: CodeObject):
+        code = program.code
+        consts = program.consts
+        outer_slots = program.outer_slots
+        call_targets = program.call_targets
+        max_call_depth = self.max_call_depth
+
+        global_frame = self.scope_controller.global_frame_layout.new_frame()
+        # depth : values array of the function running at this depth
+        display = [global_frame]
+        local_frame = global_frame
+
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        # (code object, return pc, stack base, function, local frame, tail called flag, memo key)
+        # of the caller and replaced display entry
+        frames = []
+        base = 0
+        cur_code = program
+        cur_func = None
+        # current call made tail calls, so its result is not casted yet
+        tail_called = False
+        # args key of current call which result is put in cache of the function
+        memo_key = None
+        pc = 0
+
+        while True:
+            opcode = code[pc]
+            arg = code[pc + 1]
+            pc += 2
+
+            if opcode == LOAD_LOCAL:
+                push(local_frame[arg])
+            elif opcode == LOAD_CONST:
+                push(consts[arg])
+            elif opcode == STORE_LOCAL:
+                local_frame[arg] = pop()
+            elif opcode == LOAD_GLOBAL:
+                push(global_frame[arg])
+            elif opcode == STORE_GLOBAL:
+                global_frame[arg] = pop()
+            elif opcode == BINARY_OP:
+                right = pop()
+                stack[-1] = BINARY_OPERATORS[arg](stack[-1], right)
+            elif opcode == CAST:
+                stack[-1] = consts[arg](stack[-1])
+            elif opcode == POP_JUMP_IF_FALSE:
+                if not pop():
+                    pc = arg
+            elif opcode == JUMP:
+                pc = arg
+            elif opcode == FOR_ITER:
+                for value in stack[-1]:
+                    push(value)
+                    break
+                else:
+                    pop()
+                    pc = arg
+            elif opcode == CALL:
+                func_symbol, args_count = call_targets[arg]
+                func = func_symbol.value
+                if args_count:
+                    args = stack[-args_count:]
+                    del stack[-args_count:]
+                else:
+                    args = []
+
+                if type(func) is not Function:
+                    push(func(*args))
+                    continue
+
+                call_memo_key = None
+                memo = func.memo
+                if memo is not None and memo.enabled:
+                    call_memo_key = memo.key(tuple(args))
+                    if call_memo_key is not None:
+                        result = memo.get(call_memo_key)
+                        if result is not MISS:
+                            push(result)
+                            continue
+
+                if len(frames) >= max_call_depth:
+                    runtime_error(f"Max call depth {max_call_depth} is exceeded by call of '{func.name}'")
+
+                # every call has its own values of the function vars
+                frame = func.frame_layout.acquire_frame()
+                for slot, arg_value in zip(func.params_slots, args):
+                    frame[slot] = arg_value
+
+                depth = func.code.depth
+                frames.append((cur_code, pc, base, cur_func, local_frame, tail_called, memo_key, display[depth]))
+                display[depth] = local_frame = frame
+                tail_called = False
+                memo_key = call_memo_key
+                cur_code, cur_func = func.code, func
+                code, consts = cur_code.code, cur_code.consts
+                outer_slots, call_targets = cur_code.outer_slots, cur_code.call_targets
+                base = len(stack)
+                pc = 0
+            elif opcode == RETURN or opcode == RETURN_IF_VALUE:
+                result = pop()
+                if opcode == RETURN_IF_VALUE and result is None:
+                    continue
+                # end of program
+                if not frames:
+                    return result
+
+                if tail_called:
+                    # result of the last call is casted by the return of the first one
+                    result = cur_func.ret_cast(result)
+                if memo_key is not None:
+                    cur_func.memo.put(memo_key, result)
+
+                (caller_code, pc, caller_base, caller_func, caller_frame, tail_called, memo_key,
+                    display_frame) = frames.pop()
+
+                cur_func.frame_layout.release_frame(local_frame)
+                display[cur_code.depth] = display_frame
+                local_frame = caller_frame
+                del stack[base:]
+                base = caller_base
+                cur_code, cur_func = caller_code, caller_func
+                code, consts = cur_code.code, cur_code.consts
+                outer_slots, call_targets = cur_code.outer_slots, cur_code.call_targets
+                push(result)
+            elif opcode == POP_TOP:
+                pop()
+            elif opcode == UNARY_OP:
+                stack[-1] = UNARY_OPERATORS[arg](stack[-1])
+            elif opcode == RANGE_ITER:
+                step = pop()
+                end = pop()
+                start = pop()
+                if step is None:
+                    step = 1 if start < end else -1
+                push(iter(range(start, end, step)))
+                push(start)
+            elif opcode == JUMP_IF_VALUE:
+                if pop() is not None:
+                    del stack[base:]
+                    pc = arg
+            elif opcode == LOAD_ITEM:
+                index = pop()
+                try:
+                    stack[-1] = bool(stack[-1][index]) if arg else stack[-1][index]
+                except IndexError:
+                    array_item_error(stack[-1], index)
+            elif opcode == STORE_ITEM:
+                index = pop()
+                values = pop()
+                value = pop()
+                try:
+                    values[index] = value
+                except (IndexError, OverflowError):
+                    array_item_error(values, index, value)
+            elif opcode == REDUCE_LOOP:
+                if pop().run(display, stack[-3], stack[-2], stack[-1]):
+                    del stack[-3:]
+                    pc = arg
+            elif opcode == LOAD_OUTER:
+                depth, slot = outer_slots[arg]
+                push(display[depth][slot])
+            elif opcode == STORE_OUTER:
+                depth, slot = outer_slots[arg]
+                display[depth][slot] = pop()
+            elif opcode == TAIL_CALL:
+                args = stack[len(stack) - arg:]
+                del stack[base:]
+
+                # args of self call rebind params in the frame of current call
+                local_frame[:] = cur_func.frame_layout.initial_values
+                for slot, arg_value in zip(cur_func.params_slots, args):
+                    local_frame[slot] = arg_value
+                tail_called = True
+                pc = 0
+            elif opcode == MAKE_FUNCTION:
+                func = consts[arg]
+                func.symbol.value = func
+                if func.symbol.pure and self.memo_size > 0 and func.memo is None:
+                    func.memo = self.memo_caches[func.symbol] = MemoCache(func.name, self.memo_size)
+                while len(display) <= func.code.depth:
+                    display.append(None)
+            else:
+                assert 0 and "Unknown opcode"
+
+    def evaluate(self):
+        program = self.compile()
+        self.run(program)
@@ -0,0 +1,34 @@
+# Every instruction is a pair of ints (opcode, arg) in the flat code list,
+# jump args are absolute offsets in that list.
+
+LOAD_CONST        = 1   # push consts[arg]
+LOAD_LOCAL        = 2   # push local_frame[arg]
+STORE_LOCAL       = 3   # local_frame[arg] = pop()
+LOAD_GLOBAL       = 4   # push global_frame[arg]
+STORE_GLOBAL      = 5   # global_frame[arg] = pop()
+LOAD_OUTER        = 6   # depth, slot = outer_slots[arg]; push frames[depth][slot]
+STORE_OUTER       = 7   # depth, slot = outer_slots[arg]; frames[depth][slot] = pop()
+CAST              = 8   # top = consts[arg](top), conversion to declared type
+BINARY_OP         = 9   # right = pop(); top = BINARY_OPERATORS[arg](top, right)
+UNARY_OP          = 10  # top = UNARY_OPERATORS[arg](top)
+POP_TOP           = 11  # pop()
+JUMP              = 12  # pc = arg
+POP_JUMP_IF_FALSE = 13  # if not pop(): pc = arg
+RANGE_ITER        = 14  # step, end, start = pop(), pop(), pop(); push iterator; push start
+FOR_ITER          = 15  # push next(top) or pop iterator and pc = arg
+MAKE_FUNCTION     = 16  # func = consts[arg]; its symbol value = func
+CALL              = 17  # func symbol, args count = call_targets[arg]; push func(*args)
+RETURN            = 18  # return pop() to the caller frame
+RETURN_IF_VALUE   = 19  # value = pop(); if value is not None: return value
+JUMP_IF_VALUE     = 20  # value = pop(); if value is not None: clear frame stack and pc = arg
+TAIL_CALL         = 21  # args = pop arg values; reset local frame, set params to args and pc = 0
+LOAD_ITEM         = 22  # index = pop(); top = top[index], converted to bool if arg is 1
+STORE_ITEM        = 23  # index, values, value = pop(), pop(), pop(); values[index] = value
+REDUCE_LOOP       = 24  # reduction = pop(); if it computes loop over start, end, step on the stack: pop them and pc = arg
+
+OPCODE_NAMES = {
+    value: name for name, value in dict(globals()).items() 
+    if name.isupper() and isinstance(value, int)
+}
+
+JUMP_OPCODES = (JUMP, POP_JUMP_IF_FALSE, FOR_ITER, JUMP_IF_VALUE, REDUCE_LOOP)
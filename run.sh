@@ -3,4 +3,4 @@
 SCRIPTPATH="$( cd -- "$(dirname "$0")" >/dev/null 2>&1 ; pwd -P )"
 
 export PYTHONPATH=$SCRIPTPATH
-python3 $SCRIPTPATH/interpreter $1 $2
+python3 $SCRIPTPATH/interpreter "$@"
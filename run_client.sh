@@ -0,0 +1,5 @@
+#!/bin/sh
+
+SCRIPTPATH="$( cd -- "$(dirname "$0")" >/dev/null 2>&1 ; pwd -P )"
+
+python3 -S $SCRIPTPATH/interpreter/server/client.py "$@"
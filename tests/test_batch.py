@@ -0,0 +1,62 @@
+import json
+import os
+import subprocess
+import sys
+
+from test_evaluation import EXPECTED_OUTPUT
+
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROGRAM = os.path.join(REPO_DIR, "tests", "test_evaluation.txt")
+
+# name : source of scripts of the batch, failing ones do not stop the others
+SCRIPTS = {
+    "syntax.txt": "x int = ;\n",
+    "semantic.txt": "[shown missing];\n",
+    "short.txt": '[shown "short"];\n',
+}
+
+
+def run_interpreter(*args):
+    return subprocess.run(
+        [sys.executable, os.path.join(REPO_DIR, "interpreter"), *args, "--no-cache"],
+        env=dict(os.environ, PYTHONPATH=REPO_DIR), capture_output=True, text=True, timeout=60
+    )
+
+
+def write_scripts(tmp_path):
+    for name, source in SCRIPTS.items():
+        (tmp_path / name).write_text(source)
+    manifest = tmp_path / "manifest.txt"
+    manifest.write_text("# scripts of the batch\n" + "".join(f"{name}\n" for name in SCRIPTS) + f"{PROGRAM}\n")
+    return [str(tmp_path / name) for name in SCRIPTS], str(manifest)
+
+
+def test_batch_output_in_order(tmp_path):
+    filenames, _ = write_scripts(tmp_path)
+    for jobs in ("1", "3"):
+        result = run_interpreter(PROGRAM, *filenames, PROGRAM, "-j", jobs)
+        assert result.returncode == 1
+        output = result.stdout.splitlines()
+        assert output[:len(EXPECTED_OUTPUT)] == EXPECTED_OUTPUT
+        assert output[-len(EXPECTED_OUTPUT) - 1:] == ["short", *EXPECTED_OUTPUT]
+        assert "Syntax error occured" in result.stdout
+        assert "Semantic error occured" in result.stdout
+        assert f"5 scripts, 2 failed, {jobs} jobs" in result.stderr
+
+    result = run_interpreter(PROGRAM, "-j", "2")
+    assert result.returncode == 0
+    assert result.stdout.splitlines() == EXPECTED_OUTPUT
+
+
+def test_batch_jsonl(tmp_path):
+    _, manifest = write_scripts(tmp_path)
+    result = run_interpreter("--manifest", manifest, "-j", "2", "--jsonl")
+    assert result.returncode == 1
+    results = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [os.path.basename(script["file"]) for script in results] == [*SCRIPTS, "test_evaluation.txt"]
+    assert [script["exit_code"] for script in results] == [1, 1, 0, 0]
+    assert results[2]["stdout"] == "short\n"
+    assert results[3]["stdout"].splitlines() == EXPECTED_OUTPUT
+    assert all(script["wall_ms"] > 0 for script in results)
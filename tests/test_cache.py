@@ -0,0 +1,87 @@
+import os
+import pickle
+
+from interpreter.lexer import iter_tokens
+from interpreter.parser import Parser
+from interpreter.semantics import SemanticAnalyzer
+from interpreter.cache import ProgramCache
+from test_evaluation import EXPECTED_OUTPUT, ENGINES
+
+
+FILENAME = "tests/test_evaluation.txt"
+
+
+def analyze(filename):
+    ast = Parser(iter_tokens(filename)).parse()
+    return ast, SemanticAnalyzer(ast).analyze()
+
+
+def test_cache_roundtrip(tmp_path, capsys):
+    cache = ProgramCache(str(tmp_path))
+    source = cache.read_source(FILENAME)
+    assert cache.load(FILENAME, source, "analyzed") is None
+    assert cache.store(FILENAME, source, "analyzed", *analyze(FILENAME))
+
+    for engine in ENGINES:
+        # every load is a separate copy of the program
+        ast, scope_controller = cache.load(FILENAME, source, "analyzed")
+        engine(ast, scope_controller).evaluate()
+        assert capsys.readouterr().out.splitlines() == EXPECTED_OUTPUT, engine.__name__
+
+
+def test_cache_invalidation(tmp_path):
+    cache = ProgramCache(str(tmp_path))
+    source = cache.read_source(FILENAME)
+    cache.store(FILENAME, source, "analyzed", *analyze(FILENAME))
+
+    assert cache.load(FILENAME, source + b"\n", "analyzed") is None
+    assert cache.load(FILENAME, source, "optimized") is None
+    # source changed after it was read is not stored
+    assert not cache.store(FILENAME, source + b"\n", "analyzed", *analyze(FILENAME))
+
+    # broken entry is ignored and replaced
+    entry_path = cache.entry_path(FILENAME, source, "analyzed")
+    with open(entry_path, "wb") as file:
+        file.write(b"broken")
+    assert cache.load(FILENAME, source, "analyzed") is None
+    assert cache.store(FILENAME, source, "analyzed", *analyze(FILENAME))
+    assert cache.load(FILENAME, source, "analyzed") is not None
+
+
+def test_cache_pruning(tmp_path):
+    cache = ProgramCache(str(tmp_path / "cache"))
+    program = tmp_path / "program.txt"
+    source = b""
+    for line in (b'[shown "a"];\n', b'[shown "b"];\n'):
+        source += line
+        program.write_bytes(source)
+        for variant in ("analyzed", "optimized"):
+            assert cache.store(str(program), source, variant, *analyze(str(program)))
+
+    # entries of previous sources are removed, the other variant is kept
+    entries = sorted(os.listdir(tmp_path / "cache"))
+    assert entries == sorted(
+        os.path.basename(cache.entry_path(str(program), source, variant)) for variant in ("analyzed", "optimized")
+    )
+
+
+def test_cache_untrusted_entries(tmp_path):
+    cache = ProgramCache(str(tmp_path))
+    source = cache.read_source(FILENAME)
+    cache.store(FILENAME, source, "analyzed", *analyze(FILENAME))
+    entry_path = cache.entry_path(FILENAME, source, "analyzed")
+
+    # entries of directory or file writable by other users are ignored
+    os.chmod(tmp_path, 0o777)
+    assert cache.load(FILENAME, source, "analyzed") is None
+    assert not cache.store(FILENAME, source, "analyzed", *analyze(FILENAME))
+    os.chmod(tmp_path, 0o700)
+    os.chmod(entry_path, 0o666)
+    assert cache.load(FILENAME, source, "analyzed") is None
+    os.chmod(entry_path, 0o600)
+    assert cache.load(FILENAME, source, "analyzed") is not None
+
+    # entry which calls functions is not loaded
+    with open(entry_path, "wb") as file:
+        pickle.dump(({}, (os.getcwd, os.system)), file)
+    assert cache.load(FILENAME, source, "analyzed") is None
@@ -0,0 +1,213 @@
+import pytest
+
+from interpreter.lexer import iter_tokens
+from interpreter.builtins import INTRINSICS_LIST
+from interpreter.parser import Parser
+from interpreter.semantics import SemanticAnalyzer
+from interpreter.evaluation import *
+from interpreter.error import ProgramRuntimeError
+from interpreter.vm import VirtualMachine
+from interpreter.transpiler import PythonEngine
+
+
+EXPECTED_OUTPUT = [
+    "3628800",
+    "3.375",
+    "57",
+    "3",
+    "1.98",
+    "True",
+    "hello, world",
+    "20",
+    "." * 21,
+    "3",
+    "negative",
+    "small",
+    "small",
+    "big",
+    "8",
+    "-1",
+    "42",
+    "14",
+    "60",
+    "6000",
+    "aaa3",
+    "bcccbcccbend",
+]
+
+EXPECTED_MEMO_OUTPUT = [
+    "75025", "6", "8", "3", "3", "13530", "0.0", "-0.0", "0.0", "4", "4.0", "4",
+]
+
+# pure func : hits and misses of its cache
+EXPECTED_MEMO_STATS = {
+    "fib"        : (24, 26),
+    "calls_pure" : (0, 1),
+    "halve"      : (0, 0),
+    "id"         : (1, 2),
+}
+
+EXPECTED_ARRAYS_OUTPUT = [
+    "115",
+    "-20 43",
+    "-20 43 43",
+    "4.75",
+    "6.8125",
+    "2 True False",
+    "115",
+    "100",
+    "x",
+    "10",
+    "5",
+    "14 14",
+]
+
+ENGINES = [EvaluationLoop, ClosureCompiler, VirtualMachine, PythonEngine]
+
+
+def evaluate(filename, engine, **options):
+    ast = Parser(iter_tokens(filename)).parse()
+    scope_controller = SemanticAnalyzer(ast).analyze()
+    interpreter = engine(ast, scope_controller, **options)
+    interpreter.evaluate()
+    return interpreter
+
+
+def test_evaluation_engines(capsys):
+    for engine in ENGINES:
+        evaluate("tests/test_evaluation.txt", engine)
+        output = capsys.readouterr().out
+
+        assert output.splitlines() == EXPECTED_OUTPUT, engine.__name__
+
+
+def test_evaluation_memoization(capsys):
+    for engine in ENGINES:
+        interpreter = evaluate("tests/test_memoization.txt", engine)
+        output = capsys.readouterr().out
+
+        assert output.splitlines() == EXPECTED_MEMO_OUTPUT, engine.__name__
+        stats = {memo.name: (memo.hits, memo.misses) for memo in interpreter.memo_caches.values()}
+        assert stats == EXPECTED_MEMO_STATS, engine.__name__
+
+        interpreter = evaluate("tests/test_memoization.txt", engine, memo_size=0)
+        assert capsys.readouterr().out.splitlines() == EXPECTED_MEMO_OUTPUT, engine.__name__
+        assert not interpreter.memo_caches
+
+    # only float zeros are not cached, int zero and false are equal to 0.0 but they are cached
+    assert MemoCache.key((0.0,)) is None and MemoCache.key((1, -0.0)) is None
+    assert MemoCache.key((0,)) is not None and MemoCache.key((False, 2.5)) is not None
+
+
+# program : message of its runtime error
+ARRAYS_ERRORS = {
+    "xs float[] = [float_array 2];\nxs[2] = 1.0;\n": "Index 2 is out of array of length 2",
+    "xs int[] = [int_array 2];\n[shown [int_to_str xs[0 - 3]]];\n": "Index -3 is out of array of length 2",
+    "xs int[] = [int_array 1];\nxs[0] = 9223372036854775807 + 1;\n": "Value 9223372036854775808 is out of range",
+    "xs int[] = [int_array 1];\n[int_fill xs, 9223372036854775807 + 1];\n": "Value 9223372036854775808 is out of range",
+    "[shown [int_to_str [int_dot [int_array 1], [int_array 2]]]];\n": "dot product of arrays of lengths 1 and 2",
+    "xs int[] = [int_array 0 - 1];\n": "Length of array -1 is negative",
+    "[shown [int_to_str [int_min [int_array 0]]]];\n": "min of empty array",
+    "[shown [float_to_str [float_max [float_array 0]]]];\n": "max of empty array",
+}
+
+OVERFLOW_PROGRAM = "a int = 10;\nloop i int, 0..12 {\n    a = a * a;\n}\nb int = a / 3;\n"
+
+
+def test_evaluation_arrays(tmp_path, capsys):
+    for engine in ENGINES:
+        evaluate("tests/test_arrays.txt", engine)
+        assert capsys.readouterr().out.splitlines() == EXPECTED_ARRAYS_OUTPUT, engine.__name__
+
+    program = tmp_path / "errors.txt"
+    for source, message in ARRAYS_ERRORS.items():
+        program.write_text(source)
+        for engine in ENGINES:
+            with pytest.raises(ProgramRuntimeError) as error:
+                evaluate(str(program), engine)
+            assert message in str(error.value), (source, engine.__name__)
+
+    # python errors outside of arrays are not errors of arrays
+    program.write_text(OVERFLOW_PROGRAM)
+    for engine in ENGINES:
+        with pytest.raises(OverflowError):
+            evaluate(str(program), engine)
+
+
+PROFILED_PROGRAM = "\n".join([
+    "def fib |n int| -> int {",
+    "    if n < 2 { ! n; }",
+    "    ! [fib n - 1] + [fib n - 2];",
+    "}",
+    "def work |n int| -> int {",
+    "    s int = 0;",
+    "    loop i int, 0..n { s = s + [fib 5]; }",
+    "    ! s;",
+    "}",
+    "[shown [int_to_str [work 3]]];",
+])
+
+# name : (kind, line, calls count)
+EXPECTED_PROFILES = {
+    "fib"        : ("function", 1, 45),
+    "work"       : ("function", 5, 1),
+    "shown"      : ("intrinsic", None, 1),
+    "int_to_str" : ("intrinsic", None, 1),
+}
+
+PROFILED_ENGINES = [EvaluationLoop, ClosureCompiler, PythonEngine]
+
+
+def test_evaluation_profiler(tmp_path, capsys):
+    program = tmp_path / "profiled.txt"
+    program.write_text(PROFILED_PROGRAM)
+    for engine in PROFILED_ENGINES:
+        profiler = Profiler()
+        interpreter = evaluate(str(program), engine, memo_size=0, profiler=profiler)
+        assert capsys.readouterr().out.splitlines() == ["15"], engine.__name__
+
+        profiles = {profile.name: profile.as_dict() for profile in profiler.sorted_profiles()}
+        stats = {name: (info["kind"], info["line"], info["calls"]) for name, info in profiles.items()}
+        assert stats == EXPECTED_PROFILES, engine.__name__
+        # recursive calls of fib are a part of the outermost calls made by work
+        assert profiles["work"]["inclusive_ms"] >= profiles["fib"]["inclusive_ms"], engine.__name__
+        assert profiles["fib"]["self_ms"] == pytest.approx(profiles["fib"]["inclusive_ms"]), engine.__name__
+
+        # intrinsics are not instrumented after evaluation
+        global_scope = interpreter.scope_controller.get_global_scope()
+        shown = next(intr for intr in INTRINSICS_LIST if intr.name == "shown")
+        assert global_scope.get_symbol("shown").value is shown.actual_value
+
+
+# engines which do not use python stack for nested nodes and interpreted calls
+STACKLESS_ENGINES = [EvaluationLoop, VirtualMachine]
+
+DEEP_NESTING = 2000
+
+DEEP_PROGRAM = "\n".join([
+    "x int = 1;",
+    "y int = " + " + ".join(["x"] * DEEP_NESTING) + ";",
+    "if y > 0 { " * DEEP_NESTING + "y = y + 1;" + " }" * DEEP_NESTING,
+    "def down |n int| -> int {",
+    "    if n == 0 { ! 0; }",
+    "    ! 1 + [down n - 1];",
+    "}",
+    "[shown [int_to_str y]];",
+    f"[shown [int_to_str [down {DEEP_NESTING * 10}]]];",
+])
+
+EXPECTED_DEEP_OUTPUT = [str(DEEP_NESTING + 1), str(DEEP_NESTING * 10)]
+
+
+def test_evaluation_deep_programs(tmp_path, capsys):
+    filename = tmp_path / "deep.txt"
+    filename.write_text(DEEP_PROGRAM)
+
+    for engine in STACKLESS_ENGINES:
+        evaluate(str(filename), engine, memo_size=0)
+        assert capsys.readouterr().out.splitlines() == EXPECTED_DEEP_OUTPUT, engine.__name__
+
+        with pytest.raises(ProgramRuntimeError) as error:
+            evaluate(str(filename), engine, memo_size=0, max_call_depth=DEEP_NESTING)
+        assert f"Max call depth {DEEP_NESTING} is exceeded by call of 'down'" in str(error.value), engine.__name__
+        capsys.readouterr()
@@ -1,5 +1,6 @@
 from interpreter.lexer import tokenize_source
 from interpreter.lexer.token_types import TokenType
+from interpreter.lexer.legacy_lexer import tokenize_source_legacy
 
 
 EXPECTED_TOKEN_TYPES = [
@@ -81,4 +82,17 @@ def test_lexer_main():
     assert len(tokens) == len(EXPECTED_TOKEN_TYPES)
 
     for i in range(len(tokens)):
-        assert tokens[i].type == EXPECTED_TOKEN_TYPES[i]
\ No newline at end of file
+        assert tokens[i].type == EXPECTED_TOKEN_TYPES[i]
+
+def test_lexer_matches_legacy():
+    for filename in ["tests/test_lexer.txt", "tests/test_parser.txt", "test.txt"]:
+        tokens = tokenize_source(filename)
+        legacy_tokens = tokenize_source_legacy(filename)
+
+        assert len(tokens) == len(legacy_tokens)
+
+        for token, legacy_token in zip(tokens, legacy_tokens):
+            assert token.type == legacy_token.type
+            assert token.value == legacy_token.value
+            assert (token.pos.row, token.pos.col) == (legacy_token.pos.row, legacy_token.pos.col)
+            assert token.spaced == legacy_token.spaced
@@ -0,0 +1,88 @@
+import pytest
+
+from interpreter.lexer import iter_tokens
+from interpreter.parser import Parser
+from interpreter.semantics import SemanticAnalyzer
+from interpreter.modules import ModuleLoader
+from interpreter.cache import ProgramCache
+from interpreter.error import ProgramSyntaxError, ProgramSemanticError
+from interpreter.evaluation import EvaluationLoop
+from test_evaluation import ENGINES
+
+
+# relative path : source
+MODULES = {
+    "lib/common.txt": 'greeting str = "common";\n[shown greeting];\ndef twice |x int| -> int { ! x * 2; }\n',
+    "lib/math.txt": 'use "common.txt";\ndef square |x int| -> int { ! x * x; }\n',
+    "strings.txt": 'use "lib/common.txt";\ndef shout |s str| -> str { ! s + "!"; }\n',
+    "main.txt": (
+        'use "lib/math.txt";\nuse "strings.txt";\nuse "lib/math.txt";\n'
+        '[shown [int_to_str [square 3] + [twice 5]]];\n[shown [shout greeting]];\n'
+    ),
+}
+
+# statements of common module run once at its first use
+EXPECTED_OUTPUT = ["common", "19", "common!"]
+
+
+def write_modules(tmp_path):
+    for path, source in MODULES.items():
+        (tmp_path / path).parent.mkdir(exist_ok=True)
+        (tmp_path / path).write_text(source)
+    return str(tmp_path / "main.txt")
+
+
+def load(filename, loader):
+    ast = loader.load(Parser(iter_tokens(filename)).parse(), filename)
+    return ast, SemanticAnalyzer(ast).analyze()
+
+
+def test_modules_engines(tmp_path, capsys):
+    filename = write_modules(tmp_path)
+    for engine in ENGINES:
+        engine(*load(filename, ModuleLoader())).evaluate()
+        assert capsys.readouterr().out.splitlines() == EXPECTED_OUTPUT, engine.__name__
+
+    # modules parsed in processes of the pool or in place are the same
+    for max_workers in (1, 2):
+        EvaluationLoop(*load(filename, ModuleLoader(max_workers=max_workers))).evaluate()
+        assert capsys.readouterr().out.splitlines() == EXPECTED_OUTPUT, max_workers
+
+
+def test_modules_cache(tmp_path, capsys):
+    filename = write_modules(tmp_path)
+    cache = ProgramCache(str(tmp_path / "cache"))
+    loader = ModuleLoader(cache)
+    load(filename, loader)
+    assert sorted(loader.sources) == sorted(str(tmp_path / path) for path in MODULES if path != "main.txt")
+
+    # parsed modules are loaded from cache
+    module = str(tmp_path / "lib/common.txt")
+    source = cache.read_source(module)
+    assert cache.load(module, source, "module") is not None
+
+    # program entry is valid only while used modules are unchanged
+    main_source = cache.read_source(filename)
+    assert cache.store(filename, main_source, "analyzed", *load(filename, ModuleLoader()), dependencies=loader.sources)
+    assert cache.load(filename, main_source, "analyzed") is not None
+    (tmp_path / "lib/common.txt").write_text(MODULES["lib/common.txt"].replace("common", "changed"))
+    assert cache.load(filename, main_source, "analyzed") is None
+
+
+def test_modules_errors(tmp_path):
+    filename = write_modules(tmp_path)
+    (tmp_path / "lib/math.txt").write_text('use "../main.txt";\n')
+    with pytest.raises(ProgramSemanticError) as error:
+        load(filename, ModuleLoader())
+    assert "Circular use of module '../main.txt'" in str(error.value)
+
+    (tmp_path / "lib/math.txt").write_text('use "missing.txt";\n')
+    with pytest.raises(ProgramSemanticError) as error:
+        load(filename, ModuleLoader())
+    assert "Can not find module 'missing.txt'" in str(error.value)
+
+    (tmp_path / "lib/math.txt").write_text('if true { use "common.txt"; }\n')
+    for max_workers in (1, 2):
+        with pytest.raises(ProgramSyntaxError) as error:
+            load(filename, ModuleLoader(max_workers=max_workers))
+        assert "Modules can be used only by top level statements" in str(error.value)
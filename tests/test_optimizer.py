@@ -0,0 +1,123 @@
+from interpreter.lexer import iter_tokens, TokenType
+from interpreter.parser import Parser
+from interpreter.semantics import SemanticAnalyzer
+from interpreter.optimizer import Optimizer
+from interpreter.ast import *
+from interpreter.builtins import INTRINSICS_LIST
+
+from test_evaluation import EXPECTED_OUTPUT, ENGINES, STACKLESS_ENGINES, DEEP_NESTING
+
+
+# var : value of folded literal or type of simplified expression node
+EXPECTED_VALUES = {
+    "a" : 14,
+    "b" : 1.98,
+    "c" : "10!",
+    "d" : True,
+    "e" : Binary_Op_Node,
+    "f" : Func_Call_Node,
+    "g" : Var_Node,
+    "h" : Binary_Op_Node,
+    "i" : Binary_Op_Node,
+    "j" : Var_Node,
+    "k" : Binary_Op_Node,
+}
+
+
+# loops of test_loops.txt computed at once
+EXPECTED_REDUCED_LOOPS = 11
+
+EXPECTED_LOOPS_OUTPUT = [
+    "20",
+    "1000506500 1000",
+    "620448401733239439360000 24",
+    "2189 5",
+    "2 7",
+    "24999500002500000000 -20",
+    "79777941814291672401518892224505807820921910393015244140625",
+    "3072 6",
+    "3072",
+    "27", "28", "29", "30", "31",
+    "7931762302491582015247220736 6.5 31",
+]
+
+
+def optimize(filename):
+    ast = Parser(iter_tokens(filename)).parse()
+    scope_controller = SemanticAnalyzer(ast).analyze()
+    return Optimizer(ast, scope_controller).optimize(), scope_controller
+
+
+def test_optimizer_folding():
+    ast, _ = optimize("tests/test_optimizer.txt")
+    values = {stm.name: stm.value for stm in ast.statements}
+
+    for name, expected in EXPECTED_VALUES.items():
+        node = values[name]
+        if isinstance(expected, type):
+            assert type(node) == expected, name
+        else:
+            assert isinstance(node, Literal_Node), name
+            assert node.value == expected and type(node.value) == type(expected), name
+
+    # a - 2 - 1 is a - 3
+    assert values["i"].start_token.type == TokenType.MINUS_OP
+    assert values["i"].right.value == 3
+
+
+def test_optimizer_evaluation(capsys):
+    for engine in ENGINES:
+        ast, scope_controller = optimize("tests/test_evaluation.txt")
+        engine(ast, scope_controller).evaluate()
+        output = capsys.readouterr().out
+
+        assert output.splitlines() == EXPECTED_OUTPUT, engine.__name__
+
+
+def test_optimizer_loop_reductions(capsys):
+    for engine in ENGINES:
+        ast = Parser(iter_tokens("tests/test_loops.txt")).parse()
+        scope_controller = SemanticAnalyzer(ast).analyze()
+        optimizer = Optimizer(ast, scope_controller)
+        ast = optimizer.optimize()
+        assert optimizer.reduced_loops_count == EXPECTED_REDUCED_LOOPS
+
+        engine(ast, scope_controller).evaluate()
+        output = capsys.readouterr().out
+
+        assert output.splitlines() == EXPECTED_LOOPS_OUTPUT, engine.__name__
+
+
+# loop bodies which update expressions are deeper than the python recursion limit
+DEEP_LOOPS_PROGRAM = "\n".join([
+    "s int = 0;",
+    "loop i int, 0..10 { s = s + " + " + ".join(["i"] * DEEP_NESTING) + "; }",
+    "t int = 0;",
+    "loop i int, 0..3 { t = t * t + " + " + ".join(["i"] * DEEP_NESTING) + "; }",
+    "[shown [int_to_str s] + \" \" + [int_to_str t]];",
+])
+
+# sum is computed at once, square of the var is not linear, so the second loop falls back to iterations
+EXPECTED_DEEP_LOOPS_OUTPUT = [f"{DEEP_NESTING * 45} {DEEP_NESTING ** 2 + DEEP_NESTING * 2}"]
+
+
+def test_optimizer_deep_loops(tmp_path, capsys):
+    filename = tmp_path / "deep_loops.txt"
+    filename.write_text(DEEP_LOOPS_PROGRAM)
+    for engine in STACKLESS_ENGINES:
+        ast = Parser(iter_tokens(str(filename))).parse()
+        scope_controller = SemanticAnalyzer(ast).analyze()
+        optimizer = Optimizer(ast, scope_controller)
+        ast = optimizer.optimize()
+        assert optimizer.reduced_loops_count == 2
+
+        engine(ast, scope_controller, memo_size=0).evaluate()
+        assert capsys.readouterr().out.splitlines() == EXPECTED_DEEP_LOOPS_OUTPUT, engine.__name__
+
+
+def test_optimizer_array_constructors():
+    # every call creates a new buffer, so calls of constructors are never evaluated by the optimizer
+    constructors = [intr for intr in INTRINSICS_LIST if intr.name.endswith("_array")]
+    assert len(constructors) == 3
+    assert not any(intr.pure for intr in constructors)
+
@@ -1,6 +1,7 @@
-from interpreter.lexer import tokenize_source
+from interpreter.lexer import tokenize_source, iter_tokens
 from interpreter.parser import Parser
 from interpreter.ast import *
+from interpreter.ast.ast_printer import AST_Printer
 
 
 EXPECTED_NODE_TYPES = [
@@ -92,4 +93,31 @@ def test_parser_py():
 
     for i in range(len(nodes)):
         assert type(nodes[i]) == EXPECTED_NODE_TYPES[i]
-    
\ No newline at end of file
+    
+
+def test_parser_streaming():
+    ast = Parser(iter_tokens("tests/test_parser.txt")).parse()
+
+    printer = AST_Printer(ast)
+    printer.print(True)
+
+    nodes = printer.path
+
+    assert [type(node) for node in nodes] == EXPECTED_NODE_TYPES
+
+
+# source : types of condition and body statement of the if, bracket next to the var starts index unless it is a call
+INDEX_OR_CALL_SOURCES = {
+    'if flag[shown "x"];\n': (Var_Node, Func_Call_Node),
+    'if flag [shown "x"];\n': (Var_Node, Func_Call_Node),
+    'if flag[x] [shown "x"];\n': (Index_Node, Func_Call_Node),
+    'if flag[x + 1][shown "x"];\n': (Index_Node, Func_Call_Node),
+}
+
+
+def test_parser_index_or_call(tmp_path):
+    program = tmp_path / "program.txt"
+    for source, expected_types in INDEX_OR_CALL_SOURCES.items():
+        program.write_text(source)
+        if_node = Parser(iter_tokens(str(program))).parse().statements[0]
+        assert (type(if_node.condition), type(if_node.body.statements[0])) == expected_types, source
@@ -0,0 +1,72 @@
+from array import array
+
+from interpreter.lexer import iter_tokens
+from interpreter.parser import Parser
+from interpreter.semantics import SemanticAnalyzer
+from interpreter.evaluation import is_cast_needed
+from interpreter.ast import *
+
+
+# var : type name and python type of value of its declaration expression
+EXPECTED_TYPES = {
+    "a" : ("int", int),
+    "p" : ("float", float),
+    "b" : ("int", float),
+    "c" : ("bool", bool),
+    "d" : ("int", int),
+    "e" : ("int", None),
+    "s" : ("str", str),
+    "m" : ("int", int),
+    "xs" : ("int[]", array),
+}
+
+# func : result depends only on args
+EXPECTED_PURITY = {
+    "f"     : True,
+    "g"     : False,
+    "h"     : False,
+    "k"     : False,
+    "fact"  : True,
+    "twice" : False,
+    "outer" : False,
+    "inner" : False,
+    "wrap"  : True,
+    "sq"    : True,
+    "first"   : False,
+    "squares" : True,
+}
+
+
+def func_decls(block):
+    for stm in block.statements:
+        if isinstance(stm, Func_Decl_Node):
+            yield stm
+            yield from func_decls(stm.body)
+
+
+def test_semantics_expression_types():
+    ast = Parser(iter_tokens("tests/test_semantics.txt")).parse()
+    SemanticAnalyzer(ast).analyze()
+    decls = {stm.name: stm for stm in ast.statements if isinstance(stm, Var_Decl_Node)}
+
+    for name, (type_name, value_type) in EXPECTED_TYPES.items():
+        value = decls[name].value
+        assert value.expr_type.name == type_name, name
+        assert value.value_type == value_type, name
+
+    # param values are not casted at call, so their type is not known
+    func_decl = next(stm for stm in ast.statements if isinstance(stm, Func_Decl_Node))
+    ret_value = func_decl.body.statements[0].value
+    assert ret_value.expr_type.name == "int" and ret_value.value_type is None
+
+    assert not is_cast_needed(decls["d"].value, "int")
+    assert is_cast_needed(decls["b"].value, "int")
+    assert is_cast_needed(decls["e"].value, "int")
+
+
+def test_semantics_purity():
+    ast = Parser(iter_tokens("tests/test_semantics.txt")).parse()
+    SemanticAnalyzer(ast).analyze()
+
+    purity = {decl.name: decl.symbol.pure for decl in func_decls(ast)}
+    assert purity == EXPECTED_PURITY
@@ -0,0 +1,92 @@
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import pytest
+
+from test_evaluation import EXPECTED_OUTPUT
+
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX") or not hasattr(os, "fork"), reason="unix only")
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CLIENT = os.path.join(REPO_DIR, "interpreter", "server", "client.py")
+
+
+def run_client(env, *args, **options):
+    return subprocess.run(
+        [sys.executable, "-S", CLIENT, *args], env=env, capture_output=True, text=True, timeout=60, **options
+    )
+
+
+def test_server_runs_scripts(tmp_path):
+    socket_path = str(tmp_path / "mtr.sock")
+    env = dict(os.environ, PYTHONPATH=REPO_DIR, MTR_SOCKET=socket_path)
+    daemon = subprocess.Popen(
+        [sys.executable, os.path.join(REPO_DIR, "interpreter"), "serve", "--workers", "2"],
+        env=env, stderr=subprocess.DEVNULL
+    )
+    try:
+        for _ in range(100):
+            if os.path.exists(socket_path):
+                break
+            time.sleep(0.05)
+        assert os.path.exists(socket_path)
+
+        # more scripts than workers, every script gets a fresh worker
+        for _ in range(3):
+            result = run_client(env, "tests/test_evaluation.txt", cwd=REPO_DIR)
+            assert result.returncode == 0
+            assert result.stdout.splitlines() == EXPECTED_OUTPUT
+
+        program = tmp_path / "echo.txt"
+        program.write_text('x str = [read ""];\n[shown x + "!"];\n')
+        result = run_client(env, "echo.txt", "--engine", "vm", cwd=str(tmp_path), input="hello\n")
+        assert (result.returncode, result.stdout) == (0, "hello!\n")
+
+        program.write_text('x int = "s";\n')
+        result = run_client(env, str(program), "--no-cache")
+        assert result.returncode == 1
+        assert result.stdout.startswith("Semantic error occured")
+
+        result = run_client(env, str(program), "--engine", "unknown")
+        assert result.returncode == 2
+        assert "invalid choice" in result.stderr
+    finally:
+        daemon.terminate()
+        daemon.wait(timeout=10)
+    assert not os.path.exists(socket_path)
+
+    # without daemon the client runs the interpreter itself
+    result = run_client(env, "tests/test_evaluation.txt", cwd=REPO_DIR)
+    assert result.stdout.splitlines() == EXPECTED_OUTPUT
+
+
+def test_server_socket_of_other_user(tmp_path):
+    socket_path = str(tmp_path / "mtr.sock")
+    env = dict(os.environ, PYTHONPATH=REPO_DIR, MTR_SOCKET=socket_path)
+
+    # daemon does not remove files which are not sockets
+    (tmp_path / "mtr.sock").write_text("data")
+    result = subprocess.run(
+        [sys.executable, os.path.join(REPO_DIR, "interpreter"), "serve"],
+        env=env, capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 1
+    assert "is not a socket of the user" in result.stderr
+    assert (tmp_path / "mtr.sock").read_text() == "data"
+    os.remove(socket_path)
+
+    if os.getuid() != 0:
+        return
+    # streams are not passed to a socket of other user, the client runs the interpreter itself
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+        listener.bind(socket_path)
+        listener.listen(1)
+        os.chown(socket_path, 65534, 65534)
+        result = run_client(env, "tests/test_evaluation.txt", cwd=REPO_DIR)
+        assert "does not belong to the user" in result.stderr
+        assert result.stdout.splitlines() == EXPECTED_OUTPUT
@@ -0,0 +1,57 @@
+import os
+import subprocess
+import sys
+
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# cumulative import time of the cli, it is about 80 ms on a laptop
+STARTUP_BUDGET_MS = 400
+
+# modules which the usual run does not need
+LAZY_MODULES = [
+    "interpreter.vm",
+    "interpreter.transpiler",
+    "interpreter.server",
+    "interpreter.ast.ast_printer",
+    "interpreter.cli.timings",
+    "interpreter.cli.batch",
+    "interpreter.evaluation.evaluation",
+    "interpreter.evaluation.closure_compiler",
+    "interpreter.evaluation.profiler",
+    "interpreter.optimizer",
+    "interpreter.cache",
+    "interpreter.modules",
+    "pickle",
+    "hashlib",
+    "multiprocessing",
+    "logging",
+    "tracemalloc",
+    "json",
+    "tempfile",
+]
+
+
+def import_times():
+    """ Returns module : cumulative import time in microseconds of importing the cli """
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import interpreter.cli"],
+        cwd=REPO_DIR, env=dict(os.environ, PYTHONPATH=REPO_DIR), capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|")
+        times[module.strip()] = int(cumulative)
+    return times
+
+
+def test_startup_imports():
+    times = import_times()
+    assert not [module for module in LAZY_MODULES if module in times]
+
+    # the best of several runs, so a busy machine does not fail the test
+    best_ms = min(import_times()["interpreter.cli"] for _ in range(3)) / 1000
+    assert best_ms < STARTUP_BUDGET_MS
@@ -0,0 +1,29 @@
+import json
+from argparse import Namespace
+
+from interpreter.cli import analyze_program
+from interpreter.cli.timings import PhaseTimings
+
+
+FILENAME = "tests/test_evaluation.txt"
+
+EXPECTED_PHASES = ["lex", "parse", "analyze", "optimize"]
+
+EXPECTED_COUNTS = {"tokens": 786, "ast_nodes": 469, "scopes": 41}
+
+
+def test_timings_phases(capsys):
+    timings = PhaseTimings()
+    analyze_program(FILENAME, Namespace(log=False, no_optimize=False), timings)
+
+    assert list(timings.phases) == EXPECTED_PHASES
+    assert timings.counts == EXPECTED_COUNTS
+    for stats in timings.phases.values():
+        assert stats["wall_ms"] >= 0 and stats["cpu_ms"] >= 0 and stats["peak_memory_kb"] > 0
+
+    report = json.loads(timings.as_json())
+    assert list(report["phases"]) == EXPECTED_PHASES
+    assert report["counts"] == EXPECTED_COUNTS
+    assert timings.table().splitlines()[len(EXPECTED_PHASES) + 2:] == [
+        f"{name}: {value}" for name, value in EXPECTED_COUNTS.items()
+    ]
@@ -0,0 +1,46 @@
+from interpreter.lexer import iter_tokens
+from interpreter.parser import Parser
+from interpreter.semantics import SemanticAnalyzer
+from interpreter.transpiler import PythonCodeGenerator
+
+
+EXPECTED_SOURCE = '''\
+def __program():
+    true_0_0 = True
+    false_0_1 = False
+    total_0_2 = 0
+    def count_down_f0(n_1_1, acc_1_0):
+        __tailed = False
+        while True:
+            if (n_1_1 == 0):
+                return int(acc_1_0)
+            n_1_1, acc_1_0 = (n_1_1 - 1), (acc_1_0 + n_1_1)
+            __tailed = True
+            continue
+            if __tailed:
+                return int(None)
+            return None
+    count_down_f0 = __memoized(count_down_f0, __memo['count_down_f0'])
+    try:
+        for i_0_3 in range(0, 3, 1):
+            total_0_2 = int((total_0_2 + count_down_f0(i_0_3, 0)))
+            if int_to_str(total_0_2) is not None:
+                raise __BlockExit
+            if shown('unreachable') is not None:
+                raise __BlockExit
+    except __BlockExit:
+        pass
+    shown(int_to_str(total_0_2))
+
+__program()
+'''
+
+
+def test_transpiler_source():
+    ast = Parser(iter_tokens("tests/test_transpiler.txt")).parse()
+    scope_controller = SemanticAnalyzer(ast).analyze()
+    generator = PythonCodeGenerator(ast, scope_controller)
+
+    assert generator.generate() == EXPECTED_SOURCE
+    assert list(generator.memoized_funcs) == ["count_down_f0"]
+    compile(EXPECTED_SOURCE, "<program>", "exec")